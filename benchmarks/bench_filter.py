@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Title-filter benchmark
+──────────────────────
+Times filter_items / filter_items_relaxed against the pre-compiled-matcher
+implementation (kept verbatim below as the reference) and checks that both
+make exactly the same accept/reject decisions. The "records" timing is the
+production path: listings parsed once into _Listing records (as ebay_search
+does when a result enters the cache), then both filter tiers run on them;
+"shared" is every later card on the same query, which finds them cached.
+
+The corpus is synthetic but built from the real catalog CSV: for a sample of
+cards it generates eBay-style titles that mix exact matches, nickname/brand
+variants, other players, and every exclusion keyword family.
+
+Usage:  python benchmarks/bench_filter.py [cards] [items_per_card]
+"""
+
+import csv, os, random, re, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+import price_cards as pc   # noqa: E402
+
+CATALOG_CSV = os.path.join(ROOT, "Ben + Marty's Baseball Card Collection - Pricing Sheet.csv")
+
+
+# ── Reference implementation (as of the per-item scan version) ────────────────
+
+def _legacy_norm_player(name):
+    return re.sub(r'[,.]', '', name.lower()).strip()
+
+
+def _legacy_brand_in_title(variants, title_l):
+    for v in variants:
+        if len(v) <= 3:
+            if re.search(rf'\b{re.escape(v)}\b', title_l):
+                return True
+        else:
+            if v in title_l:
+                return True
+    return False
+
+
+def _legacy_apply_exclusions(title_l, card_brand_l=''):
+    if any(k in title_l for k in pc.GRADED_KW):   return True
+    if any(k in title_l for k in pc.AUTO_KW):      return True
+    if re.search(r'\bauto\b', title_l):            return True
+    if any(k in title_l for k in pc.LOT_KW):       return True
+    if any(k in title_l for k in pc.REPRINT_KW):   return True
+    if any(k in title_l for k in pc.MULTI_KW):     return True
+    if re.search(r'/\d{1,3}\b', title_l):          return True
+    for k in pc.PREMIUM_KW:
+        if k in title_l and k not in card_brand_l:
+            return True
+    for k in pc.INSERT_KW:
+        if k in title_l and k not in card_brand_l:
+            return True
+    if not re.search(r'\bsp\b', card_brand_l) and not re.search(r'\bssp\b', card_brand_l):
+        if re.search(r'\bsp\b', title_l):    return True
+    if not re.search(r'\bssp\b', card_brand_l):
+        if re.search(r'\bssp\b', title_l):   return True
+    if 'short print' not in card_brand_l and 'short print' in title_l:          return True
+    if 'super short print' not in card_brand_l and 'super short print' in title_l: return True
+    return False
+
+
+def _legacy_filter_items(items, year, brand, player, card_number, team):
+    player_vs = pc._player_name_variants(player)
+    year_s    = str(year)
+    brand_vs  = pc._brand_variants(brand)
+    cn_clean  = (card_number or '').lstrip('#').strip()
+    results   = []
+    for item in items:
+        price = pc._extract_price(item)
+        if not price or price < 0.50:
+            continue
+        title   = item.get('title', '') or ''
+        title_n = _legacy_norm_player(title.lower())
+        if not any(pv in title_n for pv in player_vs):                  continue
+        if year_s not in title_n:                                       continue
+        if brand_vs and not _legacy_brand_in_title(brand_vs, title_n):  continue
+        if _legacy_apply_exclusions(title_n, brand.lower()):            continue
+        if cn_clean and not re.search(rf'#?\b{re.escape(cn_clean)}\b', title_n): continue
+        results.append({
+            'price':        price,
+            'listing_type': pc._extract_listing_type(item),
+            'end_date':     pc._extract_end_date(item),
+            'best_offer':   pc._extract_best_offer(item),
+            'title':        title,
+        })
+    return results
+
+
+def _legacy_filter_items_relaxed(items, year, player, brand=''):
+    player_vs    = pc._player_name_variants(player)
+    year_s       = str(year)
+    card_brand_l = brand.lower()
+    results      = []
+    for item in items:
+        price = pc._extract_price(item)
+        if not price or price < 0.50:
+            continue
+        title   = item.get('title', '') or ''
+        title_n = _legacy_norm_player(title.lower())
+        if not any(pv in title_n for pv in player_vs): continue
+        if year_s not in title_n:                      continue
+        if _legacy_apply_exclusions(title_n, card_brand_l): continue
+        results.append({
+            'price':        price,
+            'listing_type': pc._extract_listing_type(item),
+            'end_date':     pc._extract_end_date(item),
+            'best_offer':   pc._extract_best_offer(item),
+            'title':        title,
+        })
+    return results
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+_NOISE = (
+    'PSA 9', 'BGS 9.5', 'graded', 'Autograph', 'signed', 'AUTO', 'automatic', 'lot of 3',
+    'complete set', 'team set', 'reprint', 'x2', '(3)', '/25', '/199', '/2000', 'Refractor',
+    'Prizm', 'sepia', 'gold parallel', 'insert', 'Future Stars', 'SP', 'SSP', 'display',
+    'especially', 'short print', 'super short print', 'RC', 'Rookie', 'NM-MT', 'HOF',
+    'UD', 'would', 'Chrome', 'Jr.', 'Sr.', 'St. Louis', '#', 'Base', 'Card',
+)
+
+
+def load_catalog(path: str = CATALOG_CSV) -> list[list]:
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def build_corpus(rows: list[list], n_cards: int, per_card: int, seed: int = 0) -> list[tuple]:
+    """[(card dict, items)] — deterministic for a given seed."""
+    rng   = random.Random(seed)
+    pc.C  = pc.detect_columns(rows[0])
+    cards = [pc._card_from_row(r) for r in rows[1:]]
+    cards = [c for c in cards if c['player'] and c['year'] and c['brand']]
+    sample = rng.sample(cards, min(n_cards, len(cards)))
+    corpus = []
+    for card in sample:
+        items = []
+        for _ in range(per_card):
+            other = rng.choice(cards)
+            player = rng.choice(pc._player_name_variants(card['player'])).title() \
+                if rng.random() < 0.6 else other['player']
+            brand  = rng.choice(pc._brand_variants(card['brand'])).title() \
+                if rng.random() < 0.7 else other['brand']
+            year   = card['year'] if rng.random() < 0.8 else other['year']
+            parts  = [year, brand, player]
+            if rng.random() < 0.6:
+                parts.append(f"#{card['card_number'] if rng.random() < 0.7 else other['card_number']}")
+            parts += rng.sample(_NOISE, rng.randint(0, 3))
+            rng.shuffle(parts)
+            items.append({
+                'title': ' '.join(p for p in parts if p),
+                'price': {'value': f'{rng.uniform(0.1, 40):.2f}', 'currency': 'USD'},
+                'buyingOptions': rng.choice((['FIXED_PRICE'], ['AUCTION'], ['FIXED_PRICE', 'BEST_OFFER'])),
+            })
+        corpus.append((card, items))
+    return corpus
+
+
+# ── Runs ──────────────────────────────────────────────────────────────────────
+
+def parse_corpus(corpus) -> list[tuple]:
+    return [(card, pc._as_listings(items)) for card, items in corpus]
+
+
+def run_filters(corpus, strict, relaxed) -> list:
+    out = []
+    for card, items in corpus:
+        out.append(strict(items, card['year'], card['brand'], card['player'],
+                          card['card_number'], card['team']))
+        out.append(relaxed(items, card['year'], card['player'], card['brand']))
+    return out
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def check_equivalence(corpus) -> int:
+    """Raise if any decision differs; returns the number of items compared."""
+    old = run_filters(corpus, _legacy_filter_items, _legacy_filter_items_relaxed)
+    for new in (run_filters(corpus, pc.filter_items, pc.filter_items_relaxed),
+                run_filters(parse_corpus(corpus), pc.filter_items, pc.filter_items_relaxed)):
+        if new != old:
+            for i, (a, b) in enumerate(zip(new, old)):
+                if a != b:
+                    card = corpus[i // 2][0]
+                    raise AssertionError(f'Filter decisions differ for {card}')
+    # Brands whose own name switches exclusion rules off.
+    edge_brands = ('topps chrome refractor', 'upper deck sp', 'topps ssp', 'sp authentic',
+                   'fleer short print', 'super short print', 'topps future stars', 'prizm')
+    for card, items in corpus:
+        for brand_l in (card['brand'].lower(), *edge_brands):
+            for it in items:
+                t = pc._norm_player(it['title'])
+                if pc._apply_exclusions(t, brand_l) != _legacy_apply_exclusions(t, brand_l):
+                    raise AssertionError(f'_apply_exclusions differs for {t!r} / {brand_l!r}')
+    return sum(len(items) for _, items in corpus)
+
+
+def main():
+    n_cards  = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    per_card = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    corpus   = build_corpus(load_catalog(), n_cards, per_card)
+
+    n_items = check_equivalence(corpus)
+    print(f'equivalence: OK ({n_items} items × strict + relaxed)')
+
+    t_old = best_of(lambda: run_filters(corpus, _legacy_filter_items, _legacy_filter_items_relaxed))
+    t_new = best_of(lambda: run_filters(corpus, pc.filter_items, pc.filter_items_relaxed))
+    t_rec = best_of(lambda: run_filters(parse_corpus(corpus), pc.filter_items, pc.filter_items_relaxed))
+    parsed = parse_corpus(corpus)
+    t_hit = best_of(lambda: run_filters(parsed, pc.filter_items, pc.filter_items_relaxed))
+    per   = 1e6 / (n_items * 2)
+    print(f'reference: {t_old:.3f}s  ({t_old * per:.2f} µs/item)')
+    print(f'compiled:  {t_new:.3f}s  ({t_new * per:.2f} µs/item)  {t_old / t_new:.2f}×')
+    print(f'records:   {t_rec:.3f}s  ({t_rec * per:.2f} µs/item)  {t_old / t_rec:.2f}×  (parse once per card)')
+    print(f'shared:    {t_hit:.3f}s  ({t_hit * per:.2f} µs/item)  {t_old / t_hit:.2f}×  (records already cached)')
+
+
+if __name__ == '__main__':
+    main()
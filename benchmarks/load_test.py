@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Offline load test
+─────────────────
+Runs scripts/price_cards.py end to end in batch mode against the stand-in
+eBay + Sheets server (scripts/mock_ebay.py), once per EBAY_CONCURRENCY
+value, and reports wall time, cards/s and what the server saw: requests by
+endpoint and status, peak in-flight requests, injected errors and quota
+left. With --latency-ms, --quota and --p429/--p5xx it exercises the
+concurrency, backoff and quota-exit paths without any credentials.
+
+Searches replay the eBay cache in data/ (or --cache). A checkout has none —
+the caches live in CI's actions/cache — so without one every query gets
+synthetic listings built from the catalog CSV the way bench_filter.py
+builds its corpus (--per-card titles each). Those exercise the HTTP and
+concurrency paths; the prices they produce mean nothing.
+
+Every run gets a fresh server (full quota) and a scratch copy of data/
+without the eBay, Claude and page caches, so each planned query reaches
+the server. Claude isn't stood in: ANTHROPIC_API_KEY is unset, so a card
+that would go to Claude logs a Claude error and keeps its eBay price.
+
+Usage:  python benchmarks/load_test.py [--cards 200] [--concurrency 1,4,8]
+            [--latency-ms 150] [--jitter-ms 50] [--quota 5000] [--p429 0] [--p5xx 0]
+            [--cache data/ebay_cache.json] [--per-card 60] [--json results.json] [--keep]
+"""
+
+import argparse, json, os, shutil, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+import price_cards as pc   # noqa: E402
+import mock_ebay           # noqa: E402
+import bench_filter        # noqa: E402
+
+# Left out of the scratch data/ — caches that would answer queries locally,
+# checkpoint logs a run would resume from, and any stored live token.
+SKIP_DATA = ('ebay_cache.*', 'ebay_negative.json', 'ebay_depth.json', 'claude_cache.json',
+             'page_cache.*', '*.delta.jsonl', '*.log.jsonl', '.ebay_token.json*')
+
+
+def synthetic_listings(rows: list[list], per_card: int, seed: int) -> dict[tuple, list]:
+    """{(query key, ''): items} for every card in the sheet, from
+    bench_filter.build_corpus — the stand-in when there's no cache to replay."""
+    out = {}
+    for card, items in bench_filter.build_corpus(rows, len(rows), per_card, seed):
+        out.setdefault((pc._query_key(pc._ebay_query(card)), ''), []).extend(items)
+    return out
+
+
+def run_once(listings: dict, rows: list[list], args, concurrency: int) -> dict:
+    mock   = mock_ebay.MockEbay(listings, [list(r) for r in rows], latency_ms=args.latency_ms,
+                                jitter_ms=args.jitter_ms, quota=args.quota, p429=args.p429,
+                                p5xx=args.p5xx, seed=args.seed)
+    server = mock_ebay.serve(mock)
+    base   = f'http://127.0.0.1:{server.server_address[1]}'
+    work   = tempfile.mkdtemp(prefix='load_test_')
+    shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(work, 'data'),
+                    ignore=shutil.ignore_patterns(*SKIP_DATA))
+
+    env = {k: v for k, v in os.environ.items() if k not in ('ANTHROPIC_API_KEY', 'GOOGLE_CREDENTIALS_JSON')}
+    env.update({
+        'RUN_MODE':                'batch',
+        'BATCH_SIZE':              str(args.cards),
+        'STALE_DAYS':              '0',        # every row is a candidate
+        'EBAY_CONCURRENCY':        str(concurrency),
+        'EBAY_API_BASE':           base,
+        'SHEETS_API_BASE':         base,
+        'EBAY_APP_ID':             'load-test',
+        'EBAY_CLIENT_SECRET':      'load-test',
+        'HUNDRED_THIRTY_POINT_ENABLED': '',
+        'PRICECHARTING_ENABLED':   '',
+        'GIT_CEILING_DIRECTORIES': os.path.dirname(work),   # commit_progress() must not find a repo
+    })
+    t0 = time.perf_counter()
+    with open(os.path.join(work, 'run.log'), 'w') as out:
+        code = subprocess.call([sys.executable, os.path.join(ROOT, 'scripts', 'price_cards.py')],
+                               cwd=work, env=env, stdout=out, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - t0
+    server.shutdown()
+
+    try:
+        with open(os.path.join(work, pc.RUN_METADATA_FILE)) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        meta = {}
+    result = {
+        'concurrency': concurrency,
+        'exit_code':   code,
+        'wall_s':      round(wall, 2),
+        'cards':       meta.get('cards_processed', 0),
+        'cards_per_s': round(meta.get('cards_processed', 0) / wall, 2) if wall else 0,
+        'server':      mock.snapshot(),
+        'api_calls':   meta.get('api_calls'),
+        'http':        meta.get('http'),
+        'workdir':     work,
+    }
+    if not args.keep:
+        shutil.rmtree(work, ignore_errors=True)
+        del result['workdir']
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description='End-to-end price_cards.py runs against the offline mock server.')
+    ap.add_argument('--cards', type=int, default=200, help='BATCH_SIZE per run')
+    ap.add_argument('--concurrency', default='1,4,8', help='EBAY_CONCURRENCY values, one run each')
+    ap.add_argument('--latency-ms', type=float, default=150)
+    ap.add_argument('--jitter-ms', type=float, default=50)
+    ap.add_argument('--quota', type=int, default=5000)
+    ap.add_argument('--p429', type=float, default=0.0)
+    ap.add_argument('--p5xx', type=float, default=0.0)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--cache', default='', help='eBay cache to replay (default: the data/ caches)')
+    ap.add_argument('--per-card', type=int, default=60,
+                    help='synthetic listings per card when there is no cache to replay')
+    ap.add_argument('--catalog', default=os.path.join(ROOT, pc.CATALOG_CSV))
+    ap.add_argument('--json', default='', help='write the results here')
+    ap.add_argument('--keep', action='store_true', help='keep each run\'s scratch directory (run.log, data/)')
+    args = ap.parse_args()
+
+    cwd = os.getcwd()
+    os.chdir(ROOT)   # the default cache paths are relative to the repo
+    listings = mock_ebay.load_listings(args.cache and os.path.join(cwd, args.cache))
+    rows     = pc.read_catalog_csv(args.catalog)
+    os.chdir(cwd)
+    source = 'cached'
+    if not listings:
+        if args.cache:
+            sys.exit(f'No eBay results in {args.cache} — every search would come back empty.')
+        listings, source = synthetic_listings(rows, args.per_card, args.seed), 'synthetic'
+
+    results = []
+    print(f'{len(listings)} {source} queries, {len(rows) - 1} sheet rows, latency {args.latency_ms:g}±{args.jitter_ms:g} ms')
+    print(f'{"conc":>4}  {"exit":>4}  {"wall":>7}  {"cards":>5}  {"cards/s":>7}  {"search":>6}  '
+          f'{"peak":>4}  {"429":>4}  {"5xx":>4}  {"quota left":>10}')
+    for conc in (int(c) for c in args.concurrency.split(',')):
+        r = run_once(listings, rows, args, conc)
+        results.append(r)
+        st = r['server']
+        print(f'{conc:>4}  {r["exit_code"]:>4}  {r["wall_s"]:>6.1f}s  {r["cards"]:>5}  {r["cards_per_s"]:>7.2f}  '
+              f'{st["requests"].get(mock_ebay.SEARCH_PATH, 0):>6}  {st["peak_in_flight"]:>4}  '
+              f'{st["injected_429"] + st["quota_429"]:>4}  {st["injected_5xx"]:>4}  {st["quota_remaining"]:>10}')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'runs': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
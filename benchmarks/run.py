@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite
+───────────────
+Times the CPU-bound hot paths of a pricing run on the real catalog CSV and
+the committed data/ files, with no network:
+
+  filter_items / filter_items_relaxed / _apply_exclusions   per listing
+  weighted_average, weighted_average_batch                  per card
+  _apply_smoothing_and_floor, build_results_json            whole collection
+  _write_summary_sidecar, _save_outputs                     whole collection
+  regenerate_data_FINAL.py: load_csv and each generator     whole catalog
+
+Listings come from the persisted eBay cache when data/ has one (the cards
+whose query is cached, up to --cards); otherwise from bench_filter.py's
+synthetic corpus, which is built from the same CSV. Before timing the
+filters, bench_filter's reference implementation checks they still make the
+same decisions. The writers run in a scratch copy of data/, so the repo's
+files are never touched.
+
+Each case is timed in --repeat samples. A sample calls the case until at
+least --min-sample-ms of timed work has piled up, so a 2 ms case runs ~100
+times per sample, and records the mean time per call. The median sample is
+the figure compared. Results go to --out as JSON and are compared per case
+against --baseline: a case slower than baseline × (1 + --threshold), and by
+at least --min-delta-ms per call, is a regression and the exit code is 1.
+Cases whose corpus or unit count differ from the baseline's are reported but
+not compared. --update-baseline stores this run as the new baseline —
+timings are machine-specific, so refresh it on the machine that does the
+comparing.
+
+Usage:  python benchmarks/run.py [--only filter] [--repeat 9] [--threshold 0.25]
+                                 [--update-baseline]
+"""
+
+import argparse, contextlib, copy, fnmatch, gc, io, json, logging, os, platform, shutil, statistics, \
+    subprocess, sys, tempfile, time
+from datetime import datetime, timezone
+from functools import cached_property
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+sys.path.insert(0, ROOT)
+import price_cards as pc         # noqa: E402
+import bench_filter              # noqa: E402
+import mock_ebay                 # noqa: E402
+import regenerate_data_FINAL as regen   # noqa: E402
+
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+RESULTS_FILE  = os.path.join(ROOT, 'benchmarks', 'last_run.json')
+
+
+# ── Inputs ────────────────────────────────────────────────────────────────────
+
+class Context:
+    """Inputs shared by the cases, each built on first use."""
+
+    def __init__(self, n_cards: int):
+        self.n_cards = n_cards
+
+    @cached_property
+    def rows(self) -> list[list]:
+        rows = pc.read_catalog_csv(os.path.join(ROOT, pc.CATALOG_CSV))
+        pc.C = pc.detect_columns(rows[0])
+        return rows
+
+    @cached_property
+    def corpus(self) -> list[tuple]:
+        """[(card, raw items)] — cached eBay results if there are any."""
+        listings = mock_ebay.load_listings(os.path.join(ROOT, pc.EBAY_CACHE_DB)) \
+            or mock_ebay.load_listings(os.path.join(ROOT, pc.EBAY_CACHE_FILE))
+        corpus = []
+        if listings:
+            for row in self.rows[1:]:
+                card  = pc._card_from_row(row)
+                items = listings.get((pc._query_key(pc._ebay_query(card)), ''))
+                if items and card['player']:
+                    corpus.append((card, items))
+                    if len(corpus) == self.n_cards:
+                        break
+        self.corpus_source = 'cache' if corpus else 'synthetic'
+        return corpus or bench_filter.build_corpus(self.rows, self.n_cards, 200)
+
+    @cached_property
+    def parsed(self) -> list[tuple]:
+        """The corpus as _Listing records, as ebay_search() caches them."""
+        return bench_filter.parse_corpus(self.corpus)
+
+    @cached_property
+    def comps(self) -> list[list]:
+        """Each corpus card's strict comps — weighted_average's input."""
+        return [pc.filter_items(items, c['year'], c['brand'], c['player'], c['card_number'], c['team'])
+                for c, items in self.parsed]
+
+    @cached_property
+    def existing_by_id(self) -> dict:
+        return pc._load_existing_results()
+
+    @cached_property
+    def priced(self) -> list[dict]:
+        """A full run's results: every row with a current price, re-priced."""
+        rows, out = self.rows, []
+        for i, row in enumerate(rows[1:], start=2):
+            card = pc._card_from_row(row)
+            ex   = self.existing_by_id.get(pc.make_card_id(card['year'], card['brand'], card['player'],
+                                                          card['card_number']))
+            if ex and ex.get('avg_price'):
+                out.append({'row': i, 'card': dict(ex)})
+        return out
+
+    @cached_property
+    def output(self) -> dict:
+        return pc.build_results_json(self.rows, copy.deepcopy(self.priced), self.existing_by_id,
+                                     pc._PriceHistory.load())
+
+    @cached_property
+    def regen_cards(self) -> list[dict]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return regen.load_csv(os.path.join(ROOT, pc.CATALOG_CSV))
+
+
+# ── Cases ─────────────────────────────────────────────────────────────────────
+# Each case takes the Context and returns (fn, units, setup): setup() runs
+# untimed before every call and its result is fn's argument. Cases timed
+# on the listings corpus say so, so results record which corpus they saw.
+
+CASES: list[tuple[str, str, bool, callable]] = []
+
+
+def case(name: str, unit: str, corpus: bool = False):
+    def register(fn):
+        CASES.append((name, unit, corpus, fn))
+        return fn
+    return register
+
+
+@case('filter_items', 'item', corpus=True)
+def _filter_items(ctx):
+    def run(_):
+        for c, items in ctx.parsed:
+            pc.filter_items(items, c['year'], c['brand'], c['player'], c['card_number'], c['team'])
+    return run, sum(len(items) for _, items in ctx.parsed), None
+
+
+@case('filter_items_relaxed', 'item', corpus=True)
+def _filter_items_relaxed(ctx):
+    def run(_):
+        for c, items in ctx.parsed:
+            pc.filter_items_relaxed(items, c['year'], c['player'], c['brand'])
+    return run, sum(len(items) for _, items in ctx.parsed), None
+
+
+@case('_apply_exclusions', 'item', corpus=True)
+def _apply_exclusions(ctx):
+    titles = [(pc._norm_player(it.get('title') or ''), c['brand'].lower()) for c, items in ctx.corpus for it in items]
+    def run(_):
+        for t, b in titles:
+            pc._apply_exclusions(t, b)
+    return run, len(titles), None
+
+
+@case('weighted_average', 'card', corpus=True)
+def _weighted_average(ctx):
+    def run(_):
+        for comps in ctx.comps:
+            pc.weighted_average(comps)
+    return run, len(ctx.comps), None
+
+
+@case('weighted_average_batch', 'card', corpus=True)
+def _weighted_average_batch(ctx):
+    return lambda _: pc.weighted_average_batch(ctx.comps), len(ctx.comps), None
+
+
+@case('_apply_smoothing_and_floor', 'card')
+def _smoothing(ctx):
+    def setup():
+        fresh = copy.deepcopy(ctx.priced)
+        return [r['card'] for r in fresh], fresh, pc._PriceHistory.load()
+    return lambda a: pc._apply_smoothing_and_floor(*a), len(ctx.priced), setup
+
+
+@case('build_results_json', 'row')
+def _build_results_json(ctx):
+    def setup():
+        return copy.deepcopy(ctx.priced), pc._PriceHistory.load()
+    return lambda a: pc.build_results_json(ctx.rows, a[0], ctx.existing_by_id, a[1]), len(ctx.rows) - 1, setup
+
+
+@case('_write_summary_sidecar', 'card')
+def _write_summary_sidecar(ctx):
+    return lambda h: pc._write_summary_sidecar(ctx.output, h), len(ctx.output['cards']), pc._PriceHistory.load
+
+
+@case('_save_outputs', 'card')
+def _save_outputs(ctx):
+    def setup():
+        _restore_data()   # each call saves over the same starting files
+        return copy.deepcopy(ctx.output), pc._PriceHistory.load()
+    return lambda a: pc._save_outputs(a[0], ctx.priced, a[1]), len(ctx.output['cards']), setup
+
+
+@case('regen.load_csv', 'row')
+def _regen_load_csv(ctx):
+    path = os.path.join(ROOT, pc.CATALOG_CSV)
+    return lambda _: regen.load_csv(path), len(ctx.rows) - 1, None
+
+
+@case('regen.generate_network_data', 'card')
+def _regen_network(ctx):
+    return lambda _: regen.generate_network_data(ctx.regen_cards), len(ctx.regen_cards), None
+
+
+@case('regen.generate_players_data', 'card')
+def _regen_players(ctx):
+    return lambda _: regen.generate_players_data(ctx.regen_cards), len(ctx.regen_cards), None
+
+
+@case('regen.generate_teams_data', 'card')
+def _regen_teams(ctx):
+    return lambda _: regen.generate_teams_data(ctx.regen_cards), len(ctx.regen_cards), None
+
+
+@case('regen.generate_team_colors', 'card')
+def _regen_team_colors(ctx):
+    with contextlib.redirect_stdout(io.StringIO()):
+        teams = regen.generate_teams_data(ctx.regen_cards)['teams']
+    return lambda _: regen.generate_team_colors(teams), len(ctx.regen_cards), None
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+_SCRATCH = ''
+
+
+def _restore_data():
+    """Reset the scratch data/ to the repo's committed files."""
+    dst = os.path.join(_SCRATCH, 'data')
+    shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(os.path.join(ROOT, 'data'), dst,
+                    ignore=shutil.ignore_patterns('*.sqlite*', 'ebay_cache.json', '.ebay_token.json*'))
+
+
+def time_case(fn, setup, repeat: int, min_sample_s: float) -> tuple[list[float], int]:
+    """(seconds per call for each of repeat samples, calls per sample).
+
+    A sample keeps calling fn until min_sample_s of timed work has piled up,
+    so short cases aren't measuring timer resolution and scheduler jitter.
+    The collector is off for the whole sample (as timeit does) so one case's
+    garbage isn't billed to the next; setup runs untimed before each call."""
+    samples, calls = [], 0
+    for _ in range(repeat):
+        total, calls = 0.0, 0
+        gc.collect()
+        gc.disable()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):   # regenerate_data_FINAL narrates
+                while total < min_sample_s or not calls:
+                    arg = setup() if setup else None
+                    t0  = time.perf_counter()
+                    fn(arg)
+                    total += time.perf_counter() - t0
+                    calls += 1
+        finally:
+            gc.enable()
+        samples.append(total / calls)
+    return samples, calls
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_s: float) -> list[str]:
+    """Print the table; return the names of regressed cases."""
+    regressed = []
+    base_cases = baseline.get('cases', {})
+    print(f'{"case":<32} {"per unit":>12} {"per call":>9} {"baseline":>12} {"change":>8}')
+    for name, r in results['cases'].items():
+        per = f'{r["per_unit_us"]:.2f} µs/{r["unit"]}'
+        b   = base_cases.get(name)
+        if not b:
+            note, base = 'new', '—'
+        elif b.get('corpus') != r['corpus'] or b['units'] != r['units'] or 'calls' not in b:
+            note, base = 'inputs differ', f'{b["per_unit_us"]:.2f}'
+        else:
+            change = r['median_s'] / b['median_s'] - 1
+            note   = f'{change:+.0%}'
+            base   = f'{b["per_unit_us"]:.2f}'
+            if change > threshold and r['median_s'] - b['median_s'] > min_delta_s:
+                note += '  REGRESSION'
+                regressed.append(name)
+        print(f'{name:<32} {per:>12} {r["median_s"] * 1000:>7.2f}ms {base:>12} {note:>8}')
+    return regressed
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    global _SCRATCH
+    ap = argparse.ArgumentParser(description='Time the pricing pipeline\'s CPU hot paths.')
+    ap.add_argument('--only', default='*', help='glob on case names, comma-separated')
+    ap.add_argument('--repeat', type=int, default=9, help='samples per case; the median is compared')
+    ap.add_argument('--min-sample-ms', type=float, default=200.0, help='timed work per sample')
+    ap.add_argument('--cards', type=int, default=300, help='cards in the listings corpus')
+    ap.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before a case fails')
+    ap.add_argument('--min-delta-ms', type=float, default=5.0,
+                    help='per-call slowdowns smaller than this are noise')
+    ap.add_argument('--out', default=RESULTS_FILE)
+    ap.add_argument('--baseline', default=BASELINE_FILE)
+    ap.add_argument('--update-baseline', action='store_true')
+    args = ap.parse_args()
+
+    pc.log.setLevel(logging.WARNING)
+    patterns = args.only.split(',')
+    selected = [c for c in CASES if any(fnmatch.fnmatch(c[0], p) for p in patterns)]
+    if not selected:
+        sys.exit(f'No case matches {args.only!r}')
+
+    ctx = Context(args.cards)
+    cwd = os.getcwd()
+    _SCRATCH = tempfile.mkdtemp(prefix='bench_')
+    try:
+        _restore_data()
+        os.chdir(_SCRATCH)   # price_cards reads and writes data/ relative to the cwd
+        if any(uses_corpus for _, _, uses_corpus, _ in selected):
+            n = bench_filter.check_equivalence(ctx.corpus)
+            print(f'filter equivalence vs reference: OK ({n} items, {ctx.corpus_source} corpus)')
+
+        results = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git':       _git_rev(),
+            'python':    platform.python_version(),
+            'platform':  platform.platform(),
+            'numpy':     pc.np.__version__ if pc.np is not None else None,   # weighted_average_batch's path
+            'repeat':    args.repeat,
+            'min_sample_ms': args.min_sample_ms,
+            'cases':     {},
+        }
+        for name, unit, uses_corpus, make in selected:
+            fn, units, setup = make(ctx)
+            times, calls = time_case(fn, setup, args.repeat, args.min_sample_ms / 1000)
+            median = statistics.median(times)
+            results['cases'][name] = {
+                'unit':        unit,
+                'units':       units,
+                'corpus':      ctx.corpus_source if uses_corpus else 'catalog',
+                'calls':       calls,
+                'best_s':      round(min(times), 6),
+                'median_s':    round(median, 6),
+                'per_unit_us': round(median * 1e6 / max(units, 1), 3),
+            }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(_SCRATCH, ignore_errors=True)
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        baseline = {}
+    regressed = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.update_baseline:
+        merged = dict(results, cases={**baseline.get('cases', {}), **results['cases']})
+        with open(args.baseline, 'w') as f:
+            json.dump(merged, f, indent=2)
+        print(f'Baseline updated: {os.path.relpath(args.baseline, cwd)}')
+    elif regressed:
+        print(f'{len(regressed)} case(s) slower than baseline by more than {args.threshold:.0%}: '
+              f'{", ".join(regressed)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Stand-in eBay + Sheets APIs
+───────────────────────────
+A local server speaking just enough of eBay's OAuth token and Browse
+item_summary/search endpoints, and of Sheets values().get / batchUpdate,
+to run price_cards.py end to end offline.
+
+Searches are replayed from an eBay cache (--cache: the legacy
+data/ebay_cache.json or EBAY_CACHE_DB; by default whichever data/ has). The
+server-side narrowing ebay_search_params() asks for is applied the way eBay
+would apply it — negative keywords against titles, the Graded / Season /
+Manufacturer aspects — and every request's parameters are checked against
+the Browse API's limits; a request that breaks one gets a 400 with an
+eBay-shaped error body. The Pricing Sheet is the catalog CSV, and writes
+land in the in-memory copy.
+
+For load testing: --latency-ms / --jitter-ms on every response, a daily
+--quota reported in X-RateLimit-Limit/Remaining/Reset (429 + Retry-After
+once spent), and random --p429 / --p5xx injection on searches. Requests are
+logged one JSON line each; GET /_stats returns request/status counts, peak
+in-flight requests and quota left. benchmarks/load_test.py drives a full
+run against it.
+
+--check builds the search parameters for every query in the catalog CSV
+without starting a server, validates them, and — for queries found in the
+cache — reports how many listings narrowing keeps out of the response and
+the filter_items time that saves.
+
+Usage:
+  python scripts/mock_ebay.py [--port 8377] [--cache data/ebay_cache.json] [--latency-ms 120 --p429 0.01]
+  export EBAY_API_BASE=http://127.0.0.1:8377 SHEETS_API_BASE=http://127.0.0.1:8377
+  EBAY_APP_ID=x EBAY_CLIENT_SECRET=x python scripts/price_cards.py
+
+  python scripts/mock_ebay.py --check
+"""
+
+import argparse, json, os, random, re, secrets, sqlite3, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import price_cards as pc   # noqa: E402
+
+SEARCH_PATH = '/buy/browse/v1/item_summary/search'
+TOKEN_PATH  = '/identity/v1/oauth2/token'
+SORTS       = ('bestMatch', 'price', '-price', 'distance', 'newlyListed', 'endingSoonest')
+
+
+# ── Replayed listings ─────────────────────────────────────────────────────────
+
+def load_listings(path: str = '') -> dict[tuple, list]:
+    """{(query key, price filter): slim items} from a cache file — .json (the
+    legacy whole-file cache) or .sqlite — or, by default, whichever of
+    EBAY_CACHE_DB / EBAY_CACHE_FILE has entries."""
+    entries: dict[str, list] = {}
+    db_path = path if path and not path.endswith('.json') else '' if path else pc.EBAY_CACHE_DB
+    if db_path and os.path.exists(db_path):
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            for key, items in conn.execute('SELECT key, items FROM ebay_cache'):
+                entries[key] = json.loads(items)
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.close()
+    if not entries and (not path or path.endswith('.json')):
+        entries = {k: v['items'] for k, v in pc._read_legacy_ebay_cache(path or pc.EBAY_CACHE_FILE).items()
+                   if isinstance(v, dict) and isinstance(v.get('items'), list)}
+    out = {}
+    for key, items in entries.items():
+        query, _, price_filter = key.rpartition('|')
+        out[(pc._query_key(query), price_filter)] = items
+    return out
+
+
+def parse_q(q: str) -> tuple[str, list[str]]:
+    """Browse q → (the query price_cards built it from, its negative terms)."""
+    negatives = [m.group(1) or m.group(2) for m in re.finditer(r'(?:^|\s)-(?:"([^"]+)"|(\S+))', q)]
+    base = re.sub(r'(?:^|\s)-(?:"[^"]+"|\S+)', '', q).strip()
+    base = re.sub(r'\s+baseball$', '', base, flags=re.I)
+    return base, [n.lower() for n in negatives]
+
+
+def parse_aspects(aspect_filter: str) -> dict[str, list[str]]:
+    """'categoryId:212,Graded:{No},Season:{1989}' → {'categoryId': ['212'], 'Graded': ['No'], …}"""
+    out = {}
+    for name, braced, bare in re.findall(r'([^,:]+):(?:\{([^}]*)\}|([^,]*))', aspect_filter or ''):
+        out[name.strip()] = (braced or bare).split('|')
+    return out
+
+
+def narrow(items: list, negatives: list[str], aspects: dict[str, list[str]]) -> list:
+    """Drop what eBay would, judging item specifics from the title (the
+    cache keeps no item specifics). That makes the aspects look lossless:
+    real eBay also drops every listing whose seller left the specific blank,
+    which this can't model, so --check shows what the aspects trim but not
+    the good comps they would cost."""
+    graded_no = aspects.get('Graded') == ['No']
+    seasons   = aspects.get('Season') or []
+    makers    = [v for m in aspects.get('Manufacturer') or [] for v in pc._brand_variants(m)]
+    neg_res   = [re.compile(rf'\b{re.escape(n)}\b') for n in negatives]
+    kept = []
+    for it in items:
+        title_l = (it.get('title') or '').lower()
+        if any(r.search(title_l) for r in neg_res):
+            continue
+        if graded_no and any(k in title_l for k in pc.GRADED_KW):
+            continue
+        if seasons and not any(s in title_l for s in seasons):
+            continue
+        if makers and not any(m in title_l for m in makers):
+            continue
+        kept.append(it)
+    return kept
+
+
+def price_bounds(filter_str: str) -> tuple[str, float, float]:
+    m = re.search(r'price:\[([\d.]*)\.\.([\d.]*)\]', filter_str or '')
+    if not m:
+        return '', 0.0, float('inf')
+    lo, hi = float(m.group(1) or 0), float(m.group(2) or 'inf')
+    return f'{m.group(1)}..{m.group(2)}', lo, hi
+
+
+# ── Parameter checks ──────────────────────────────────────────────────────────
+
+def validate(params: dict) -> list[str]:
+    """Browse API constraints a search request breaks (empty = valid)."""
+    problems = []
+    q = params.get('q', '')
+    if not q and not params.get('category_ids'):
+        problems.append('q or category_ids is required')
+    if len(q) > pc.EBAY_Q_MAX_LEN:
+        problems.append(f'q is {len(q)} characters (max {pc.EBAY_Q_MAX_LEN})')
+    if q.count('"') % 2:
+        problems.append('q has an unbalanced quote')
+    try:
+        limit  = int(params.get('limit', '50'))
+        offset = int(params.get('offset', '0'))
+        if not 1 <= limit <= 200:
+            problems.append(f'limit {limit} outside 1–200')
+        if offset < 0 or offset + limit > 10000:
+            problems.append(f'offset {offset} + limit {limit} outside 0–10000')
+    except ValueError:
+        problems.append('limit/offset not integers')
+    if params.get('sort', 'bestMatch') not in SORTS:
+        problems.append(f'unknown sort {params["sort"]!r}')
+    f = params.get('filter', '')
+    if f.count('{') != f.count('}') or f.count('[') != f.count(']'):
+        problems.append('filter has unbalanced brackets')
+    if 'aspect_filter' in params:
+        aspects = parse_aspects(params['aspect_filter'])
+        cat = aspects.get('categoryId')
+        if not cat:
+            problems.append('aspect_filter needs a categoryId')
+        elif cat[0] not in params.get('category_ids', '').split(','):
+            problems.append(f'aspect_filter categoryId {cat[0]} not in category_ids')
+        if any(not v for v in aspects.values()):
+            problems.append('aspect_filter has an empty value')
+    return problems
+
+
+# ── Server ────────────────────────────────────────────────────────────────────
+
+SHEET_GET_RE    = re.compile(r'^/v4/spreadsheets/([^/]+)/values/([^/:]+)$')
+SHEET_UPDATE_RE = re.compile(r'^/v4/spreadsheets/([^/]+)/values:batchUpdate$')
+
+
+class MockEbay:
+    """The endpoints plus the knobs a load test turns: latency (± jitter) on
+    every response, a daily call quota reported in X-RateLimit-* headers
+    (429 once spent), and random 429 / 503 injection. Handlers run one
+    thread per connection, so all state sits behind one lock."""
+
+    def __init__(self, listings: dict[tuple, list], rows: Optional[list[list]] = None, *,
+                 latency_ms: float = 0, jitter_ms: float = 0, quota: int = 5000,
+                 p429: float = 0.0, p5xx: float = 0.0, seed: Optional[int] = None, log_path: str = ''):
+        self.listings   = listings
+        self.rows       = rows
+        self.latency_ms = latency_ms
+        self.jitter_ms  = jitter_ms
+        self.quota      = quota
+        self.remaining  = quota
+        self.reset_ts   = (int(time.time()) // 86400 + 1) * 86400   # next midnight UTC, like eBay's
+        self.p429, self.p5xx = p429, p5xx
+        self._rng  = random.Random(seed)
+        self._lock = threading.Lock()
+        self._log  = sys.stdout if log_path == '-' else open(log_path, 'a') if log_path else None
+        self.stats = {'requests': {}, 'status': {}, 'in_flight': 0, 'peak_in_flight': 0,
+                      'injected_429': 0, 'injected_5xx': 0, 'quota_429': 0, 'cells_written': 0}
+
+    def record(self, entry: dict):
+        with self._lock:
+            st = self.stats
+            st['requests'][entry['path']] = st['requests'].get(entry['path'], 0) + 1
+            st['status'][str(entry['status'])] = st['status'].get(str(entry['status']), 0) + 1
+            if self._log:
+                self._log.write(json.dumps(entry, separators=(',', ':')) + '\n')
+                self._log.flush()
+
+    def enter(self):
+        with self._lock:
+            self.stats['in_flight'] += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        time.sleep(delay)
+
+    def leave(self):
+        with self._lock:
+            self.stats['in_flight'] -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(dict(self.stats, quota_remaining=self.remaining)))
+
+    # eBay
+
+    def token(self, headers, body: str) -> tuple[int, dict, dict]:
+        if not (headers.get('Authorization') or '').startswith('Basic '):
+            return 401, {'error': 'invalid_client'}, {}
+        if parse_qs(body).get('grant_type') != ['client_credentials']:
+            return 400, {'error': 'unsupported_grant_type'}, {}
+        return 200, {'access_token': 'mock-' + secrets.token_hex(16), 'expires_in': 7200,
+                     'token_type': 'Application Access Token'}, {}
+
+    def _rate_headers(self) -> dict:
+        return {'X-RateLimit-Limit': str(self.quota), 'X-RateLimit-Remaining': str(self.remaining),
+                'X-RateLimit-Reset': str(self.reset_ts)}
+
+    def _admit(self) -> Optional[tuple[int, dict, dict]]:
+        """Spend one call of quota, or the injected / quota error to send instead."""
+        with self._lock:
+            roll = self._rng.random()
+            if roll < self.p5xx:
+                self.stats['injected_5xx'] += 1
+                return 503, _error('Service unavailable (injected)'), {}
+            retry_after = {'Retry-After': str(max(1, self.reset_ts - int(time.time())))}
+            if roll < self.p5xx + self.p429:
+                self.stats['injected_429'] += 1
+                return 429, _error('Too many requests (injected)'), dict(self._rate_headers(), **retry_after)
+            if self.remaining <= 0:
+                self.stats['quota_429'] += 1
+                return 429, _error('Daily call limit reached'), dict(self._rate_headers(), **retry_after)
+            self.remaining -= 1
+        return None
+
+    def search(self, headers, params: dict) -> tuple[int, dict, dict]:
+        if not (headers.get('Authorization') or '').startswith('Bearer mock-'):
+            return 401, _error('Invalid access token'), {}   # e.g. a stored live token — see EBAY_TOKEN_STORE
+        problems = validate(params)
+        if problems:
+            return 400, _error('; '.join(problems)), {}
+        refused = self._admit()
+        if refused:
+            return refused
+
+        query, negatives = parse_q(params.get('q', ''))
+        pf, lo, hi = price_bounds(params.get('filter', ''))
+        key   = pc._query_key(query)
+        items = self.listings.get((key, '' if pf == pc.EBAY_PRICE_RANGE else pf))
+        if items is None:
+            items = [it for it in self.listings.get((key, ''), [])
+                     if lo <= (pc._extract_price(it) or 0) <= hi]
+        matches = narrow(items, negatives, parse_aspects(params.get('aspect_filter', '')))
+        limit, offset = int(params.get('limit', '50')), int(params.get('offset', '0'))
+        page = [dict(it, itemId=f'v1|{abs(hash((key, offset + i))) % 10**12}|0')
+                for i, it in enumerate(matches[offset:offset + limit])]
+        body = {'total': len(matches), 'limit': limit, 'offset': offset}
+        if page:
+            body['itemSummaries'] = page
+        with self._lock:
+            return 200, body, self._rate_headers()
+
+    # Sheets — values().get serves the catalog; values().batchUpdate is applied
+    # to it, so a second run against the same server sees the first one's writes.
+
+    def sheet_get(self, range_: str) -> tuple[int, dict, dict]:
+        if self.rows is None:
+            return 404, {'error': {'code': 404, 'message': 'No sheet loaded (--catalog)'}}, {}
+        with self._lock:
+            values = [list(r) for r in self.rows]
+        return 200, {'range': range_, 'majorDimension': 'ROWS', 'values': values}, {}
+
+    def sheet_update(self, sheet_id: str, body: str) -> tuple[int, dict, dict]:
+        try:
+            data = json.loads(body).get('data', [])
+        except ValueError:
+            return 400, {'error': {'code': 400, 'message': 'Invalid JSON payload'}}, {}
+        cells = 0
+        with self._lock:
+            for d in data:
+                m = re.search(r'!([A-Z]+)(\d+)', d.get('range', ''))
+                if not m or self.rows is None:
+                    continue
+                col = 0
+                for ch in m.group(1):
+                    col = col * 26 + ord(ch) - 64
+                row = self.rows[int(m.group(2)) - 1] if int(m.group(2)) <= len(self.rows) else None
+                if row is None:
+                    continue
+                for i, v in enumerate((d.get('values') or [[]])[0]):
+                    while len(row) < col + i:
+                        row.append('')
+                    row[col - 1 + i] = str(v)
+                    cells += 1
+            self.stats['cells_written'] += cells
+        return 200, {'spreadsheetId': sheet_id, 'totalUpdatedRanges': len(data),
+                     'totalUpdatedCells': cells}, {}
+
+
+def _error(message: str) -> dict:
+    return {'errors': [{'domain': 'API_BROWSE', 'category': 'REQUEST', 'message': message}]}
+
+
+def make_handler(mock: MockEbay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'   # keep-alive, like the real API
+
+        def _reply(self, status: int, body: dict, headers: dict, entry: dict):
+            blob = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(blob)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(blob)
+            entry.update(status=status, returned=len(body.get('itemSummaries', [])), total=body.get('total'))
+            if status >= 400:
+                entry['error'] = body
+            mock.record(entry)
+
+        def _handle(self, method: str):
+            url   = urlsplit(self.path)
+            path  = url.path
+            entry = {'ts': round(time.time(), 3), 'method': method, 'path': path}
+            if method == 'GET' and path == '/_stats':
+                return self._reply(200, mock.snapshot(), {}, entry)
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+            mock.enter()
+            try:
+                if method == 'GET' and path == SEARCH_PATH:
+                    params = entry['params'] = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                    reply  = mock.search(self.headers, params)
+                elif method == 'POST' and path == TOKEN_PATH:
+                    reply = mock.token(self.headers, body)
+                elif method == 'GET' and SHEET_GET_RE.match(path):
+                    entry['path'] = '/v4/spreadsheets/values.get'
+                    reply = mock.sheet_get(unquote(SHEET_GET_RE.match(path).group(2)))
+                elif method == 'POST' and SHEET_UPDATE_RE.match(path):
+                    entry['path'] = '/v4/spreadsheets/values.batchUpdate'
+                    reply = mock.sheet_update(SHEET_UPDATE_RE.match(path).group(1), body)
+                else:
+                    reply = 404, _error(f'no such resource {path}'), {}
+            finally:
+                mock.leave()
+            self._reply(*reply, entry)
+
+        def do_GET(self):
+            self._handle('GET')
+
+        def do_POST(self):
+            self._handle('POST')
+
+        def log_message(self, fmt, *args):   # the JSON log replaces the access log
+            pass
+
+    return Handler
+
+
+def serve(mock: MockEbay, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Start the server on a background thread; port 0 picks a free one
+    (server.server_address has it). Stop with server.shutdown()."""
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='mock-ebay', daemon=True).start()
+    return server
+
+
+# ── --check ───────────────────────────────────────────────────────────────────
+
+def check(catalog_csv: str, listings: dict[tuple, list]) -> int:
+    rows  = pc.read_catalog_csv(catalog_csv)
+    pc.C  = pc.detect_columns(rows[0])
+    plan  = pc.plan_queries([(i, r) for i, r in enumerate(rows[1:], start=2)])
+    bad, seen, kept, t_all, t_kept = 0, 0, 0, 0.0, 0.0
+    for key, members in plan.items():
+        cards  = [pc._card_from_row(r) for _, r in members]
+        params = pc.ebay_search_params(pc._ebay_query(cards[0]), card=cards[0])
+        problems = validate(params)
+        if problems:
+            bad += 1
+            print(f'INVALID  {params["q"]!r}: {"; ".join(problems)}')
+        items = listings.get((key, ''))
+        if items is None:
+            continue
+        query, negatives = parse_q(params['q'])
+        narrowed = narrow(items, negatives, parse_aspects(params.get('aspect_filter', '')))
+        seen += len(items)
+        kept += len(narrowed)
+        for pool, acc in ((items, 'all'), (narrowed, 'kept')):
+            t0 = time.perf_counter()
+            recs = pc._as_listings(pool)
+            for c in cards:
+                pc.filter_items(recs, c['year'], c['brand'], c['player'], c['card_number'], c['team'])
+            dt = time.perf_counter() - t0
+            if acc == 'all':
+                t_all += dt
+            else:
+                t_kept += dt
+    print(f'{len(plan)} queries, {bad} with invalid parameters')
+    if seen:
+        print(f'cached listings: {seen} → {kept} after server-side narrowing '
+              f'({100 * (seen - kept) / seen:.1f}% fewer)')
+        print(f'parse + filter_items: {t_all:.3f}s → {t_kept:.3f}s')
+    return 1 if bad else 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Local stand-in for the eBay OAuth / Browse search and Sheets APIs.')
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8377)
+    ap.add_argument('--cache', default='', help='eBay cache to replay, .json or .sqlite (default: the data/ caches)')
+    ap.add_argument('--catalog', default=pc.CATALOG_CSV, help='CSV served as the Pricing Sheet')
+    ap.add_argument('--latency-ms', type=float, default=0, help='added to every response')
+    ap.add_argument('--jitter-ms', type=float, default=0, help='± uniform jitter on the latency')
+    ap.add_argument('--quota', type=int, default=5000, help='daily Browse calls before 429s')
+    ap.add_argument('--p429', type=float, default=0.0, help='probability a search gets an injected 429')
+    ap.add_argument('--p5xx', type=float, default=0.0, help='probability a search gets an injected 503')
+    ap.add_argument('--seed', type=int, default=None)
+    ap.add_argument('--log', default='-', help="append request records here ('-' = stdout, '' = off)")
+    ap.add_argument('--check', action='store_true', help='validate generated parameters for the catalog and exit')
+    args = ap.parse_args()
+
+    listings = load_listings(args.cache)
+    if args.check:
+        sys.exit(check(args.catalog, listings))
+
+    rows = pc.read_catalog_csv(args.catalog) if os.path.exists(args.catalog) else None
+    mock = MockEbay(listings, rows, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, quota=args.quota,
+                    p429=args.p429, p5xx=args.p5xx, seed=args.seed, log_path=args.log)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(mock))
+    server.daemon_threads = True
+    print(f'mock eBay + Sheets on http://{args.host}:{args.port} — {len(listings)} cached queries, '
+          f'{len(rows) - 1 if rows else 0} sheet rows', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -16,9 +16,14 @@ Required environment variables:
   BATCH_SIZE                 - Cards to process per run (default 50)
 """
 
-import os, sys, json, time, base64, re, math, logging, signal
+import os, sys, csv, json, time, base64, re, math, bisect, fcntl, random, hashlib, logging, signal, threading, sqlite3
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed
+from concurrent.futures import wait as wait_futures
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
 
 import requests
 import anthropic
@@ -26,6 +31,11 @@ from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+try:
+    import numpy as np   # optional — weighted_average_batch() falls back to the per-card loop
+except ImportError:
+    np = None
+
 # ── Logging ────────────────────────────────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -40,31 +50,44 @@ SPREADSHEET_ID = os.environ.get(
     '1p65aHj-Azx7YiYAG6BA-IQF4erdJThJMlLPXaG7paFg'
 )
 SHEET_NAME         = 'Pricing Sheet'
+SHEETS_API_BASE    = os.environ.get('SHEETS_API_BASE', '')   # stand-in Sheets host (scripts/mock_ebay.py); no credentials
 RESULTS_FILE       = 'data/pricing_results.json'
 BATCH_SIZE         = int(os.environ.get('BATCH_SIZE', '200'))
 STALE_DAYS         = int(os.environ.get('STALE_DAYS', '30'))  # re-price cards older than this (0 = force all)
 HIGH_VALUE_THRESH  = 10.0        # use Claude for cards above this price (lowered from $20 to widen the tighter-refresh band)
 LOW_DATA_THRESH    = 3           # use Claude if fewer than this many comps
 CLAUDE_MIN_COMPS   = 15          # skip Claude for high-value cards that already have this many comps
-EBAY_SLEEP_MS      = 100         # ms between eBay API calls
+EBAY_SLEEP_MS      = 100         # ms between eBay API calls (token-bucket refill rate, shared by all workers)
+EBAY_CONCURRENCY   = int(os.environ.get('EBAY_CONCURRENCY', '4'))   # eBay requests kept in flight (1 = serial)
 EBAY_CATEGORY      = '212'       # Baseball Cards
 EBAY_PRICE_RANGE   = '0.50..500'
+EBAY_API_BASE      = os.environ.get('EBAY_API_BASE', 'https://api.ebay.com').rstrip('/')   # scripts/mock_ebay.py serves it locally
 CARD_TIMEOUT_SEC   = 90          # max wall-clock seconds per card before skipping
 SHEETS_RETRIES     = 4           # retry attempts for Google Sheets API calls
 EBAY_RETRIES       = 3           # retry attempts for eBay API calls
 EBAY_QUOTA_MIN     = 50          # exit gracefully when fewer than this many calls remain
 HISTORY_FILE       = 'data/price_history.json'
 HISTORY_MAX        = 24          # snapshots per card (≈2 years of monthly runs)
+HISTORY_LOG_FILE   = 'data/price_history.log.jsonl'      # entries appended since the last compaction
+RESULTS_DELTA_FILE = 'data/pricing_results.delta.jsonl'  # cards priced since the last full snapshot
 FULL_RUN_CHUNK     = 200         # cards per incremental commit in full mode
-EBAY_CACHE_FILE    = 'data/ebay_cache.json'
+EBAY_CACHE_FILE    = 'data/ebay_cache.json'     # legacy whole-file store (also the import source for sqlite)
+EBAY_CACHE_DB      = 'data/ebay_cache.sqlite'
+EBAY_CACHE_BACKEND = os.environ.get('EBAY_CACHE_BACKEND', 'sqlite').lower()   # sqlite | json
 EBAY_CACHE_PERSIST_TTL = 24 * 3600   # 24 h — skip the eBay call entirely if result is fresher than this
 EBAY_CACHE_PRUNE_DAYS  = 7           # drop persisted entries older than this on save
 RUN_METADATA_FILE  = 'data/run_metadata.json'
 SUMMARY_FILE       = 'data/pricing_summary.json'
 
-RUN_MODE      = os.environ.get('RUN_MODE', 'batch').lower()   # batch | full | player | tcdb
+RUN_MODE      = os.environ.get('RUN_MODE', 'batch').lower()   # batch | full | player | tcdb | rescore
 TARGET_PLAYER = os.environ.get('TARGET_PLAYER', '').strip().lower()
 START_ROW     = int(os.environ.get('START_ROW', '0'))  # skip sheet rows below this (0 = no skip)
+DRY_RUN       = os.environ.get('DRY_RUN', '').lower() in ('1', 'true', 'yes')   # report the query plan, price nothing
+
+# Rescore mode — re-price from the local catalog export + caches, no network
+CATALOG_CSV     = os.environ.get('CATALOG_CSV', "Ben + Marty's Baseball Card Collection - Pricing Sheet.csv")
+RESCORE_WORKERS = int(os.environ.get('RESCORE_WORKERS', '0')) or (os.cpu_count() or 1)
+RESCORE_CHUNK   = 250   # cards per worker task (query groups are never split)
 
 # ── Column map — matches the actual sheet layout ──────────────────────────────
 # Read columns (A–F):
@@ -176,11 +199,169 @@ def audit_input_rows(rows: list[list]) -> dict:
     }
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# Stage timing
+# ══════════════════════════════════════════════════════════════════════════════
+# `with span('stage'):` times a stage of the run. Every span feeds per-stage
+# totals and p50/p95 (over a reservoir of STAGE_SAMPLES durations per stage),
+# reported under 'stages' in run_metadata.json. Spans closed while a card is
+# being priced (inside card_span()) are also summed per card, and each card's
+# per-stage totals land in fixed-bucket histograms under 'per_card' — a slow
+# tail of cards shows up there even when the medians look fine. eBay fetches
+# made by the prefetch pool belong to no card, so per-card ebay_search time
+# is what the card itself waited for.
+#
+# With TRACE_FILE set, spans are also kept (up to TRACE_MAX_EVENTS) and
+# written as Chrome trace-event JSON alongside run_metadata.json — open it in
+# chrome://tracing or ui.perfetto.dev. Rescore-mode workers are separate
+# processes; only the parent's spans are collected there.
+# ─────────────────────────────────────────────────────────────────────────────
+
+TRACE_FILE          = os.environ.get('TRACE_FILE', '')   # e.g. data/trace.json ('' = off)
+TRACE_MAX_EVENTS    = 200_000   # ~80 MB of spans; later ones are counted, not kept
+STAGE_SAMPLES       = 5000      # per stage, for the percentiles
+CARD_HIST_BOUNDS_MS = (10, 50, 100, 500, 1000, 2000, 5000, 10_000, 30_000, 90_000)
+
+_span_lock     = threading.Lock()
+_span_stats: dict[str, dict] = {}        # {stage: count / total / max + duration reservoir}
+_card_hist:  dict[str, list[int]] = {}   # {stage: cards per CARD_HIST_BOUNDS_MS bucket, + overflow}
+_span_local    = threading.local()       # .card → {stage: seconds} while a card is being priced
+_trace_events: list[tuple] = []
+_trace_threads: dict[int, str] = {}
+_trace_dropped = 0
+_trace_t0      = time.perf_counter()
+
+
+class _Span:
+    """Context manager behind span(). name may be changed inside the block
+    (ebay_search names the cache tier that answered); args go to the trace."""
+    __slots__ = ('name', 'args', '_t0')
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record_span(self.name, self._t0, time.perf_counter() - self._t0, self.args)
+        return False
+
+
+class _CardSpan(_Span):
+    """span('card') that also collects the stages timed inside it."""
+    __slots__ = ()
+
+    def __enter__(self):
+        _span_local.card = {}
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        stages, _span_local.card = _span_local.card, None
+        with _span_lock:
+            for name, secs in stages.items():
+                hist = _card_hist.setdefault(name, [0] * (len(CARD_HIST_BOUNDS_MS) + 1))
+                hist[bisect.bisect_left(CARD_HIST_BOUNDS_MS, secs * 1000)] += 1
+        return False
+
+
+def span(name: str, **args) -> _Span:
+    return _Span(name, args)
+
+
+def card_span(row_number: int) -> _CardSpan:
+    return _CardSpan('card', {'row': row_number})
+
+
+def _record_span(name: str, t0: float, secs: float, args: dict):
+    global _trace_dropped
+    card = getattr(_span_local, 'card', None)
+    if card is not None:
+        card[name] = card.get(name, 0.0) + secs
+    with _span_lock:
+        st = _span_stats.get(name)
+        if st is None:
+            st = _span_stats[name] = {'count': 0, 'total_s': 0.0, 'max_s': 0.0, 'samples': []}
+        st['count']   += 1
+        st['total_s'] += secs
+        st['max_s']    = max(st['max_s'], secs)
+        if len(st['samples']) < STAGE_SAMPLES:
+            st['samples'].append(secs)
+        else:
+            j = random.randrange(st['count'])   # reservoir: every span equally likely to be kept
+            if j < STAGE_SAMPLES:
+                st['samples'][j] = secs
+        if TRACE_FILE:
+            if len(_trace_events) < TRACE_MAX_EVENTS:
+                tid = threading.get_native_id()
+                if tid not in _trace_threads:
+                    _trace_threads[tid] = threading.current_thread().name
+                _trace_events.append((name, t0, secs, tid, args))
+            else:
+                _trace_dropped += 1
+
+
+def stage_stats() -> dict:
+    """run_metadata.json view: 'stages' (slowest total first) and 'per_card'."""
+    with _span_lock:
+        stages = {k: dict(v, samples=sorted(v['samples'])) for k, v in _span_stats.items()}
+        hists  = {k: list(v) for k, v in _card_hist.items()}
+    out = {}
+    for name, st in sorted(stages.items(), key=lambda kv: -kv[1]['total_s']):
+        lat = st['samples']
+        out[name] = {
+            'count':   st['count'],
+            'total_s': round(st['total_s'], 2),
+            'p50_ms':  round(lat[len(lat) // 2] * 1000, 2) if lat else None,
+            'p95_ms':  round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000, 2) if lat else None,
+            'max_ms':  round(st['max_s'] * 1000, 2),
+        }
+    return {
+        'stages':   out,
+        'per_card': {
+            'bounds_ms': list(CARD_HIST_BOUNDS_MS),   # counts[i]: cards ≤ bounds_ms[i] (last: above all)
+            'cards':     sum(hists.get('card', ())),
+            'counts':    hists,
+        },
+    }
+
+
+def write_trace(path: str = TRACE_FILE):
+    """Chrome trace-event JSON of the spans so far (complete 'X' events, µs)."""
+    if not path:
+        return
+    with _span_lock:
+        events, threads, dropped = list(_trace_events), dict(_trace_threads), _trace_dropped
+    pid   = os.getpid()
+    trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': n}}
+             for tid, n in threads.items()]
+    for name, t0, secs, tid, args in events:
+        ev = {'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+              'ts': round((t0 - _trace_t0) * 1e6, 1), 'dur': round(secs * 1e6, 1)}
+        if args:
+            ev['args'] = args
+        trace.append(ev)
+    try:
+        _write_json_atomic(path, {'traceEvents': trace, 'displayTimeUnit': 'ms',
+                                  'otherData': {'dropped_events': dropped}},
+                           separators=(',', ':'), default=str)
+        log.info('Wrote %s (%d spans%s)', path, len(events), f', {dropped} dropped' if dropped else '')
+    except Exception as e:
+        log.warning('Failed to write trace: %s', e)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Google Sheets
 # ══════════════════════════════════════════════════════════════════════════════
 
 def get_sheets_service():
+    if SHEETS_API_BASE:
+        from google.auth.credentials import AnonymousCredentials
+        return build('sheets', 'v4', credentials=AnonymousCredentials(), static_discovery=True,
+                     client_options={'api_endpoint': SHEETS_API_BASE.rstrip('/') + '/'}).spreadsheets()
     creds_json = os.environ.get('GOOGLE_CREDENTIALS_JSON')
     if not creds_json:
         raise RuntimeError('GOOGLE_CREDENTIALS_JSON not set')
@@ -194,13 +375,21 @@ def get_sheets_service():
 
 def read_sheet(service) -> list[list]:
     log.info('Reading %s…', SHEET_NAME)
-    result = service.values().get(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"'{SHEET_NAME}'"
-    ).execute()
+    with span('read_sheet'):
+        result = service.values().get(
+            spreadsheetId=SPREADSHEET_ID,
+            range=f"'{SHEET_NAME}'"
+        ).execute()
     return result.get('values', [])
 
 
+def read_catalog_csv(path: str = CATALOG_CSV) -> list[list]:
+    """The sheet's local CSV export — rescore mode's stand-in for read_sheet()."""
+    log.info('Reading %s…', path)
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.reader(f))
+
+
 def write_rows(service, updates: list[dict]):
     """Batch-write non-contiguous output segments for multiple rows in one API call.
 
@@ -250,6 +439,132 @@ def col_index_to_letter(col_1indexed: int) -> str:
     return s
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# HTTP
+# ══════════════════════════════════════════════════════════════════════════════
+# Every outbound request except Sheets (eBay search + OAuth, 130point,
+# Claude's fetch_page) goes through one keep-alive session, so repeat calls
+# to a host reuse its TLS connection. Each host's pool holds at most
+# HTTP_POOL_PER_HOST connections and blocks for a free one rather than
+# opening extras. http_request() is the single retry policy: connection
+# errors, timeouts and 5xx are retried with exponential backoff; anything
+# else is returned for the caller to judge. Per-host latency and connection
+# reuse go into run_metadata.json under 'http'.
+# ─────────────────────────────────────────────────────────────────────────────
+
+HTTP_POOL_PER_HOST = int(os.environ.get('HTTP_POOL_PER_HOST', '0')) or max(4, EBAY_CONCURRENCY)
+HTTP_RETRY_STATUS  = (500, 502, 503, 504)
+HTTP_LATENCY_SAMPLES = 5000   # per host, for the percentiles
+
+_http_session: Optional[requests.Session] = None
+_http_lock  = threading.Lock()
+_http_stats: dict[str, dict] = {}   # {host: counters + latency samples}
+
+
+class _CountingAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter that remembers the urllib3 pool behind each host, so
+    http_stats() can read the pool's public num_connections counter."""
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        pool = super().get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        _record_pool(request.url, pool)
+        return pool
+
+    def get_connection(self, url, proxies=None):   # requests < 2.32
+        pool = super().get_connection(url, proxies)
+        _record_pool(url, pool)
+        return pool
+
+
+def http_session() -> requests.Session:
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = _CountingAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_PER_HOST, pool_block=True)
+            _http_session.mount('https://', adapter)
+            _http_session.mount('http://', adapter)
+        return _http_session
+
+
+def _http_host_stats(url: str) -> dict:
+    parts = urlsplit(url)
+    with _http_lock:
+        st = _http_stats.get(parts.netloc)
+        if st is None:
+            st = _http_stats[parts.netloc] = {'base': f'{parts.scheme}://{parts.netloc}', 'requests': 0,
+                                              'retries': 0, 'errors': 0, 'latency_s': [], 'pools': {}}
+        return st
+
+
+def _record_pool(url: str, pool):
+    st = _http_host_stats(url)
+    with _http_lock:
+        st['pools'][id(pool)] = pool
+
+
+def http_request(method: str, url: str, *, attempts: int = 3, backoff_s: float = 1.0,
+                 gate=None, inspect=None, **kwargs) -> requests.Response:
+    """session.request() under the shared retry policy: up to attempts tries,
+    sleeping backoff_s · 2^n between them. gate (acquire/release) brackets
+    each try — eBay's rate limiter; inspect(response) runs inside it and may
+    raise to stop immediately. Raises the last error if every try fails."""
+    st = _http_host_stats(url)
+    for attempt in range(attempts):
+        if gate:
+            gate.acquire()
+        t0 = time.perf_counter()
+        try:
+            r = http_session().request(method, url, **kwargs)
+            elapsed = time.perf_counter() - t0
+            with _http_lock:
+                st['requests'] += 1
+                if len(st['latency_s']) < HTTP_LATENCY_SAMPLES:
+                    st['latency_s'].append(elapsed)
+            if inspect:
+                inspect(r)
+        except requests.RequestException as e:
+            with _http_lock:
+                st['errors'] += 1
+            if attempt == attempts - 1:
+                raise
+            log.warning('%s %s failed (attempt %d/%d): %s', method, st['base'], attempt + 1, attempts, e)
+        else:
+            if r.status_code not in HTTP_RETRY_STATUS or attempt == attempts - 1:
+                return r
+            log.warning('%s %s returned %d (attempt %d/%d)', method, st['base'], r.status_code,
+                        attempt + 1, attempts)
+            r.close()
+        finally:
+            if gate:
+                gate.release()
+        with _http_lock:
+            st['retries'] += 1
+        time.sleep(backoff_s * 2 ** attempt)
+
+
+def http_stats() -> dict:
+    """run_metadata.json view: per host request/retry/error counts, latency
+    percentiles, and how many requests reused a pooled connection."""
+    out = {}
+    with _http_lock:
+        hosts = {h: dict(st, latency_s=sorted(st['latency_s'])) for h, st in _http_stats.items()}
+        for st in hosts.values():
+            st['opened'] = sum(getattr(p, 'num_connections', 0) for p in st['pools'].values())
+    for host, st in hosts.items():
+        lat = st['latency_s']
+        out[host] = {
+            'requests':        st['requests'],
+            'retries':         st['retries'],
+            'errors':          st['errors'],
+            'new_connections': st['opened'],
+            'reused':          max(0, st['requests'] - st['opened']),
+            'p50_ms':          round(lat[len(lat) // 2] * 1000, 1) if lat else None,
+            'p95_ms':          round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000, 1) if lat else None,
+        }
+    return out
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # eBay OAuth
 # ══════════════════════════════════════════════════════════════════════════════
@@ -258,18 +573,84 @@ _ebay_token: Optional[str] = None
 _ebay_token_expiry: Optional[datetime] = None
 _ebay_quota_exhausted: bool = False   # set True on any 429 → triggers graceful save+exit
 
-# Query-level caches — keyed on query string, value is (timestamp, items).
-# Prevents duplicate API calls when multiple cards share the same query
-# (same player/year/brand, different card number).
-_ebay_cache:  dict[str, tuple[float, list]] = {}
-EBAY_CACHE_TTL  = 600   # 10 minutes (in-memory fast-path)
+# Cache hierarchy, checked in order by ebay_search():
+#   memory   — parsed _Listing records per query, LRU-bounded by an estimated
+#              footprint of EBAY_MEM_CACHE_MB and expiring after EBAY_CACHE_TTL
+#   disk     — slimmed raw items, survives across GHA runs (EBAY_CACHE_PERSIST_TTL)
+#   negative — queries that recently came back empty (see "Negative cache")
+#   network  — the Browse API itself
+# Each tier counts its own hits/misses for run_metadata.json; the totals
+# below are what the logs and api_calls have always reported.
+EBAY_CACHE_TTL    = 600   # 10 minutes (in-memory fast-path)
+EBAY_MEM_CACHE_MB = float(os.environ.get('EBAY_MEM_CACHE_MB', '64'))
+
+
+class _LruCache:
+    """Memory tier: {key: listings}, least recently used evicted first once
+    the estimated size passes max_bytes. Thread-safe (prefetch workers)."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl       = ttl
+        self._data: OrderedDict[str, tuple] = OrderedDict()   # key → (ts, listings, bytes, depth or None)
+        self._bytes = 0
+        self._lock  = threading.Lock()
+        self.stats  = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+    @staticmethod
+    def _footprint(listings: list) -> int:
+        # Rough: slots object + its small fields, plus title and normalised title.
+        return 64 + sum(360 + 2 * len(l.title) for l in listings)
+
+    def get(self, key: str, min_depth: Optional[int] = None) -> Optional[list]:
+        """Listings for key; a short-paged entry (depth set) only when it
+        reaches min_depth, as _persist_cache_get()."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            if time.time() - entry[0] >= self.ttl:
+                del self._data[key]
+                self._bytes -= entry[2]
+                self.stats['expired'] += 1
+                self.stats['misses']  += 1
+                return None
+            if entry[3] is not None and (min_depth is None or entry[3] < min_depth):
+                self.stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key: str, listings: list, depth: Optional[int] = None):
+        size = self._footprint(listings)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old:
+                self._bytes -= old[2]
+            self._data[key] = (time.time(), listings, size, depth)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._data) > 1:
+                _, (_, _, evicted, _) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.stats['evictions'] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, 'entries': len(self._data), 'est_mb': round(self._bytes / 2**20, 1),
+                    'limit_mb': round(self.max_bytes / 2**20, 1)}
+
+
+_ebay_cache = _LruCache(int(EBAY_MEM_CACHE_MB * 2**20), EBAY_CACHE_TTL)
 
 # Persistent disk cache — survives across GHA runs. Skips eBay entirely when a
 # recent result is already on disk. Counters power run_metadata telemetry.
-_ebay_persist_cache: dict[str, dict] = {}   # {cache_key: {'ts': float, 'items': list}}
-_ebay_persist_loaded: bool = False
-_ebay_cache_hits:     int  = 0
-_ebay_cache_misses:   int  = 0
+_ebay_persist_store = None   # _SqliteCacheStore | _JsonCacheStore, opened on first use
+_ebay_cache_hits:     int  = 0   # any tier
+_ebay_cache_misses:   int  = 0   # went to the network
+_ebay_disk_stats = {'hits': 0, 'misses': 0}
+_ebay_stats_lock = threading.Lock()   # counters are bumped from prefetch worker threads
 
 
 def _slim_item(it: dict) -> dict:
@@ -302,97 +683,413 @@ def _slim_item(it: dict) -> dict:
     return slim
 
 
-def _load_ebay_persist_cache():
-    """Load the on-disk eBay cache once per run. Safe to call repeatedly."""
-    global _ebay_persist_cache, _ebay_persist_loaded
-    if _ebay_persist_loaded:
-        return
-    _ebay_persist_loaded = True
+class _JsonCacheStore:
+    """Legacy backend: the whole cache is one JSON dict, loaded at startup and
+    rewritten in full on every flush. Kept for EBAY_CACHE_BACKEND=json."""
+
+    def __init__(self, path: str):
+        self.path  = path
+        self._lock = threading.Lock()   # prefetch workers put while _save_and_exit flushes
+        self._data: dict[str, dict] = _read_legacy_ebay_cache(path)
+        if self._data:
+            log.info('Loaded %d persisted eBay cache entries', len(self._data))
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._data.get(key)
+
+    def put(self, key: str, entry: dict):
+        with self._lock:
+            self._data[key] = entry
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def flush(self, prune_before: float):
+        with self._lock:
+            self._data = {k: v for k, v in self._data.items()
+                          if isinstance(v, dict) and v.get('ts', 0) >= prune_before}
+            snapshot = dict(self._data)
+        with open(self.path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def size_bytes(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+
+class _SqliteCacheStore:
+    """Indexed backend: one row per query in a WAL-mode SQLite file.
+
+    Lookups and writes touch a single row, so neither startup memory nor
+    checkpoint cost grows with cache size. Each put commits on its own (cheap
+    under WAL + synchronous=NORMAL), so a killed run keeps what it fetched.
+    TTL pruning is a DELETE on the ts index. flush() checkpoints the WAL back
+    into the main file so the cached .sqlite is self-contained.
+
+    The fetch_page cache reuses it with its own table; 'items' is then the
+    page text (any JSON value round-trips).
+    """
+
+    def __init__(self, path: str, legacy_json: str = '', table: str = 'ebay_cache'):
+        self.path  = path
+        self.table = table
+        self._lock = threading.Lock()   # one connection, shared by prefetch workers
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS {table} '
+                           '(key TEXT PRIMARY KEY, ts REAL NOT NULL, items TEXT NOT NULL, meta TEXT)')
+        if 'meta' not in {c[1] for c in self._conn.execute(f'PRAGMA table_info({table})')}:
+            self._conn.execute(f'ALTER TABLE {table} ADD COLUMN meta TEXT')   # caches from before meta
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_ts ON {table} (ts)')
+        # user_version marks the one-time legacy import as done, so a table
+        # that later prunes down to empty doesn't re-import stale JSON.
+        if legacy_json and self._conn.execute('PRAGMA user_version').fetchone()[0] == 0:
+            self._import_legacy(legacy_json)
+
+    def _import_legacy(self, path: str):
+        legacy = _read_legacy_ebay_cache(path)
+        with self._lock:
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (key, ts, items) VALUES (?, ?, ?)',
+                ((k, v.get('ts', 0), json.dumps(v['items'], separators=(',', ':')))
+                 for k, v in legacy.items() if isinstance(v, dict) and isinstance(v.get('items'), list)))
+            self._conn.execute('PRAGMA user_version = 1')
+            self._conn.execute('COMMIT')
+        if legacy:
+            log.info('Imported %d legacy eBay cache entries from %s', len(legacy), path)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(f'SELECT ts, items, meta FROM {self.table} WHERE key = ?',
+                                     (key,)).fetchone()
+        if not row:
+            return None
+        return {**(json.loads(row[2]) if row[2] else {}), 'ts': row[0], 'items': json.loads(row[1])}
+
+    def put(self, key: str, entry: dict):
+        """entry: {'ts', 'items'} plus any other fields, which go in meta."""
+        blob = json.dumps(entry['items'], separators=(',', ':'))
+        meta = {k: v for k, v in entry.items() if k not in ('ts', 'items')}
+        with self._lock:
+            self._conn.execute(f'INSERT OR REPLACE INTO {self.table} (key, ts, items, meta) VALUES (?, ?, ?, ?)',
+                               (key, entry['ts'], blob, json.dumps(meta) if meta else None))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def flush(self, prune_before: float):
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE ts < ?', (prune_before,))
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def size_bytes(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+
+def _read_legacy_ebay_cache(path: str) -> dict:
+    """Read a whole-file JSON cache, migrating fat legacy entries to the slim shape."""
     try:
-        with open(EBAY_CACHE_FILE) as f:
+        with open(path) as f:
             raw = json.load(f)
-        if isinstance(raw, dict):
-            # Migrate any fat legacy entries to the slim shape on load.
-            for k, v in raw.items():
-                if isinstance(v, dict) and isinstance(v.get('items'), list):
-                    v['items'] = [_slim_item(i) for i in v['items']]
-            _ebay_persist_cache = raw
-            log.info('Loaded %d persisted eBay cache entries', len(_ebay_persist_cache))
     except (FileNotFoundError, json.JSONDecodeError):
-        _ebay_persist_cache = {}
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    for v in raw.values():
+        if isinstance(v, dict) and isinstance(v.get('items'), list):
+            v['items'] = [_slim_item(i) for i in v['items']]
+    return raw
+
+
+_ebay_store_lock = threading.Lock()
+
+
+def _load_ebay_persist_cache():
+    """Open the on-disk eBay cache once per run. Safe to call repeatedly."""
+    global _ebay_persist_store
+    if _ebay_persist_store is not None:
+        return _ebay_persist_store
+    with _ebay_store_lock:
+        if _ebay_persist_store is None:
+            os.makedirs('data', exist_ok=True)
+            if EBAY_CACHE_BACKEND == 'json':
+                _ebay_persist_store = _JsonCacheStore(EBAY_CACHE_FILE)
+            else:
+                _ebay_persist_store = _SqliteCacheStore(EBAY_CACHE_DB, legacy_json=EBAY_CACHE_FILE)
+    return _ebay_persist_store
 
 
 def _save_ebay_persist_cache():
-    """Write the eBay cache to disk, pruning entries older than EBAY_CACHE_PRUNE_DAYS."""
-    if not _ebay_persist_loaded:
+    """Flush the eBay cache to disk, pruning entries older than EBAY_CACHE_PRUNE_DAYS."""
+    if _ebay_persist_store is None:
         return
     try:
-        os.makedirs('data', exist_ok=True)
-        cutoff = time.time() - EBAY_CACHE_PRUNE_DAYS * 86400
-        pruned = {k: v for k, v in _ebay_persist_cache.items()
-                  if isinstance(v, dict) and v.get('ts', 0) >= cutoff}
-        with open(EBAY_CACHE_FILE, 'w') as f:
-            json.dump(pruned, f, separators=(',', ':'))
+        _ebay_persist_store.flush(time.time() - EBAY_CACHE_PRUNE_DAYS * 86400)
+        if _ebay_negative_store is not None:
+            # Keep the miss count long enough to keep backing off.
+            _ebay_negative_store.flush(time.time() - 2 * EBAY_NEGATIVE_MAX_DAYS * 86400)
+        if _ebay_depth_store is not None:
+            _ebay_depth_store.flush(time.time() - EBAY_DEPTH_KEEP_DAYS * 86400)
         log.info('Saved eBay cache: %d entries (%.0f KB), hits=%d misses=%d',
-                 len(pruned), os.path.getsize(EBAY_CACHE_FILE) / 1024,
+                 len(_ebay_persist_store), _ebay_persist_store.size_bytes() / 1024,
                  _ebay_cache_hits, _ebay_cache_misses)
     except Exception as e:
         log.warning('Failed to save eBay cache: %s', e)
 
 
-def _persist_cache_get(key: str) -> Optional[list]:
-    """Return cached items if fresher than EBAY_CACHE_PERSIST_TTL, else None."""
-    _load_ebay_persist_cache()
-    entry = _ebay_persist_cache.get(key)
+def _persist_cache_entry(key: str, max_age: Optional[float] = EBAY_CACHE_PERSIST_TTL,
+                         min_depth: Optional[int] = None) -> Optional[dict]:
+    """The cached entry if fresher than max_age seconds (None = any age), else None.
+
+    An entry from a fetch that paged short of the first 200 carries
+    'depth' (listings fetched) and 'complete': False; it only answers a
+    caller that passes a min_depth it reaches (see _planned_min_depth)."""
+    entry = _load_ebay_persist_cache().get(key)
     if not entry:
         return None
-    if time.time() - entry.get('ts', 0) >= EBAY_CACHE_PERSIST_TTL:
+    if max_age is not None and time.time() - entry.get('ts', 0) >= max_age:
         return None
-    return entry.get('items')
+    if not entry.get('complete', True) and (min_depth is None or entry.get('depth', 0) < min_depth):
+        return None
+    return entry
+
 
+def _persist_cache_get(key: str, max_age: Optional[float] = EBAY_CACHE_PERSIST_TTL,
+                       min_depth: Optional[int] = None) -> Optional[list]:
+    """_persist_cache_entry()'s items."""
+    entry = _persist_cache_entry(key, max_age, min_depth)
+    return entry.get('items') if entry else None
 
-def _persist_cache_put(key: str, items: list):
-    """Store items in the on-disk cache. No-op on empty items to force re-fetch next time."""
+
+def _persist_cache_put(key: str, items: list, depth: Optional[int] = None):
+    """Store items in the on-disk cache. No-op on empty items to force re-fetch next time.
+    depth: listings fetched, for a fetch that stopped short of the first 200."""
     if not items:
         return
-    _load_ebay_persist_cache()
-    _ebay_persist_cache[key] = {'ts': time.time(), 'items': [_slim_item(i) for i in items]}
+    entry = {'ts': time.time(), 'items': [_slim_item(i) for i in items]}
+    if depth is not None:
+        entry.update(depth=depth, complete=False)
+    _load_ebay_persist_cache().put(key, entry)
+
+
+# ── Negative cache ────────────────────────────────────────────────────────────
+# The positive cache never stores an empty result, so a query that returns
+# nothing used to be re-sent every time it came up — every night for
+# multi-player and obscure cards, and again for each card sharing it when a
+# Claude tool call repeated it. Empty results go into a separate table
+# instead. The first empty result is trusted for EBAY_NEGATIVE_TTL_H; each
+# consecutive empty re-check doubles the wait, up to EBAY_NEGATIVE_MAX_DAYS,
+# with ±25% jitter so a cohort of dead queries doesn't come due on the same
+# night. Any non-empty result clears the entry.
+# ─────────────────────────────────────────────────────────────────────────────
 
+EBAY_NEGATIVE_TTL_H    = float(os.environ.get('EBAY_NEGATIVE_TTL_H', '12'))
+EBAY_NEGATIVE_MAX_DAYS = float(os.environ.get('EBAY_NEGATIVE_MAX_DAYS', '14'))
+EBAY_NEGATIVE_FILE     = 'data/ebay_negative.json'   # json backend only; sqlite uses a table in EBAY_CACHE_DB
 
-def get_ebay_token() -> str:
+_ebay_negative_store = None
+_ebay_negative_stats = {'hits': 0, 'stored': 0, 'cleared': 0}
+
+
+def _load_ebay_negative_store():
+    global _ebay_negative_store
+    if _ebay_negative_store is not None:
+        return _ebay_negative_store
+    with _ebay_store_lock:
+        if _ebay_negative_store is None:
+            os.makedirs('data', exist_ok=True)
+            if EBAY_CACHE_BACKEND == 'json':
+                _ebay_negative_store = _JsonCacheStore(EBAY_NEGATIVE_FILE)
+            else:
+                _ebay_negative_store = _SqliteCacheStore(EBAY_CACHE_DB, table='ebay_negative')
+    return _ebay_negative_store
+
+
+def _negative_backoff_s(misses: int) -> float:
+    """Jittered wait before re-checking a query that came back empty `misses` times running."""
+    base = min(EBAY_NEGATIVE_TTL_H * 3600 * 2 ** (misses - 1), EBAY_NEGATIVE_MAX_DAYS * 86400)
+    return base * random.uniform(0.75, 1.25)
+
+
+def _negative_cache_hit(key: str, any_age: bool = False) -> bool:
+    """True while an empty result for key is still trusted (any_age: ever recorded)."""
+    entry = _load_ebay_negative_store().get(key)
+    if not entry:
+        return False
+    return any_age or time.time() < entry['items'].get('until', 0)
+
+
+def _negative_cache_put(key: str):
+    """Record another consecutive empty result and schedule the next re-check."""
+    store  = _load_ebay_negative_store()
+    prev   = store.get(key)
+    misses = (prev['items'].get('misses', 0) if prev else 0) + 1
+    now    = time.time()
+    store.put(key, {'ts': now, 'items': {'misses': misses, 'until': now + _negative_backoff_s(misses)}})
+    with _ebay_stats_lock:
+        _ebay_negative_stats['stored'] += 1
+
+
+def _negative_cache_clear(key: str):
+    store = _load_ebay_negative_store()
+    if store.get(key):
+        store.delete(key)
+        with _ebay_stats_lock:
+            _ebay_negative_stats['cleared'] += 1
+
+
+# ── Token store ───────────────────────────────────────────────────────────────
+# The client-credentials token (valid ~2 h) is kept in a small local file so
+# back-to-back runs and parallel worker processes share one token instead of
+# each doing its own OAuth round trip. Readers never lock: writes are an
+# atomic rename. A refresh holds an flock on the store's .lock file and first
+# re-reads the store, so when several processes race only one of them
+# fetches. start_token_refresher() fetches the token on a background thread
+# while the run loads the sheet, and renews it EBAY_TOKEN_REFRESH_AHEAD
+# seconds before expiry, so ebay_search() never waits on OAuth.
+# ─────────────────────────────────────────────────────────────────────────────
+
+EBAY_TOKEN_STORE         = os.environ.get('EBAY_TOKEN_STORE', 'data/.ebay_token.json')   # never committed
+EBAY_TOKEN_REFRESH_AHEAD = 600   # s
+
+_ebay_token_lock = threading.Lock()
+_token_stats = {'store_hits': 0, 'fetches': 0, 'background_refreshes': 0}
+_token_refresher: Optional[threading.Thread] = None
+_token_refresher_stop = threading.Event()
+
+
+def _token_store_key() -> str:
+    """Tokens are filed per app id, so switching credentials never reuses one."""
+    return hashlib.sha256(os.environ.get('EBAY_APP_ID', '').encode()).hexdigest()[:16]
+
+
+def _read_token_store() -> Optional[tuple[str, float]]:
+    """(token, expiry epoch) for this app id, or None."""
+    try:
+        with open(EBAY_TOKEN_STORE) as f:
+            entry = json.load(f).get(_token_store_key()) or {}
+        return entry['token'], float(entry['expires_at'])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_token_store(token: str, expires_at: float):
+    """Atomic, owner-only write; entries for other app ids are kept."""
+    try:
+        with open(EBAY_TOKEN_STORE) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    data[_token_store_key()] = {'token': token, 'expires_at': expires_at}
+    os.makedirs(os.path.dirname(EBAY_TOKEN_STORE) or '.', exist_ok=True)
+    tmp = f'{EBAY_TOKEN_STORE}.{os.getpid()}.tmp'
+    with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, EBAY_TOKEN_STORE)
+
+
+def _adopt_token(token: str, expires_at: float) -> str:
     global _ebay_token, _ebay_token_expiry
+    _ebay_token        = token
+    _ebay_token_expiry = datetime.fromtimestamp(expires_at, tz=timezone.utc)
+    return token
+
+
+def get_ebay_token() -> str:
     if _ebay_token and _ebay_token_expiry and datetime.now(timezone.utc) < _ebay_token_expiry:
         return _ebay_token
+    # Only one thread refreshes; the rest wait and reuse its token.
+    with _ebay_token_lock:
+        if _ebay_token and _ebay_token_expiry and datetime.now(timezone.utc) < _ebay_token_expiry:
+            return _ebay_token
+        stored = _read_token_store()
+        if stored and stored[1] > time.time():
+            _token_stats['store_hits'] += 1
+            return _adopt_token(*stored)
+        return _fetch_ebay_token()
+
+
+def _fetch_ebay_token(min_ttl: float = 0) -> str:
+    """A token with more than min_ttl seconds left — another process's fresh
+    one from the store if it beat us to the lock, else a new one from eBay.
+    Call with _ebay_token_lock held."""
+    os.makedirs(os.path.dirname(EBAY_TOKEN_STORE) or '.', exist_ok=True)
+    with open(f'{EBAY_TOKEN_STORE}.lock', 'w') as lock_f:
+        fcntl.flock(lock_f, fcntl.LOCK_EX)   # released when the file closes
+        stored = _read_token_store()
+        if stored and stored[1] - time.time() > min_ttl:
+            _token_stats['store_hits'] += 1
+            return _adopt_token(*stored)
+
+        app_id = os.environ['EBAY_APP_ID']
+        secret = os.environ['EBAY_CLIENT_SECRET']
+        creds  = base64.b64encode(f'{app_id}:{secret}'.encode()).decode()
+
+        # Four tries, 1s/2s/4s apart — a transient DNS/network blip on the GHA
+        # runner can fail the token fetch and kill the entire run.
+        r = http_request(
+            'POST', f'{EBAY_API_BASE}/identity/v1/oauth2/token',
+            attempts=4, backoff_s=1.0,
+            headers={
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'Authorization': f'Basic {creds}'
+            },
+            data='grant_type=client_credentials&scope=https%3A%2F%2Fapi.ebay.com%2Foauth%2Fapi_scope',
+            timeout=15
+        )
+        r.raise_for_status()
+        data       = r.json()
+        expires_at = time.time() + data['expires_in'] - 60
+        _token_stats['fetches'] += 1
+        try:
+            _write_token_store(data['access_token'], expires_at)
+        except OSError as e:
+            log.warning('Could not persist eBay token: %s', e)
+        log.info('eBay token refreshed')
+        return _adopt_token(data['access_token'], expires_at)
 
-    app_id = os.environ['EBAY_APP_ID']
-    secret = os.environ['EBAY_CLIENT_SECRET']
-    creds  = base64.b64encode(f'{app_id}:{secret}'.encode()).decode()
 
-    # Retry with exponential backoff — a transient DNS/network blip on the
-    # GHA runner can fail the token fetch and kill the entire run.
-    for attempt in range(4):
+def _token_refresh_loop():
+    while not _token_refresher_stop.is_set():
         try:
-            r = requests.post(
-                'https://api.ebay.com/identity/v1/oauth2/token',
-                headers={
-                    'Content-Type': 'application/x-www-form-urlencoded',
-                    'Authorization': f'Basic {creds}'
-                },
-                data='grant_type=client_credentials&scope=https%3A%2F%2Fapi.ebay.com%2Foauth%2Fapi_scope',
-                timeout=15
-            )
-            r.raise_for_status()
-            data = r.json()
-            _ebay_token        = data['access_token']
-            _ebay_token_expiry = datetime.now(timezone.utc) + timedelta(seconds=data['expires_in'] - 60)
-            log.info('eBay token refreshed')
-            return _ebay_token
+            with _ebay_token_lock:
+                stored = _read_token_store()
+                if stored and stored[1] - time.time() > EBAY_TOKEN_REFRESH_AHEAD:
+                    if _ebay_token != stored[0]:
+                        _token_stats['store_hits'] += 1
+                    _adopt_token(*stored)
+                else:
+                    _fetch_ebay_token(min_ttl=EBAY_TOKEN_REFRESH_AHEAD)
+                    _token_stats['background_refreshes'] += 1
+                wait = _ebay_token_expiry.timestamp() - time.time() - EBAY_TOKEN_REFRESH_AHEAD
         except Exception as e:
-            if attempt == 3:
-                raise
-            wait = 2 ** attempt   # 1s, 2s, 4s
-            log.warning('eBay token fetch failed (attempt %d/4): %s — retrying in %ds', attempt + 1, e, wait)
-            time.sleep(wait)
+            log.warning('Background eBay token refresh failed: %s', e)
+            wait = 60
+        _token_refresher_stop.wait(max(30.0, wait))
+
+
+def start_token_refresher():
+    """Fetch (or load) the eBay token off the critical path and keep it fresh
+    for the rest of the run. No-op without eBay credentials."""
+    global _token_refresher
+    if _token_refresher is not None or not os.environ.get('EBAY_APP_ID'):
+        return
+    _token_refresher = threading.Thread(target=_token_refresh_loop, name='ebay-token', daemon=True)
+    _token_refresher.start()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -404,6 +1101,62 @@ class EbayQuotaExhausted(Exception):
     pass
 
 
+class _EbayRateLimiter:
+    """Token bucket shared by every thread that calls the Browse API.
+
+    Refills at 1000 / EBAY_SLEEP_MS tokens per second — the old fixed per-call
+    sleep, now enforced across all workers instead of per call. It also tracks
+    the last X-RateLimit-Remaining value and never lets more requests be in
+    flight than that budget minus EBAY_QUOTA_MIN, so N concurrent workers can't
+    overshoot the daily quota between header updates. When the budget is that
+    tight, requests go out one at a time and _check_ebay_quota makes the call.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int):
+        self._rate      = rate_per_sec
+        self._burst     = max(1, burst)
+        self._tokens    = float(self._burst)
+        self._last      = time.monotonic()
+        self._in_flight = 0
+        self._remaining: Optional[int] = None
+        self._cond      = threading.Condition()
+
+    def acquire(self):
+        """Block until a request may be sent. Raises EbayQuotaExhausted if
+        another worker has already hit the quota."""
+        with self._cond:
+            while True:
+                if _ebay_quota_exhausted:
+                    raise EbayQuotaExhausted('eBay quota already exhausted this run.')
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+                self._last   = now
+                budget_ok = (self._remaining is None or self._in_flight == 0
+                             or self._remaining - self._in_flight > EBAY_QUOTA_MIN)
+                if budget_ok and self._tokens >= 1:
+                    self._tokens    -= 1
+                    self._in_flight += 1
+                    return
+                # Out of tokens → sleep until the next one; over budget → wait
+                # for an in-flight request to report fresh quota headers.
+                wait = (1 - self._tokens) / self._rate if budget_ok else 1.0
+                self._cond.wait(timeout=max(wait, 0.001))
+
+    def release(self):
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._cond.notify_all()
+
+    def observe(self, remaining: int):
+        """Record the latest X-RateLimit-Remaining header value."""
+        with self._cond:
+            self._remaining = remaining
+            self._cond.notify_all()
+
+
+_ebay_limiter = _EbayRateLimiter(1000 / EBAY_SLEEP_MS, EBAY_CONCURRENCY)
+
+
 def _check_ebay_quota(headers: dict):
     """Inspect eBay rate-limit headers. Raises EbayQuotaExhausted if the daily
     limit is spent and the reset is more than 5 minutes away."""
@@ -414,6 +1167,7 @@ def _check_ebay_quota(headers: dict):
         try:
             rem = int(remaining)
             log.debug('eBay quota remaining: %d', rem)
+            _ebay_limiter.observe(rem)
             if rem <= EBAY_QUOTA_MIN:
                 reset_msg = ''
                 if reset_ts:
@@ -454,89 +1208,431 @@ def _debug_log_raw_item_once(items: list[dict]):
     log.info('[debug] Date/time-ish fields found: %s', date_ish or '(none)')
 
 
-def ebay_search(query: str, price_filter: str = None) -> list[dict]:
+def ebay_search(query: str, price_filter: str = None, planned: bool = False) -> list['_Listing']:
     """Search eBay Browse API. Any 429 triggers an immediate graceful save+exit —
-    there is nothing productive to do while throttled, and waiting wastes runner minutes."""
-    global _ebay_quota_exhausted, _ebay_cache_hits, _ebay_cache_misses
-
-    if _ebay_quota_exhausted:
-        raise EbayQuotaExhausted('eBay quota already exhausted this run.')
-
-    # 1. In-memory cache — same-run duplicate queries
-    cache_key = f'{query}|{price_filter or ""}'
-    _now_ts   = time.time()
-    _cached   = _ebay_cache.get(cache_key)
-    if _cached and _now_ts - _cached[0] < EBAY_CACHE_TTL:
-        log.debug('eBay cache hit (mem) for "%s"', query)
-        _ebay_cache_hits += 1
-        return _cached[1]
-
-    # 2. Persistent cache — skip eBay entirely if a fresh result is on disk
-    persisted = _persist_cache_get(cache_key)
-    if persisted is not None:
-        log.debug('eBay cache hit (disk) for "%s"', query)
-        _ebay_cache[cache_key] = (_now_ts, persisted)   # warm in-memory
-        _ebay_cache_hits += 1
-        return persisted
-    _ebay_cache_misses += 1
-
-    token      = get_ebay_token()
-    filter_str = f'buyingOptions:{{FIXED_PRICE|AUCTION}},price:[{price_filter or EBAY_PRICE_RANGE}],itemLocationCountry:US'
+    there is nothing productive to do while throttled, and waiting wastes runner minutes.
+    Thread-safe: prefetch_ebay() calls this from a worker pool.
+
+    Results come back as _Listing records, parsed once as they enter the
+    in-memory cache; the disk cache keeps the slimmed raw items. Timed as
+    ebay_search.<tier> for whichever tier answered.
+
+    planned: the call is for the run's query plan (_fetch_planned), so it
+    pages adaptively and accepts a cached short-paged result that reaches
+    the query's depth record. Other callers (Claude's search_ebay) only
+    take a complete first 200 and refetch otherwise."""
+    global _ebay_cache_hits
+
+    with span('ebay_search.network') as sp:   # renamed below when a cache tier answers
+        # 1. In-memory cache — same-run duplicate queries
+        cache_key = f'{query}|{price_filter or ""}'
+        min_depth = _planned_min_depth(cache_key) if planned and not price_filter else None
+        cached    = _ebay_cache.get(cache_key, min_depth)
+        if cached is not None:
+            sp.name = 'ebay_search.memory'
+            log.debug('eBay cache hit (mem) for "%s"', query)
+            with _ebay_stats_lock:
+                _ebay_cache_hits += 1
+            return cached
+
+        # 2. Persistent cache — skip eBay entirely if a fresh result is on disk
+        persisted = _persist_cache_entry(cache_key, min_depth=min_depth)
+        if persisted is not None:
+            sp.name = 'ebay_search.disk'
+            log.debug('eBay cache hit (disk) for "%s"', query)
+            listings = _as_listings(persisted['items'])
+            _ebay_cache.put(cache_key, listings, persisted.get('depth'))   # warm in-memory
+            with _ebay_stats_lock:
+                _ebay_cache_hits += 1
+                _ebay_disk_stats['hits'] += 1
+            return listings
+        with _ebay_stats_lock:
+            _ebay_disk_stats['misses'] += 1
+
+        # 3. Negative cache — this query came back empty recently
+        if _negative_cache_hit(cache_key):
+            sp.name = 'ebay_search.negative'
+            log.debug('eBay negative cache hit for "%s"', query)
+            with _ebay_stats_lock:
+                _ebay_cache_hits += 1
+                _ebay_negative_stats['hits'] += 1
+            return []
+
+        # Checked after the caches so results a prefetch already pulled in can
+        # still be priced once another worker has hit the quota.
+        if _ebay_quota_exhausted:
+            raise EbayQuotaExhausted('eBay quota already exhausted this run.')
+
+        fetched = _fetch_paged(query, price_filter, cache_key, planned)
+        if fetched is None:
+            return []
+        result, listings, complete = fetched
+        _debug_log_raw_item_once(result)
+        if result:
+            depth = None if complete else len(result)
+            _ebay_cache.put(cache_key, listings, depth)
+            _persist_cache_put(cache_key, result, depth)
+            _negative_cache_clear(cache_key)
+        else:
+            _negative_cache_put(cache_key)   # empties back off instead of re-fetching every run
+        return listings
+
+
+# ── Server-side narrowing ─────────────────────────────────────────────────────
+# Listings _apply_exclusions would always throw away (graded slabs, autos,
+# lots) are kept out of the response where the Browse API can do it:
+#   • negative keywords from AUTO_KW / LOT_KW / GRADED_KW appended to q
+#     (eBay's -word / -"phrase" syntax), as many as fit EBAY_Q_MAX_LEN, and
+#     never a term the query itself contains;
+#   • aspect_filter on the category's item specifics — EBAY_ASPECT_FILTERS
+#     picks which: graded (Graded:{No}), year (Season:{…}) and manufacturer
+#     (Manufacturer:{…}, only for brands in _MANUFACTURERS). Year and
+#     manufacturer come from the query plan's cards, so they only apply to
+#     planned queries. An aspect filter also drops listings whose seller left
+#     that specific blank — including raw cards filter_items would have
+#     accepted — so every aspect is opt-in.
+# Negative keywords only drop titles containing a term _apply_exclusions
+# rejects; aspect filters can also drop good comps as above. The client
+# filters still run unchanged either way.
+# ─────────────────────────────────────────────────────────────────────────────
+
+EBAY_ASPECT_FILTERS = {a.strip() for a in os.environ.get('EBAY_ASPECT_FILTERS', '').lower().split(',')
+                       if a.strip()}                           # graded,year,manufacturer ('' = none)
+EBAY_NEGATIVE_KW    = os.environ.get('EBAY_NEGATIVE_KW', '1').lower() in ('1', 'true', 'yes')
+EBAY_Q_MAX_LEN      = 100   # Browse API limit on q
+
+# brand prefix → the Manufacturer item specific sellers pick for it
+_MANUFACTURERS = {
+    'topps': 'Topps', 'fleer': 'Fleer', 'donruss': 'Donruss', 'upper deck': 'Upper Deck',
+    'score': 'Score', 'leaf': 'Leaf', 'pinnacle': 'Pinnacle', 'pacific': 'Pacific', 'panini': 'Panini',
+}
+
+
+def _negative_terms(query_l: str) -> list[str]:
+    """-keywords for q, most selective first; graded terms are left out when
+    the Graded aspect already covers them."""
+    kws = AUTO_KW + LOT_KW + (() if 'graded' in EBAY_ASPECT_FILTERS else GRADED_KW)
+    terms = []
+    for kw in kws:
+        if not re.fullmatch(r"[a-z0-9' -]+", kw) or kw in query_l:
+            continue   # '/auto' can't be expressed; don't exclude the query's own words
+        terms.append(f'-"{kw}"' if ' ' in kw else f'-{kw}')
+    return terms
+
+
+def ebay_search_params(query: str, price_filter: Optional[str] = None, limit: int = 200,
+                       offset: int = 0, card: Optional[dict] = None) -> dict:
+    """Browse API item_summary/search parameters for a query. card (any card
+    the query serves) supplies the year/manufacturer aspects."""
+    q = f'{query} baseball'
+    if EBAY_NEGATIVE_KW:
+        for term in _negative_terms(q.lower()):
+            if len(q) + 1 + len(term) <= EBAY_Q_MAX_LEN:
+                q += ' ' + term
     params = {
-        'q':            f'{query} baseball',
+        'q':            q,
         'category_ids': EBAY_CATEGORY,
-        'filter':       filter_str,
+        'filter':       f'buyingOptions:{{FIXED_PRICE|AUCTION}},price:[{price_filter or EBAY_PRICE_RANGE}],'
+                        'itemLocationCountry:US',
         'sort':         'bestMatch',
-        'limit':        '200',
+        'limit':        str(limit),
     }
-    for attempt in range(EBAY_RETRIES):
+    if offset:
+        params['offset'] = str(offset)
+
+    aspects = []
+    if 'graded' in EBAY_ASPECT_FILTERS:
+        aspects.append('Graded:{No}')
+    if card and 'year' in EBAY_ASPECT_FILTERS and re.fullmatch(r'\d{4}', str(card.get('year', ''))):
+        aspects.append(f"Season:{{{card['year']}}}")
+    if card and 'manufacturer' in EBAY_ASPECT_FILTERS:
+        brand_l = card.get('brand', '').lower()
+        maker   = next((m for b, m in _MANUFACTURERS.items() if brand_l == b or brand_l.startswith(b + ' ')), None)
+        if maker:
+            aspects.append(f'Manufacturer:{{{maker}}}')
+    if aspects:
+        params['aspect_filter'] = ','.join([f'categoryId:{EBAY_CATEGORY}'] + aspects)
+    return params
+
+
+def _browse_page(query: str, price_filter: Optional[str], limit: int, offset: int,
+                 card: Optional[dict] = None) -> Optional[tuple[list, int]]:
+    """One Browse API search call → (itemSummaries, total matches), or None
+    if it failed. A 429 raises EbayQuotaExhausted."""
+    global _ebay_quota_exhausted, _ebay_cache_misses
+    with _ebay_stats_lock:
+        _ebay_cache_misses += 1
+
+    token  = get_ebay_token()
+    params = ebay_search_params(query, price_filter, limit, offset, card)
+    try:
+        r = http_request(
+            'GET', f'{EBAY_API_BASE}/buy/browse/v1/item_summary/search',
+            attempts=EBAY_RETRIES, backoff_s=5.0,
+            gate=_ebay_limiter,                          # shared token bucket, per try
+            inspect=lambda resp: _check_ebay_quota(resp.headers),   # always, even on success
+            headers={
+                'Authorization':           f'Bearer {token}',
+                'X-EBAY-C-MARKETPLACE-ID': 'EBAY_US',
+            },
+            params=params,
+            timeout=15
+        )
+    except requests.RequestException as e:
+        log.warning('eBay search failed after %d attempts: %s', EBAY_RETRIES, e)
+        return None
+
+    if r.status_code == 200:
         try:
-            r = requests.get(
-                'https://api.ebay.com/buy/browse/v1/item_summary/search',
-                headers={
-                    'Authorization':           f'Bearer {token}',
-                    'X-EBAY-C-MARKETPLACE-ID': 'EBAY_US',
-                },
-                params=params,
-                timeout=15
-            )
-            time.sleep(EBAY_SLEEP_MS / 1000)
-
-            # Always check quota headers, even on success
-            _check_ebay_quota(r.headers)
-
-            if r.status_code == 200:
-                result = r.json().get('itemSummaries', [])
-                _debug_log_raw_item_once(result)
-                if result:   # don't cache empty results (re-fetch on next call)
-                    _ebay_cache[cache_key] = (time.time(), result)
-                    _persist_cache_put(cache_key, result)
-                return result
-
-            if r.status_code == 429:
-                # Stop immediately — no point sleeping or retrying.
-                # Save progress and exit; re-run tomorrow once quota resets.
-                retry_after = r.headers.get('Retry-After', '?')
-                _ebay_quota_exhausted = True
-                raise EbayQuotaExhausted(
-                    f'eBay 429 (Retry-After: {retry_after}s) — saving progress and exiting. '
-                    'Re-run once eBay quota resets (usually midnight UTC).'
-                )
-
-            log.warning('eBay %s for query "%s"', r.status_code, query)
-            return []
+            data = r.json()
+        except ValueError as e:
+            log.warning('eBay returned unreadable JSON for query "%s": %s', query, e)
+            return None
+        items = data.get('itemSummaries', []) or []
+        try:
+            total = int(data.get('total', 0))
+        except (TypeError, ValueError):
+            total = 0
+        return items, max(total, offset + len(items))
+
+    if r.status_code == 429:
+        # Stop immediately — no point sleeping or retrying.
+        # Save progress and exit; re-run tomorrow once quota resets.
+        retry_after = r.headers.get('Retry-After', '?')
+        _ebay_quota_exhausted = True
+        raise EbayQuotaExhausted(
+            f'eBay 429 (Retry-After: {retry_after}s) — saving progress and exiting. '
+            'Re-run once eBay quota resets (usually midnight UTC).'
+        )
+
+    log.warning('eBay %s for query "%s"', r.status_code, query)
+    return None
+
+
+# ── Adaptive paging ───────────────────────────────────────────────────────────
+# A fixed limit=200 page is mostly waste for popular players (a handful of
+# the best-match listings are this card; the rest are discarded by
+# filter_items) and not always enough for a high-value card whose matches
+# sit deeper. When ebay_search() knows which cards a query is for (the run's
+# query plan, via set_query_hints()), it pages instead:
+#   • the first page is sized from this query's recorded depth — how far
+#     into the results the last fetch had to go before every card in the
+#     group had EBAY_ENOUGH_COMPS strict matches (×1.25, 50–200); with no
+#     record it is the old 200, so a query never costs more calls than before;
+#   • paging stops as soon as every card has EBAY_ENOUGH_COMPS strict comps;
+#   • short of that it tops up to 200 (the old coverage), and past 200 it
+#     only continues, up to EBAY_MAX_ITEMS, while a card worth
+#     HIGH_VALUE_THRESH or more is still short and matching under
+#     EBAY_LOW_MATCH_RATE of the listings seen.
+# Queries without hints (Claude's own search_ebay calls) fetch one 200 page.
+# A fetch that stopped before the first 200 is cached under the same key,
+# marked with how deep it went; planned callers reuse it while it reaches
+# the query's depth record, everyone else needs a complete 200 and refetches.
+# ─────────────────────────────────────────────────────────────────────────────
 
+EBAY_PAGE_MIN       = 50
+EBAY_PAGE_MAX       = 200    # Browse API maximum per call, and the old fixed limit
+EBAY_MAX_ITEMS      = int(os.environ.get('EBAY_MAX_ITEMS', '600'))
+EBAY_ENOUGH_COMPS   = CLAUDE_MIN_COMPS   # the count at which even high-value cards skip Claude
+EBAY_LOW_MATCH_RATE = 0.05
+EBAY_DEPTH_FILE     = 'data/ebay_depth.json'   # json backend only; sqlite uses a table in EBAY_CACHE_DB
+EBAY_DEPTH_KEEP_DAYS = 90
+
+_query_hints: dict[str, list[tuple[dict, float]]] = {}   # {query key: [(card, value)]} for this run's plan
+_ebay_depth_store = None
+_ebay_paging_stats = {'queries': 0, 'pages': 0, 'items': 0, 'sized_first_page': 0,
+                      'stopped_enough': 0, 'deep_pages': 0}
+
+
+def set_query_hints(plan: dict[str, list], existing_by_id: dict):
+    """Tell ebay_search() which cards (and their last known value) each planned query serves."""
+    _query_hints.clear()
+    for key, members in plan.items():
+        hints = []
+        for _, row in members:
+            card     = _card_from_row(row)
+            existing = existing_by_id.get(make_card_id(card['year'], card['brand'], card['player'],
+                                                       card['card_number']), {})
+            value    = parse_price(str(existing.get('avg_price') or '')) or parse_price(card['tcdb_price']) or 0.0
+            hints.append((card, value))
+        _query_hints[key] = hints
+
+
+def _load_ebay_depth_store():
+    global _ebay_depth_store
+    if _ebay_depth_store is not None:
+        return _ebay_depth_store
+    with _ebay_store_lock:
+        if _ebay_depth_store is None:
+            os.makedirs('data', exist_ok=True)
+            if EBAY_CACHE_BACKEND == 'json':
+                _ebay_depth_store = _JsonCacheStore(EBAY_DEPTH_FILE)
+            else:
+                _ebay_depth_store = _SqliteCacheStore(EBAY_CACHE_DB, table='ebay_depth')
+    return _ebay_depth_store
+
+
+def _planned_min_depth(cache_key: str) -> Optional[int]:
+    """How deep a cached short-paged result must go to serve the query plan:
+    the listings the last fetch needed before every card in its group had
+    EBAY_ENOUGH_COMPS. None (complete results only) without such a record."""
+    rec = _load_ebay_depth_store().get(cache_key)
+    return rec['items']['depth'] if rec and rec['items'].get('enough') else None
+
+
+def _fetch_paged(query: str, price_filter: Optional[str], cache_key: str,
+                 planned: bool = False) -> Optional[tuple[list, list, bool]]:
+    """(raw items, listings, complete) for a query, paged as described above;
+    None if the first call failed. complete: at least the first 200 matches
+    (or all of them) were fetched, as an un-hinted search would have."""
+    hints = _query_hints.get(_query_key(query)) if planned and not price_filter else None
+    limit = EBAY_PAGE_MAX
+    if hints:
+        rec = _load_ebay_depth_store().get(cache_key)
+        if rec and rec['items'].get('enough'):
+            limit = min(EBAY_PAGE_MAX, max(EBAY_PAGE_MIN, math.ceil(rec['items']['depth'] * 1.25)))
+    sized = limit < EBAY_PAGE_MAX
+
+    matchers = [_TitleMatcher(c['year'], c['brand'], c['player'], c['card_number']) for c, _ in hints or ()]
+    counts   = [0] * len(matchers)
+    reached  = [0] * len(matchers)   # listings seen when each card hit EBAY_ENOUGH_COMPS
+    raw, listings, offset, pages, deep, last_total = [], [], 0, 0, 0, 0
+    while True:
+        try:
+            page = _browse_page(query, price_filter, limit, offset, hints[0][0] if hints else None)
         except EbayQuotaExhausted:
-            raise   # propagate to process_batch → main for graceful save+exit
-        except Exception as e:
-            if attempt == EBAY_RETRIES - 1:
-                log.warning('eBay search failed after %d attempts: %s', EBAY_RETRIES, e)
-                return []
-            time.sleep(5 * (attempt + 1))
+            if not raw:
+                raise
+            break   # keep what the earlier pages got
+        if page is None:
+            if not raw:
+                return None
+            break
+        items, total = page
+        pages += 1
+        last_total = total
+        new = _as_listings(items)
+        for i, l in enumerate(new, start=len(listings) + 1):
+            if not l.price or l.price < 0.50:
+                continue
+            for j, m in enumerate(matchers):
+                if counts[j] < EBAY_ENOUGH_COMPS and m.strict(l):
+                    counts[j] += 1
+                    if counts[j] == EBAY_ENOUGH_COMPS:
+                        reached[j] = i
+        raw.extend(items)
+        listings.extend(new)
+        offset += len(items)
+
+        enough = bool(matchers) and all(c >= EBAY_ENOUGH_COMPS for c in counts)
+        if not hints or enough or len(items) < limit or offset >= total:
+            break
+        if offset < EBAY_PAGE_MAX:
+            limit = EBAY_PAGE_MAX - offset   # top up to the old coverage
+            continue
+        if offset >= EBAY_MAX_ITEMS or not any(
+                v >= HIGH_VALUE_THRESH and c < EBAY_ENOUGH_COMPS and c / offset < EBAY_LOW_MATCH_RATE
+                for (_, v), c in zip(hints, counts)):
+            break
+        limit = min(EBAY_PAGE_MAX, EBAY_MAX_ITEMS - offset)
+        deep += 1
+
+    enough = bool(matchers) and all(c >= EBAY_ENOUGH_COMPS for c in counts)
+    if hints:
+        depth = max(reached) if enough else offset
+        _load_ebay_depth_store().put(cache_key, {'ts': time.time(), 'items': {'depth': depth, 'enough': enough}})
+    with _ebay_stats_lock:
+        st = _ebay_paging_stats
+        st['queries']          += 1
+        st['pages']            += pages
+        st['items']            += len(raw)
+        st['sized_first_page'] += sized
+        st['stopped_enough']   += enough and offset < min(last_total, EBAY_PAGE_MAX)
+        st['deep_pages']       += deep
+    return raw, listings, offset >= min(last_total, EBAY_PAGE_MAX)
+
+
+# ── Query plan ────────────────────────────────────────────────────────────────
+# Many sheet rows share one eBay query (same year/brand/player, different card
+# number). main() groups candidates by normalised query so each group's query
+# is fetched exactly once per run and every card in the group is priced from
+# that one result set — independent of EBAY_CACHE_TTL, and including empty
+# results, which the caches deliberately don't keep.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_planned_items: dict[str, list] = {}   # {query key: listings} for groups still being priced
+
+
+def _query_key(query: str) -> str:
+    """Normalise a query for grouping — eBay search ignores case and spacing."""
+    return ' '.join(query.lower().split())
 
-    return []
 
+def _fetch_planned(query: str) -> list['_Listing']:
+    """ebay_search() at most once per query key while its group is in flight."""
+    key   = _query_key(query)
+    items = _planned_items.get(key)
+    if items is None:
+        items = ebay_search(query, planned=True)   # raises EbayQuotaExhausted if daily limit hit
+        _planned_items[key] = items
+    return items
+
+
+def _cached_listings(query: str) -> list['_Listing']:
+    """Rescore mode's _fetch_planned(): the persisted result at any age, never
+    the network. Raises _KeepExisting when the query was never cached."""
+    key   = _query_key(query)
+    items = _planned_items.get(key)
+    if items is None:
+        persisted = _persist_cache_get(f'{query}|', max_age=None, min_depth=_planned_min_depth(f'{query}|'))
+        if persisted is None:
+            if not _negative_cache_hit(f'{query}|', any_age=True):
+                raise _KeepExisting('not_cached')
+            persisted = []   # known empty — the live path would price it from no comps too
+        items = _planned_items[key] = _as_listings(persisted)
+    return items
+
+
+def prefetch_ebay(queries: list[str]):
+    """Warm the query plan for a batch with EBAY_CONCURRENCY requests in flight.
+
+    A full run is almost entirely network wait, so the pricing loop itself
+    stays serial (SIGALRM timeouts, Claude, logging order) and only the eBay
+    round trips are overlapped here. Every worker goes through ebay_search(),
+    so the shared rate limiter, quota checks and caches all still apply.
+
+    Quota exhaustion is not raised from here: pending queries are cancelled and
+    the pricing loop raises EbayQuotaExhausted at the first card whose query
+    didn't make it into the plan, after pricing everything that did.
+    """
+    if EBAY_CONCURRENCY <= 1:
+        return
+    pending: dict[str, str] = {}   # {query key: first query seen for it}
+    for q in queries:
+        if _query_key(q) not in _planned_items:
+            pending.setdefault(_query_key(q), q)
+    if len(pending) < 2:
+        return
 
+    t0   = time.time()
+    pool = ThreadPoolExecutor(max_workers=EBAY_CONCURRENCY, thread_name_prefix='ebay')
+    try:
+        futures = [pool.submit(_fetch_planned, q) for q in pending.values()]
+        for fut in as_completed(futures):
+            try:
+                fut.result()
+            except EbayQuotaExhausted as e:
+                log.warning('Prefetch stopped: %s', e)
+                for other in futures:
+                    other.cancel()
+                break
+            except Exception as e:
+                log.warning('Prefetch error: %s', e)
+    finally:
+        # cancel_futures so a SIGTERM save+exit doesn't wait on queued queries.
+        pool.shutdown(wait=True, cancel_futures=True)
+    log.info('Prefetched %d eBay queries in %.1fs (%d in flight)',
+             len(pending), time.time() - t0, EBAY_CONCURRENCY)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -589,7 +1685,7 @@ def _norm_player(name: str) -> str:
     eBay listings consistently omit commas and trailing dots that appear in
     some sheet entries (e.g. "Sandy Alomar, Jr." → "sandy alomar jr").
     """
-    return re.sub(r'[,.]', '', name.lower()).strip()
+    return name.lower().replace(',', '').replace('.', '').strip()
 
 
 _PLAYER_NICKNAMES: dict[str, list[str]] = {
@@ -864,22 +1960,6 @@ def _team_variants(team: str) -> list[str]:
     return list(dict.fromkeys([t] + [e.lower() for e in extras]))
 
 
-def _brand_in_title(variants: list[str], title_l: str) -> bool:
-    """Return True if any brand variant appears in the (lowercased) title.
-
-    Short abbreviations (≤3 chars) use word-boundary matching to avoid
-    false positives — e.g. 'ud' should not match inside 'would'.
-    """
-    for v in variants:
-        if len(v) <= 3:
-            if re.search(rf'\b{re.escape(v)}\b', title_l):
-                return True
-        else:
-            if v in title_l:
-                return True
-    return False
-
-
 def _apply_exclusions(title_l: str, card_brand_l: str = '') -> bool:
     """Return True if this listing should be excluded.
 
@@ -888,74 +1968,212 @@ def _apply_exclusions(title_l: str, card_brand_l: str = '') -> bool:
     incorrectly filter valid comps (e.g. a Topps Chrome Refractor card
     should not reject listings containing 'refractor').
     """
-    if any(k in title_l for k in GRADED_KW):   return True
-    if any(k in title_l for k in AUTO_KW):      return True
-    # Standalone "auto" at a word boundary = autograph shorthand on eBay.
-    # Use word-boundary match to avoid false hits on "automatic" etc.
-    if re.search(r'\bauto\b', title_l):         return True
-    if any(k in title_l for k in LOT_KW):       return True
-    if any(k in title_l for k in REPRINT_KW):   return True
-    if any(k in title_l for k in MULTI_KW):     return True
+    return _exclusion_matcher(card_brand_l).excludes(_exclusion_flags(title_l))
+
+
+def _literal_trie_pattern(words: list[str]) -> str:
+    """Regex source matching any of `words`, factored on shared prefixes
+    ('psa|prizm|premium' → 'p(?:sa|r(?:izm|emium))'). re tries alternatives
+    one by one at each position, so the factored form does far fewer
+    comparisons per character than a flat alternation."""
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: dict) -> str:
+        if '' in node:
+            return ''    # a shorter keyword already matches — longer ones are redundant
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+def _any_substring_regex(needles: list[str], short_word_len: int = 0) -> re.Pattern:
+    """One regex matching if any needle occurs as a substring. Needles of
+    short_word_len chars or fewer must match as whole words instead — brand
+    abbreviations like 'ud' would otherwise match inside 'would'."""
+    return re.compile('|'.join(
+        rf'\b{re.escape(n)}\b' if len(n) <= short_word_len else re.escape(n) for n in needles
+    ))
+
+
+# Exclusions split by whether the card's brand can switch them off. The
+# brand-independent rules (graded, autograph, lots, reprints, multiples,
+# serial numbers) reduce to one flag per listing; for the rest the listing
+# keeps which keywords it contains, so each card only compares those against
+# its own brand.
+_HARD_EXCL_RE = re.compile(
+    _literal_trie_pattern([*GRADED_KW, *AUTO_KW, *LOT_KW, *REPRINT_KW, *MULTI_KW])
     # Serial-numbered parallels ("/199", "/25", etc.) — covers the full range,
     # so no separate keyword list of specific denominations is needed.
-    if re.search(r'/\d{1,3}\b', title_l):       return True
+    + r'|/\d{1,3}\b'
+)
+# Standalone "auto" at a word boundary = autograph shorthand on eBay.
+# Use word-boundary match to avoid false hits on "automatic" etc.
+_AUTO_WORD_RE = re.compile(r'\bauto\b')
+# Premium parallels + insert patterns + short prints, by name.
+_BRAND_EXCL_KW = (*PREMIUM_KW, *INSERT_KW, 'short print', 'super short print')
+_BRAND_EXCL_RE = re.compile(_literal_trie_pattern(_BRAND_EXCL_KW))
+# Short print / SSP — word-boundary matching to avoid false positives
+# (e.g. 'sp' inside 'display' or 'especially').
+_SP_WORD_RE  = re.compile(r'\bsp\b')
+_SSP_WORD_RE = re.compile(r'\bssp\b')
 
-    # Premium parallels — skip check if the card's own brand contains the keyword
-    for k in PREMIUM_KW:
-        if k in title_l and k not in card_brand_l:
-            return True
 
-    # Insert patterns — skip check if the card's own brand contains the keyword
-    for k in INSERT_KW:
-        if k in title_l and k not in card_brand_l:
+class _ExclusionFlags(NamedTuple):
+    hard:     bool        # excluded whatever the card's brand
+    keywords: frozenset   # _BRAND_EXCL_KW present in the title
+    sp:       bool        # standalone "sp"
+    ssp:      bool        # standalone "ssp"
+
+
+_NO_BRAND_KW: frozenset = frozenset()
+
+
+def _exclusion_flags(title_l: str) -> _ExclusionFlags:
+    """Scan a lowercased title once for every exclusion rule.
+
+    The word-boundary rules can't use re's first-character skip, so they
+    only run when a cheap substring test says they could match.
+    """
+    hard = (_HARD_EXCL_RE.search(title_l) is not None
+            or ('auto' in title_l and _AUTO_WORD_RE.search(title_l) is not None))
+    keywords = (frozenset(k for k in _BRAND_EXCL_KW if k in title_l)
+                if _BRAND_EXCL_RE.search(title_l) is not None else _NO_BRAND_KW)
+    has_sp = 'sp' in title_l
+    return _ExclusionFlags(
+        hard, keywords,
+        has_sp and _SP_WORD_RE.search(title_l) is not None,
+        has_sp and _SSP_WORD_RE.search(title_l) is not None,
+    )
+
+
+class _ExclusionMatcher:
+    """The brand-dependent half of the exclusion rules for one card brand.
+
+    Applied to _ExclusionFlags, so a listing's title is scanned once no
+    matter how many cards (or filter tiers) look at it. Decisions are
+    identical to checking every rule against the title directly.
+    """
+
+    def __init__(self, card_brand_l: str):
+        self.brand_l = card_brand_l
+        # Skip SP/SSP rules if the card is itself an SP variant.
+        brand_ssp     = _SSP_WORD_RE.search(card_brand_l) is not None
+        self.allow_sp  = brand_ssp or _SP_WORD_RE.search(card_brand_l) is not None
+        self.allow_ssp = brand_ssp
+
+    def excludes(self, flags: _ExclusionFlags) -> bool:
+        if flags.hard:
             return True
+        # Keywords the card's own brand contains don't count against it.
+        if flags.keywords and any(k not in self.brand_l for k in flags.keywords):
+            return True
+        return (flags.sp and not self.allow_sp) or (flags.ssp and not self.allow_ssp)
 
-    # Short print / SSP — word-boundary matching to avoid false positives
-    # (e.g. 'sp' inside 'display' or 'especially'); skip if card is itself an SP variant
-    if not re.search(r'\bsp\b', card_brand_l) and not re.search(r'\bssp\b', card_brand_l):
-        if re.search(r'\bsp\b', title_l):    return True
-    if not re.search(r'\bssp\b', card_brand_l):
-        if re.search(r'\bssp\b', title_l):   return True
-    if 'short print' not in card_brand_l and 'short print' in title_l:          return True
-    if 'super short print' not in card_brand_l and 'super short print' in title_l: return True
 
-    return False
+@lru_cache(maxsize=4096)
+def _exclusion_matcher(card_brand_l: str) -> _ExclusionMatcher:
+    return _ExclusionMatcher(card_brand_l)
 
 
-def filter_items(items, year, brand, player, card_number, team) -> list[dict]:
-    """Strict filter: player + year + brand + card number must all match."""
-    player_vs = _player_name_variants(player)  # ["david justice", "dave justice"]
-    year_s    = str(year)
-    brand_vs  = _brand_variants(brand)          # ["upper deck", "ud"]
-    cn_clean  = (card_number or '').lstrip('#').strip()
-    results   = []
+class _Listing:
+    """One eBay listing, parsed once when its query result enters the cache.
 
-    for item in items:
-        price = _extract_price(item)
-        if not price or price < 0.50:
-            continue
+    Every card sharing the query, both filter tiers and the search_ebay tool
+    read these instead of re-extracting price/type/date and re-normalising
+    the title per card. The exclusion scan is the costly part and most
+    listings never get that far (wrong player/year), so it runs on first use
+    and is kept on the record from then on.
+    """
+    __slots__ = ('title', 'title_n', 'price', 'price_text', 'listing_type',
+                 'end_date', 'best_offer', '_excl')
+
+    def __init__(self, item: dict):
+        self.title        = item.get('title', '') or ''
+        self.title_n      = _norm_player(self.title)
+        self.price        = _extract_price(item)
+        raw               = item.get('price', {})
+        self.price_text   = raw.get('value', '?') if isinstance(raw, dict) else raw   # as eBay sent it
+        self.listing_type = _extract_listing_type(item)
+        self.end_date     = _extract_end_date(item)
+        self.best_offer   = _extract_best_offer(item)
+        self._excl        = None
+
+    @property
+    def excl(self) -> _ExclusionFlags:
+        # Unlocked on purpose: racing workers compute the same value.
+        if self._excl is None:
+            self._excl = _exclusion_flags(self.title_n)
+        return self._excl
+
+    def comp(self) -> dict:
+        return {
+            'price':        self.price,
+            'listing_type': self.listing_type,
+            'end_date':     self.end_date,
+            'best_offer':   self.best_offer,
+            'title':        self.title,
+        }
 
-        title   = item.get('title', '') or ''
-        title_n = _norm_player(title.lower())   # normalise player punctuation in title
 
-        if not any(pv in title_n for pv in player_vs):           continue
-        if year_s   not in title_n:                              continue
-        if brand_vs and not _brand_in_title(brand_vs, title_n):  continue
+def _as_listings(items: list) -> list[_Listing]:
+    """Raw eBay item dicts → _Listing records; records pass through as-is."""
+    return [i if isinstance(i, _Listing) else _Listing(i) for i in items]
+
+
+class _TitleMatcher:
+    """Title tests for one card, compiled once and reused for every listing.
+
+    filter_items used to rebuild the player/brand variant lists and run
+    the brand, exclusion and card-number checks as separate scans per
+    item; with up to 200 listings per query that was the CPU hot loop of a
+    cache-warm run. Decisions are identical to the per-item checks —
+    benchmarks/bench_filter.py verifies that and times both.
+    """
+
+    def __init__(self, year, brand: str, player: str, card_number: str = ''):
+        self.year_s     = str(year)
+        self._player_re = _any_substring_regex(_player_name_variants(player))
+        brand_vs        = _brand_variants(brand)
+        self._brand_re  = _any_substring_regex(brand_vs, short_word_len=3) if brand_vs else None
+        self._excl      = _exclusion_matcher(brand.lower())
+        cn_clean        = (card_number or '').lstrip('#').strip()
+        self._cn_re     = re.compile(rf'#?\b{re.escape(cn_clean)}\b') if cn_clean else None
+
+    def relaxed(self, listing: _Listing) -> bool:
+        """Player + year, minus exclusions."""
+        title_n = listing.title_n
+        return (self.year_s in title_n
+                and self._player_re.search(title_n) is not None
+                and not self._excl.excludes(listing.excl))
+
+    def strict(self, listing: _Listing) -> bool:
+        """Relaxed, plus brand and card number. Cheapest rejections run first;
+        exclusions (the only per-listing scan not shared) only see full matches."""
+        title_n = listing.title_n
+        if self.year_s not in title_n or self._player_re.search(title_n) is None:
+            return False
+        if self._brand_re is not None and self._brand_re.search(title_n) is None:
+            return False
         # Team is NOT used as a hard filter — listings routinely omit team names,
         # and players with multi-team careers would lose too many valid comps.
         # _team_variants() is available for Claude prompt enrichment instead.
-        if _apply_exclusions(title_n, brand.lower()):             continue
-        if cn_clean and not re.search(rf'#?\b{re.escape(cn_clean)}\b', title_n): continue
+        if self._cn_re is not None and self._cn_re.search(title_n) is None:
+            return False
+        return not self._excl.excludes(listing.excl)
 
-        results.append({
-            'price':        price,
-            'listing_type': _extract_listing_type(item),
-            'end_date':     _extract_end_date(item),
-            'best_offer':   _extract_best_offer(item),
-            'title':        title,
-        })
 
-    return results
+def filter_items(items, year, brand, player, card_number, team) -> list[dict]:
+    """Strict filter: player + year + brand + card number must all match.
+    items may be raw eBay dicts or _Listing records (what ebay_search returns)."""
+    matcher = _TitleMatcher(year, brand, player, card_number)
+    return [l.comp() for l in _as_listings(items)
+            if l.price and l.price >= 0.50 and matcher.strict(l)]
 
 
 def filter_items_relaxed(items, year, player, brand: str = '') -> list[dict]:
@@ -963,38 +2181,34 @@ def filter_items_relaxed(items, year, player, brand: str = '') -> list[dict]:
     Used as a fallback when strict filtering finds fewer than LOW_DATA_THRESH comps.
     Still excludes graded, lots, autos, reprints and parallels.
     """
-    player_vs    = _player_name_variants(player)
-    year_s       = str(year)
-    card_brand_l = brand.lower()
-    results      = []
-
-    for item in items:
-        price = _extract_price(item)
-        if not price or price < 0.50:
-            continue
+    matcher = _TitleMatcher(year, brand, player)
+    return [l.comp() for l in _as_listings(items)
+            if l.price and l.price >= 0.50 and matcher.relaxed(l)]
 
-        title   = item.get('title', '') or ''
-        title_n = _norm_player(title.lower())
 
-        if not any(pv in title_n for pv in player_vs): continue
-        if year_s not in title_n:                      continue
-        if _apply_exclusions(title_n, card_brand_l):   continue
+BEST_OFFER_DISCOUNT = 0.10   # haircut applied to Best-Offer-enabled asking prices
+_TYPE_WEIGHT = {'Sold': 1.4,       # confirmed transaction > active listing
+                'Auction': 1.2}    # auction close is also a real price signal
 
-        results.append({
-            'price':        price,
-            'listing_type': _extract_listing_type(item),
-            'end_date':     _extract_end_date(item),
-            'best_offer':   _extract_best_offer(item),
-            'title':        title,
-        })
+_EPOCH  = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US     = timedelta(microseconds=1)
+_DAY_US = 86_400_000_000
+_NO_COMPS = {'price': 0, 'count': 0, 'median': 0, 'min': 0, 'max': 0}
 
-    return results
 
+@lru_cache(maxsize=65536)
+def _end_date_us(end_date: str) -> Optional[int]:
+    """ISO end date → integer µs since the epoch, None if it can't be aged
+    (malformed, or no UTC offset). Comps from one query share dates across
+    every card priced from it, so each string is parsed once."""
+    try:
+        return (datetime.fromisoformat(end_date.replace('Z', '+00:00')) - _EPOCH) // _US
+    except Exception:
+        return None
 
-BEST_OFFER_DISCOUNT = 0.10   # haircut applied to Best-Offer-enabled asking prices
 
-def weighted_average(items: list[dict], half_life_days: float = 45) -> dict:
-    """Recency-weighted average with IQR outlier removal.
+def _comp_columns(items: list[dict], now_us: int) -> tuple[list, list, list]:
+    """(prices, ages in whole days, listing-type multipliers) for one card.
 
     Best-Offer-enabled listings get a modest price haircut before anything
     else runs (IQR bounds, median, weighting) — the asking price on a
@@ -1003,65 +2217,156 @@ def weighted_average(items: list[dict], half_life_days: float = 45) -> dict:
     downstream stat (median, min/max, the final weighted price) reflects the
     same "believed true price," not just the final average.
     """
-    if not items:
-        return {'price': 0, 'count': 0, 'median': 0, 'min': 0, 'max': 0}
-
-    now = datetime.now(timezone.utc)
-    prices_with_age = []
+    prices, ages, mults = [], [], []
+    type_weight = _TYPE_WEIGHT.get
     for item in items:
         ed = item.get('end_date')
         if ed:
-            try:
-                age = (now - datetime.fromisoformat(ed.replace('Z', '+00:00'))).days
-            except Exception:
+            ts = _end_date_us(ed)
+            if ts is None:
                 continue   # malformed date — can't trust recency weight, skip item
+            ages.append((now_us - ts) // _DAY_US)   # == timedelta.days
         else:
-            age = 0
+            ages.append(0)
         price = item['price']
-        if item.get('best_offer'):
-            price = round(price * (1 - BEST_OFFER_DISCOUNT), 2)
-        prices_with_age.append((price, age, item.get('listing_type', 'BIN')))
+        prices.append(round(price * (1 - BEST_OFFER_DISCOUNT), 2) if item.get('best_offer') else price)
+        mults.append(type_weight(item.get('listing_type', 'BIN'), 1.0))
+    return prices, ages, mults
 
-    prices = sorted(p for p, _, _ in prices_with_age)
 
-    # IQR outlier removal — save pre-IQR list so we can fall back to it if
-    # the filter removes every item (can happen with very small/uniform sets)
-    pre_iqr = prices_with_age[:]
-    if len(prices) >= 4:
-        q1 = prices[len(prices) // 4]
-        q3 = prices[len(prices) * 3 // 4]
-        iqr = q3 - q1
-        mult = 2.0 if len(prices) < 5 else 1.5
-        lo, hi = max(0.50, q1 - mult * iqr), q3 + mult * iqr
-        prices_with_age = [(p, a, lt) for p, a, lt in prices_with_age if lo <= p <= hi]
+def _iqr_bounds(sorted_prices: list, mult: float = 1.5) -> Optional[tuple[float, float]]:
+    """(lo, hi) outlier fences, or None below 4 prices. Shared by
+    weighted_average and the search_ebay tool."""
+    n = len(sorted_prices)
+    if n < 4:
+        return None
+    q1  = sorted_prices[n // 4]
+    q3  = sorted_prices[n * 3 // 4]
+    iqr = q3 - q1
+    return max(0.50, q1 - mult * iqr), q3 + mult * iqr
+
 
-    if not prices_with_age:
-        prices_with_age = pre_iqr  # IQR removed everything — use raw list
+def _iqr_mult(n: int) -> float:
+    return 2.0 if n < 5 else 1.5
 
-    if not prices_with_age:
-        return {'price': 0, 'count': 0, 'median': 0, 'min': 0, 'max': 0}
+
+def _comp_stats(prices: list, ages: list, mults: list, half_life_days: float) -> dict:
+    """Recency-weighted average with IQR outlier removal, one card."""
+    keep = list(range(len(prices)))
+    # IQR outlier removal — fall back to the pre-IQR list if the filter
+    # removes every item (can happen with very small/uniform sets)
+    bounds = _iqr_bounds(sorted(prices), _iqr_mult(len(prices)))
+    if bounds:
+        lo, hi  = bounds
+        trimmed = [i for i in keep if lo <= prices[i] <= hi]
+        keep    = trimmed or keep
+    if not keep:
+        return dict(_NO_COMPS)
 
     w_sum = t_sum = 0
-    for p, age, lt in prices_with_age:
-        w = math.exp(-age / half_life_days)
-        if lt == 'Sold':     w *= 1.4   # confirmed transaction > active listing
-        elif lt == 'Auction': w *= 1.2  # auction close is also a real price signal
-        w_sum += p * w
+    for i in keep:
+        w = math.exp(-ages[i] / half_life_days) * mults[i]
+        w_sum += prices[i] * w
         t_sum += w
 
-    clean_prices = sorted(p for p, _, _ in prices_with_age)
-    mid = len(clean_prices) // 2
-    median = clean_prices[mid] if clean_prices else 0
-
+    clean_prices = sorted(prices[i] for i in keep)
     return {
         'price':  round(w_sum / t_sum, 2) if t_sum else 0,
-        'count':  len(prices_with_age),
-        'median': round(median, 2),
+        'count':  len(keep),
+        'median': round(clean_prices[len(clean_prices) // 2], 2),
         'min':    round(clean_prices[0], 2),
         'max':    round(clean_prices[-1], 2),
     }
 
 
+def _comp_stats_np(columns: list[tuple], half_life_days: float) -> list[dict]:
+    """_comp_stats for many cards at once, as padded card × comp matrices.
+
+    Bit-for-bit the same as the per-card loop: exp weights come from
+    math.exp over the distinct ages, sums are sequential (cumsum along each
+    row rather than np.sum's pairwise sum; masked-out slots add 0.0), and
+    the final rounding is Python's round() on the resulting floats. Cards
+    are bucketed by comp count (next power of two) so padding stays < 2×.
+    """
+    out     = [dict(_NO_COMPS) for _ in columns]
+    buckets: dict[int, list[int]] = {}
+    for i, (prices, _, _) in enumerate(columns):
+        if prices:
+            buckets.setdefault(1 << (len(prices) - 1).bit_length(), []).append(i)
+    for width, rows in buckets.items():
+        for i, stats in zip(rows, _comp_stats_matrix([columns[i] for i in rows], width,
+                                                     half_life_days)):
+            out[i] = stats
+    return out
+
+
+def _comp_stats_matrix(columns: list[tuple], width: int, half_life_days: float) -> list[dict]:
+    sizes = np.array([len(prices) for prices, _, _ in columns])
+    n     = len(columns)
+    r_idx = np.repeat(np.arange(n), sizes)
+    c_idx = np.arange(len(r_idx)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    ages  = np.array([a for _, col, _ in columns for a in col], dtype=np.int64)
+    uniq, inv = np.unique(ages, return_inverse=True)
+    decay = np.array([math.exp(-int(a) / half_life_days) for a in uniq])[inv]
+
+    price  = np.zeros((n, width))
+    weight = np.zeros((n, width))
+    valid  = np.zeros((n, width), dtype=bool)
+    price[r_idx, c_idx]  = [p for col, _, _ in columns for p in col]
+    weight[r_idx, c_idx] = decay * np.array([w for _, _, col in columns for w in col])
+    valid[r_idx, c_idx]  = True
+
+    # IQR fences per row (same formula as _iqr_bounds), then the same
+    # fall-back-to-everything rule when a row trims to nothing.
+    ar     = np.arange(n)
+    ranked = np.sort(np.where(valid, price, np.inf), axis=1)
+    q1     = ranked[ar, sizes // 4]
+    q3     = ranked[ar, sizes * 3 // 4]
+    spread = np.where(sizes < 5, 2.0, 1.5) * (q3 - q1)
+    lo, hi = np.maximum(0.50, q1 - spread), q3 + spread
+    keep   = valid & (price >= lo[:, None]) & (price <= hi[:, None])
+    keep  |= ((sizes < 4) | ~keep.any(axis=1))[:, None] & valid
+
+    weight = np.where(keep, weight, 0.0)
+    w_sum  = np.cumsum(price * weight, axis=1)[:, -1]
+    t_sum  = np.cumsum(weight, axis=1)[:, -1]
+    count  = keep.sum(axis=1)
+    clean  = np.sort(np.where(keep, price, np.inf), axis=1)
+    return [{
+        'price':  round(ws / ts, 2) if ts else 0,
+        'count':  c,
+        'median': round(md, 2),
+        'min':    round(lo_v, 2),
+        'max':    round(hi_v, 2),
+    } for ws, ts, c, md, lo_v, hi_v in zip(
+        w_sum.tolist(), t_sum.tolist(), count.tolist(),
+        clean[ar, count // 2].tolist(), clean[:, 0].tolist(), clean[ar, count - 1].tolist())]
+
+
+def weighted_average_batch(comp_lists: list[list[dict]], half_life_days: float = 45) -> list[dict]:
+    """weighted_average() for many cards' comps at once — identical results,
+    computed as NumPy array ops when numpy is installed. Rescoring thousands
+    of cards from cache is where the per-card loop adds up."""
+    now_us  = (datetime.now(timezone.utc) - _EPOCH) // _US
+    columns = [_comp_columns(items, now_us) for items in comp_lists]
+    if np is None:
+        return [_comp_stats(*cols, half_life_days) for cols in columns]
+    return _comp_stats_np(columns, half_life_days)
+
+
+def weighted_average(items: list[dict], half_life_days: float = 45) -> dict:
+    """Recency-weighted average with IQR outlier removal.
+
+    Returns {'price', 'count', 'median', 'min', 'max'}. One card's worth of
+    comps is too few for array setup to pay off, so this runs the plain loop;
+    weighted_average_batch() is the many-cards entry point.
+    """
+    if not items:
+        return dict(_NO_COMPS)
+    now_us = (datetime.now(timezone.utc) - _EPOCH) // _US
+    return _comp_stats(*_comp_columns(items, now_us), half_life_days)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Optional free pricing source — opt-in via env flag.
 # Cached aggressively so it doesn't add material API volume.
@@ -1100,25 +2405,29 @@ def _save_htp_cache():
         log.warning('Failed to save 130point cache: %s', e)
 
 
-def htp_sold_comps(card: dict) -> list[float]:
+def htp_sold_comps(card: dict, offline: bool = False) -> list[float]:
     """Fetch 130point sold comps for high-value cards. Cached 7 days per query.
-    Returns a list of sale prices, or [] if disabled/empty/failed."""
+    Returns a list of sale prices, or [] if disabled/empty/failed.
+    offline: cached prices at any age, never a fetch (rescore mode)."""
     global _htp_last_ts
     if not HUNDRED_THIRTY_POINT_ENABLED:
         return []
     cache = _load_htp_cache()
     q = f"{card.get('year', '')} {card.get('brand', '')} {card.get('player', '')} {card.get('card_number', '')}".strip().lower()
     entry = cache.get(q)
-    if entry and time.time() - entry.get('ts', 0) < HTP_CACHE_TTL:
+    if entry and (offline or time.time() - entry.get('ts', 0) < HTP_CACHE_TTL):
         return entry.get('prices', [])
+    if offline:
+        return []
     # Polite rate limit.
     delta = time.time() - _htp_last_ts
     if delta < HTP_RATE_LIMIT_S:
         time.sleep(HTP_RATE_LIMIT_S - delta)
     _htp_last_ts = time.time()
     try:
-        r = requests.get(
-            'https://130point.com/sales/',
+        r = http_request(
+            'GET', 'https://130point.com/sales/',
+            attempts=2, backoff_s=HTP_RATE_LIMIT_S,
             params={'q': q},
             timeout=20,
             headers={'User-Agent': 'baseball-cards-pricing-agent/1.0 (+github.com/benjamin-cooper/baseball-cards)'},
@@ -1304,10 +2613,36 @@ Rules:
 }"""
 
 
+def _render_comps(listings: list['_Listing'], card: dict = None) -> str:
+    """The search_ebay tool result: listings as Claude is shown them."""
+    if card:
+        excl     = _exclusion_matcher(card.get('brand', '').lower())
+        listings = [l for l in listings if not excl.excludes(l.excl)]
+        if not listings:
+            return 'No clean (non-graded/non-autograph/non-parallel) results found.'
+
+    # IQR trim before presenting to Claude
+    prices_raw = [l.price or 0 for l in listings]
+    bounds     = _iqr_bounds(sorted(p for p in prices_raw if p > 0))
+    if bounds:
+        lo, hi  = bounds
+        trimmed = [l for l, p in zip(listings, prices_raw) if lo <= p <= hi]
+        listings = trimmed or listings
+
+    # Surface listing type + end date so Claude can actually follow the
+    # system prompt's instruction to weight sold/completed listings over
+    # active asking prices — without this it has no way to tell them apart.
+    lines = []
+    for l in listings[:20]:
+        end_str = f', ended {l.end_date[:10]}' if l.end_date else ''
+        lines.append(f'${l.price_text} — [{l.listing_type}{end_str}] {l.title or "?"}')
+    return '\n'.join(lines)
+
+
 def execute_tool(name: str, inputs: dict, card: dict = None) -> str:
     if name == 'search_ebay':
-        items = ebay_search(inputs['query'])
-        if not items:
+        listings = ebay_search(inputs['query'])
+        if not listings:
             return 'No results found.'
 
         # Pre-filter through exclusions so Claude doesn't anchor on graded/auto/SSP outliers.
@@ -1315,60 +2650,131 @@ def execute_tool(name: str, inputs: dict, card: dict = None) -> str:
         # everything gets excluded — if every listing is graded/auto, there are no clean
         # comps to show Claude, and silently handing back auto/graded prices would let it
         # anchor on inflated numbers for a card that has no real raw-card market.
-        if card:
-            card_brand_l = card.get('brand', '').lower()
-            items = [i for i in items
-                     if not _apply_exclusions((i.get('title', '') or '').lower(), card_brand_l)]
-            if not items:
-                return 'No clean (non-graded/non-autograph/non-parallel) results found.'
-
-        # IQR trim before presenting to Claude
-        prices_raw = [float((i.get('price') or {}).get('value') or 0) for i in items]
-        prices_pos = sorted(p for p in prices_raw if p > 0)
-        if len(prices_pos) >= 4:
-            q1  = prices_pos[len(prices_pos) // 4]
-            q3  = prices_pos[len(prices_pos) * 3 // 4]
-            iqr = q3 - q1
-            lo, hi = max(0.50, q1 - 1.5 * iqr), q3 + 1.5 * iqr
-            trimmed = [i for i, p in zip(items, prices_raw) if lo <= p <= hi]
-            items = trimmed or items
-
-        # Surface listing type + end date so Claude can actually follow the
-        # system prompt's instruction to weight sold/completed listings over
-        # active asking prices — without this it has no way to tell them apart.
-        lines = []
-        for i in items[:20]:
-            price   = i.get('price', {}).get('value', '?')
-            ltype   = _extract_listing_type(i)
-            end     = _extract_end_date(i)
-            end_str = f', ended {end[:10]}' if end else ''
-            lines.append(f'${price} — [{ltype}{end_str}] {i.get("title","?")}')
-        return '\n'.join(lines)
+        return _render_comps(listings, card)
 
     elif name == 'fetch_page':
         try:
-            r = requests.get(inputs['url'], headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
-            # Strip HTML tags, collapse whitespace
-            text = re.sub(r'<[^>]+>', ' ', r.text)
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text[:4000]  # trim to avoid huge contexts
+            return fetch_page(inputs['url'])
         except Exception as e:
             return f'Fetch error: {e}'
 
     return 'Unknown tool.'
 
 
+# ── fetch_page ────────────────────────────────────────────────────────────────
+# Claude's fetch_page lookups mostly hit the same few TCDB / PriceCharting set
+# pages from card after card. Pages go through the shared HTTP session,
+# at most PAGE_HOST_CONCURRENCY at a time per host (the Claude pool would
+# otherwise hammer one site), and are read streamed: tags are stripped chunk
+# by chunk and the download stops once PAGE_TEXT_LIMIT characters of text are
+# in hand. The text is cached on disk per URL for PAGE_CACHE_TTL_DAYS (kept
+# out of git; the workflow carries it between runs with actions/cache).
+# ─────────────────────────────────────────────────────────────────────────────
+
+PAGE_CACHE_DB         = 'data/page_cache.sqlite'
+PAGE_CACHE_TTL        = int(os.environ.get('PAGE_CACHE_TTL_DAYS', '7')) * 86400
+PAGE_HOST_CONCURRENCY = int(os.environ.get('PAGE_HOST_CONCURRENCY', '2'))
+PAGE_TEXT_LIMIT       = 4000    # characters handed back to Claude — trims huge contexts
+PAGE_CHUNK_BYTES      = 16384
+PAGE_CARRY_MAX        = 4096    # an unclosed '<' longer than this is flushed as text
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE  = re.compile(r'\s+')
+
+_page_store = None   # _SqliteCacheStore, opened on first use
+_page_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_page_lock  = threading.Lock()
+_page_stats = {'cache_hits': 0, 'fetches': 0, 'bytes_read': 0, 'stopped_early': 0}
+
+
+def _get_page_store():
+    global _page_store
+    with _page_lock:
+        if _page_store is None:
+            os.makedirs('data', exist_ok=True)
+            _page_store = _SqliteCacheStore(PAGE_CACHE_DB, table='page_cache')
+        return _page_store
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc.lower()
+    with _page_lock:
+        if host not in _page_host_slots:
+            _page_host_slots[host] = threading.BoundedSemaphore(PAGE_HOST_CONCURRENCY)
+        return _page_host_slots[host]
+
+
+def _strip_streamed(chunks, limit: int) -> tuple[str, bool]:
+    """Tag-stripped, whitespace-collapsed text of a streamed page, cut at
+    limit characters; also returns whether the stream was abandoned early.
+    Same output as stripping the whole page at once: each chunk is processed
+    up to the first '<' after its last '>', the rest carries over. A carry
+    past PAGE_CARRY_MAX (a stray '<' with no '>' after it) is flushed as
+    text, so one unclosed bracket can't hold back the early stop."""
+    parts, carry, n = [], '', 0
+    for chunk in chunks:
+        buf  = carry + chunk
+        cut  = buf.find('<', buf.rfind('>') + 1)
+        if cut == -1 or len(buf) - cut > PAGE_CARRY_MAX:
+            carry = ''
+        else:
+            buf, carry = buf[:cut], buf[cut:]
+        piece = _WS_RE.sub(' ', _TAG_RE.sub(' ', buf))
+        parts.append(piece)
+        n += len(piece)
+        if n > limit + len(parts):   # joins can merge at most one space per piece
+            return _WS_RE.sub(' ', ''.join(parts)).strip()[:limit], True
+    parts.append(_TAG_RE.sub(' ', carry))
+    return _WS_RE.sub(' ', ''.join(parts)).strip()[:limit], False
+
+
+def fetch_page(url: str) -> str:
+    """Page text for Claude, from the page cache or a streamed fetch."""
+    store = _get_page_store()
+    entry = store.get(url)
+    if entry and time.time() - entry.get('ts', 0) < PAGE_CACHE_TTL:
+        with _page_lock:
+            _page_stats['cache_hits'] += 1
+        return entry['items']
+
+    with _host_slot(url):
+        with http_request('GET', url, attempts=1, timeout=10, stream=True,
+                          headers={'User-Agent': 'Mozilla/5.0'}) as r:
+            r.encoding = r.encoding or 'utf-8'
+            read = [0]
+            def chunks():
+                for c in r.iter_content(chunk_size=PAGE_CHUNK_BYTES, decode_unicode=True):
+                    read[0] += len(c)
+                    yield c
+            text, early = _strip_streamed(chunks(), PAGE_TEXT_LIMIT)
+    with _page_lock:
+        _page_stats['fetches']       += 1
+        _page_stats['bytes_read']    += read[0]
+        _page_stats['stopped_early'] += early
+    if r.status_code == 200:
+        store.put(url, {'ts': time.time(), 'items': text})
+    return text
+
+
+def _save_page_cache():
+    """Prune expired pages and checkpoint the page cache's WAL."""
+    if _page_store is None:
+        return
+    try:
+        _page_store.flush(time.time() - PAGE_CACHE_TTL)
+    except Exception as e:
+        log.warning('Failed to save page cache: %s', e)
+
+
 _claude_call_count = 0
+_claude_lock = threading.Lock()   # counters + cache are touched from CLAUDE_CONCURRENCY workers
 
-def price_with_claude(card: dict) -> Optional[dict]:
-    """Call Claude with tool use to price a difficult card."""
-    global _claude_call_count
-    _claude_call_count += 1
-    client = get_claude()
+
+def _claude_card_desc(card: dict) -> str:
     tcdb_ref     = card.get('tcdb_price') or 'unknown'
     team_aliases = _team_variants(card.get('team', ''))
     team_str     = ', '.join(team_aliases) if len(team_aliases) > 1 else (card.get('team') or 'N/A')
-    desc = (
+    return (
         f"Year: {card['year']}\n"
         f"Brand: {card['brand']}\n"
         f"Player: {card['player']}\n"
@@ -1377,17 +2783,37 @@ def price_with_claude(card: dict) -> Optional[dict]:
         f"Team aliases (use for comp matching): {team_str}\n"
         f"TCDB Reference Price: ${tcdb_ref}"
     )
+
+
+def price_with_claude(card: dict, deadline: Optional[float] = None) -> Optional[dict]:
+    """Call Claude with tool use to price a difficult card.
+
+    deadline (time.monotonic()): pooled calls run outside the SIGALRM card
+    timeout, so price_claude_batch() passes one — no round starts after it
+    and each round's client timeout is cut to what is left."""
+    global _claude_call_count
+    with _claude_lock:
+        _claude_call_count += 1
+    client = get_claude()
+    desc   = _claude_card_desc(card)
     messages = [{'role': 'user', 'content': f'Please price this baseball card:\n\n{desc}'}]
 
     try:
         for _ in range(3):   # max tool-use rounds (1 tool call + 1 follow-up is enough)
+            timeout = 30      # per API round; the whole card is bounded by SIGALRM or deadline
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    log.warning('Claude gave up on %s %s %s after %ds',
+                                card['year'], card['brand'], card['player'], CARD_TIMEOUT_SEC)
+                    return None
             resp = client.messages.create(
                 model='claude-sonnet-4-7',
                 max_tokens=1024,
                 system=SYSTEM_PROMPT,
                 tools=CLAUDE_TOOLS,
                 messages=messages,
-                timeout=30,   # 30s per API round — SIGALRM covers the full card
+                timeout=timeout,
             )
 
             if resp.stop_reason == 'tool_use':
@@ -1422,15 +2848,152 @@ def price_with_claude(card: dict) -> Optional[dict]:
     return None
 
 
+# ── Persistent Claude cache + batch pool ──────────────────────────────────────
+# A card that falls through to Claude usually does so again next run (still
+# thin, still a TCDB fallback). Answers are cached on disk keyed by card id
+# plus a hash of what Claude is shown — the card description (TCDB ref
+# included) and the comps for the card's own eBay query — so a cached answer
+# is reused only while its inputs are unchanged, and for at most
+# CLAUDE_CACHE_TTL. Failed calls are not cached.
+#
+# With CLAUDE_CONCURRENCY > 1, process_batch() defers Claude-eligible cards
+# and prices them together on a thread pool once the batch's algorithmic
+# pass is done, one call per distinct cache key. Workers run outside the
+# SIGALRM card timeout, so each call gets CARD_TIMEOUT_SEC from when its
+# worker picks it up: price_with_claude() stops starting rounds past that,
+# and the pool stops waiting for a call that overruns it inside a tool.
+# ─────────────────────────────────────────────────────────────────────────────
+
+CLAUDE_CACHE_FILE  = 'data/claude_cache.json'
+CLAUDE_CACHE_TTL   = int(os.environ.get('CLAUDE_CACHE_TTL_DAYS', '14')) * 86400
+CLAUDE_CONCURRENCY = int(os.environ.get('CLAUDE_CONCURRENCY', '4'))   # 1 = price inline, card by card
+
+_claude_cache: Optional[dict] = None
+_claude_stats = {'cache_hits': 0, 'cache_misses': 0, 'deferred': 0, 'deduped': 0, 'pool_seconds': 0.0}
+
+
+def _load_claude_cache() -> dict:
+    global _claude_cache
+    if _claude_cache is None:
+        try:
+            with open(CLAUDE_CACHE_FILE) as f:
+                _claude_cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _claude_cache = {}
+    return _claude_cache
+
+
+def _save_claude_cache():
+    """Rewrite the cache (small — one entry per Claude-priced card), pruning expired entries."""
+    if _claude_cache is None:
+        return
+    cutoff = time.time() - CLAUDE_CACHE_TTL
+    try:
+        with _claude_lock:
+            live = {k: v for k, v in _claude_cache.items() if v.get('ts', 0) >= cutoff}
+        _write_json_atomic(CLAUDE_CACHE_FILE, live, separators=(',', ':'))
+    except Exception as e:
+        log.warning('Failed to save Claude cache: %s', e)
+
+
+def claude_cache_key(card: dict, listings: list['_Listing']) -> str:
+    """card_id|sha256 of the card description plus its rendered comps."""
+    card_id = make_card_id(card['year'], card['brand'], card['player'], card['card_number'])
+    shown   = _claude_card_desc(card) + '\n\n' + (_render_comps(listings, card) if listings else '')
+    return f'{card_id}|{hashlib.sha256(shown.encode()).hexdigest()[:16]}'
+
+
+def _claude_cache_get(key: str) -> Optional[dict]:
+    with _claude_lock:
+        entry = _load_claude_cache().get(key)
+        hit   = bool(entry) and time.time() - entry.get('ts', 0) < CLAUDE_CACHE_TTL
+        _claude_stats['cache_hits' if hit else 'cache_misses'] += 1
+    return entry['result'] if hit else None
+
+
+def price_with_claude_cached(card: dict, key: str) -> Optional[dict]:
+    """price_with_claude() behind the persistent cache."""
+    cr = _claude_cache_get(key)
+    if cr is not None:
+        log.info('  → Claude cache hit for %s', key.split('|')[0])
+        return cr
+    with span('claude'):
+        cr = price_with_claude(card)
+    if cr and cr.get('price', 0) > 0:
+        with _claude_lock:
+            _load_claude_cache()[key] = {'ts': time.time(), 'result': cr}
+    return cr
+
+
+def price_claude_batch(pending: list['_ClaudePending']) -> dict[str, Optional[dict]]:
+    """{cache key: Claude result} for deferred cards — cache hits first, then
+    one call per remaining distinct key, CLAUDE_CONCURRENCY at a time."""
+    out: dict[str, Optional[dict]] = {}
+    todo: dict[str, dict] = {}
+    for p in pending:
+        if p.key in out or p.key in todo:
+            _claude_stats['deduped'] += 1
+            continue
+        cr = _claude_cache_get(p.key)
+        if cr is not None:
+            out[p.key] = cr
+        else:
+            todo[p.key] = p.card
+    if todo:
+        t0 = time.time()
+        started: dict[str, float] = {}
+
+        def run(key: str, card: dict) -> Optional[dict]:
+            started[key] = time.monotonic()
+            return price_with_claude(card, deadline=started[key] + CARD_TIMEOUT_SEC)
+
+        pool = ThreadPoolExecutor(max_workers=CLAUDE_CONCURRENCY, thread_name_prefix='claude')
+        try:
+            futures   = {pool.submit(run, key, card): key for key, card in todo.items()}
+            remaining = set(futures)
+            while remaining:
+                done, remaining = wait_futures(remaining, timeout=1.0, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    key = futures[fut]
+                    try:
+                        out[key] = fut.result()
+                    except Exception as e:
+                        log.error('Claude worker error for %s: %s', key.split('|')[0], e)
+                        out[key] = None
+                now = time.monotonic()
+                for fut in [f for f in remaining if now - started.get(futures[f], now) > CARD_TIMEOUT_SEC]:
+                    key = futures[fut]
+                    log.warning('Claude call for %s passed %ds — not waiting for it',
+                                key.split('|')[0], CARD_TIMEOUT_SEC)
+                    out[key] = None
+                    remaining.discard(fut)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)   # an overrun worker finishes on its own
+        with _claude_lock:
+            for key in todo:
+                cr = out.get(key)
+                if cr and cr.get('price', 0) > 0:
+                    _load_claude_cache()[key] = {'ts': time.time(), 'result': cr}
+        elapsed = time.time() - t0
+        _claude_stats['pool_seconds'] += elapsed
+        log.info('Claude batch: %d calls in %.1fs (%d in flight), %d cache hits, %d duplicates',
+                 len(todo), elapsed, min(CLAUDE_CONCURRENCY, len(todo)),
+                 len(out) - len(todo), len(pending) - len(out))
+    _save_claude_cache()
+    return out
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Card Processing
 # ══════════════════════════════════════════════════════════════════════════════
 
-def needs_pricing(row: list, row_index: int, existing_by_id: dict = None) -> bool:
+def needs_pricing(row: list, row_index: int, existing_by_id: dict = None,
+                  history: '_PriceHistory' = None) -> bool:
     """Return True if this card should be re-priced given the current RUN_MODE.
 
     Pricing metadata (confidence, last_updated, avg_price) is looked up from
     the existing JSON results — the sheet is treated as read-only card catalog.
+    With FRESHNESS_MODE=adaptive, history supplies the card's own series.
     """
     def get(col): return (row[col].strip() if col < len(row) and row[col] else '')
 
@@ -1471,22 +3034,26 @@ def needs_pricing(row: list, row_index: int, existing_by_id: dict = None) -> boo
     if not price or price == '0':
         return True
 
-    if last_upd:
-        try:
-            lu = datetime.fromisoformat(last_upd.replace('Z', '+00:00'))
-            if lu.tzinfo is None:
-                lu = lu.replace(tzinfo=timezone.utc)
-            age_days = (datetime.now(timezone.utc) - lu).days
-
-            threshold = _freshness_threshold_days(price, confidence)
-            if age_days < threshold:
-                return False
-        except Exception:
-            pass
+    age_days = _age_days(last_upd)
+    if age_days is not None and age_days < _refresh_threshold_days(_card_id, price, confidence, history):
+        return False
 
     return True
 
 
+def _age_days(last_upd: str) -> Optional[int]:
+    """Whole days since an ISO last_updated stamp (naive = UTC); None if unset or unparseable."""
+    if not last_upd:
+        return None
+    try:
+        lu = datetime.fromisoformat(last_upd.replace('Z', '+00:00'))
+        if lu.tzinfo is None:
+            lu = lu.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - lu).days
+    except Exception:
+        return None
+
+
 def _freshness_threshold_days(price_str, confidence: str) -> int:
     """How many days a card's price can be reused before we re-price it.
     Cheap commons refresh slowly, high-value cards refresh weekly. TCDB fallbacks
@@ -1506,16 +3073,222 @@ def _freshness_threshold_days(price_str, confidence: str) -> int:
     return 7                                  # ≥ HIGH_VALUE_THRESH = refresh weekly
 
 
-def process_card(row: list, row_number: int) -> Optional[dict]:
-    """Price one card.
+# ── Adaptive freshness ────────────────────────────────────────────────────────
+# The static tiers refresh by price band, so a common that has sat at $0.25
+# for a year is re-fetched every 60 days and a $12 card that never moves
+# every week. Adaptive mode fits each card's own history instead: net drift
+# per day plus the day-scaled volatility of the run-to-run log returns give
+# an expected move after t days, |drift|·t + vol·√t, and the card is due
+# once that reaches FRESHNESS_TOLERANCE. The result is clamped to the static
+# tier ladder (7–60 days), so a flat $1–$10 card can stretch from its 14- or
+# 30-day tier toward 60 and a volatile common comes due sooner. Cards worth
+# HIGH_VALUE_THRESH or more keep their weekly tier as a ceiling — adaptive
+# mode can't leave them unpriced for weeks on a flat history. Cards with too
+# little history, and TCDB / floor / low-confidence cards (due for lack of
+# market data, not movement), keep their static tier.
+# ─────────────────────────────────────────────────────────────────────────────
 
-    Returns a dict with:
-      'row'  — 1-based sheet row number
-      'card' — card data dict for the results JSON
-    """
+FRESHNESS_MODE       = os.environ.get('FRESHNESS_MODE', 'static').lower()        # static | adaptive
+FRESHNESS_TOLERANCE  = float(os.environ.get('FRESHNESS_TOLERANCE', '0.10'))     # relative move that makes a price stale
+FRESHNESS_MIN_POINTS = 4          # history entries needed before a card's own series is trusted
+FRESHNESS_WINDOW     = 10         # most recent entries the fit looks at
+FRESHNESS_BOUNDS     = (7, 60)    # shortest / longest static tier
+
+
+def _series_drift_vol(series: list) -> Optional[tuple[float, float]]:
+    """(|drift|, vol) of a history series in log-price per day / per √day,
+    or None if it is too short or spans less than a week."""
+    pts = []
+    for h in series[-FRESHNESS_WINDOW:]:
+        p, d = h.get('price'), h.get('date')
+        if isinstance(p, (int, float)) and p > 0 and d:
+            try:
+                pts.append((datetime.fromisoformat(d).toordinal(), math.log(p)))
+            except ValueError:
+                continue
+    if len(pts) < FRESHNESS_MIN_POINTS:
+        return None
+    span = pts[-1][0] - pts[0][0]
+    if span < FRESHNESS_BOUNDS[0]:
+        return None
+    drift = (pts[-1][1] - pts[0][1]) / span
+    resid = sum(((b[1] - a[1]) - drift * (b[0] - a[0])) ** 2 for a, b in zip(pts, pts[1:]))
+    return abs(drift), math.sqrt(resid / span)
+
+
+def _adaptive_threshold_days(series: list, hi: int = FRESHNESS_BOUNDS[1]) -> Optional[int]:
+    """Days until the expected move reaches FRESHNESS_TOLERANCE, clamped to
+    [FRESHNESS_BOUNDS[0], hi]; None when the series can't support a fit."""
+    fit = _series_drift_vol(series)
+    if fit is None:
+        return None
+    drift, vol = fit
+    tol = math.log1p(FRESHNESS_TOLERANCE)
+    # drift·t + vol·√t = tol, solved as a quadratic in √t
+    if drift > 1e-9:
+        root = (-vol + math.sqrt(vol * vol + 4 * drift * tol)) / (2 * drift)
+    elif vol > 1e-9:
+        root = tol / vol
+    else:
+        return hi
+    return int(min(hi, max(FRESHNESS_BOUNDS[0], root * root)))
+
+
+def _card_adaptive_days(card_id: str, price_str, static: int, confidence: str,
+                        history: '_PriceHistory') -> Optional[int]:
+    """A card's adaptive threshold, or None where its static tier applies."""
+    conf_lc = (confidence or '').lower()
+    if 'tcdb' in conf_lc or 'floor' in conf_lc or 'low' in conf_lc:
+        return None
+    high_value = (parse_price(str(price_str or '')) or 0.0) >= HIGH_VALUE_THRESH
+    return _adaptive_threshold_days(history.before_run(card_id),
+                                    static if high_value else FRESHNESS_BOUNDS[1])
+
+
+def _refresh_threshold_days(card_id: str, price_str, confidence: str,
+                            history: '_PriceHistory' = None) -> int:
+    """The freshness threshold needs_pricing() applies under FRESHNESS_MODE."""
+    static = _freshness_threshold_days(price_str, confidence)
+    if FRESHNESS_MODE != 'adaptive' or history is None:
+        return static
+    adaptive = _card_adaptive_days(card_id, price_str, static, confidence, history)
+    return static if adaptive is None else adaptive
+
+
+def freshness_report(rows: list, existing_by_id: dict, history: '_PriceHistory') -> dict:
+    """Projected eBay searches per month under the static tiers vs. adaptive
+    thresholds, for every priced card. Cards sharing a query share its call,
+    so a query costs 30 / (shortest threshold among its cards) per month."""
+    static_q: dict[str, int] = {}
+    adapt_q:  dict[str, int] = {}
+    fitted = shorter = longer = 0
+    days: list[int] = []
+    for row in rows[1:]:
+        card = _card_from_row(row)
+        if not card['player'] or not card['year'] or not card['brand']:
+            continue
+        card_id  = make_card_id(card['year'], card['brand'], card['player'], card['card_number'])
+        existing = existing_by_id.get(card_id)
+        if not existing or not existing.get('avg_price'):
+            continue
+        price, conf = str(existing['avg_price']), existing.get('confidence', '')
+        st = _freshness_threshold_days(price, conf)
+        ad = _card_adaptive_days(card_id, price, st, conf, history)
+        if ad is None:
+            ad = st
+        else:
+            fitted  += 1
+            shorter += ad < st
+            longer  += ad > st
+        days.append(ad)
+        query = _ebay_query(card)
+        static_q[query] = min(st, static_q.get(query, st))
+        adapt_q[query]  = min(ad, adapt_q.get(query, ad))
+    per_month_static   = sum(30 / d for d in static_q.values())
+    per_month_adaptive = sum(30 / d for d in adapt_q.values())
+    return {
+        'mode':                 FRESHNESS_MODE,
+        'tolerance':            FRESHNESS_TOLERANCE,
+        'cards':                len(days),
+        'cards_fitted':         fitted,
+        'cards_shorter':        shorter,
+        'cards_longer':         longer,
+        'median_days':          _median(days),
+        'calls_per_month': {
+            'static':   round(per_month_static),
+            'adaptive': round(per_month_adaptive),
+            'saved':    round(per_month_static - per_month_adaptive),
+        },
+    }
+
+
+# ── Repricing priority ────────────────────────────────────────────────────────
+# needs_pricing() decides *whether* a card is due; this decides the order, so
+# a BATCH_SIZE cut or an eBay quota that runs out mid-run is spent on the
+# cards whose value has most likely moved. Each factor is scaled to 0–1 and
+# the score is their weighted sum; the breakdown goes into run_metadata.json.
+# ─────────────────────────────────────────────────────────────────────────────
+
+REPRICE_ORDER      = os.environ.get('REPRICE_ORDER', 'priority').lower()   # priority | sheet
+PRIORITY_VALUE_CAP = 100.0   # price at which the value factor saturates
+
+_PRIORITY_WEIGHTS = {
+    'value':      0.35,   # log-scaled price — the same % move costs more on a pricier card
+    'staleness':  0.30,   # age relative to the card's freshness tier (2× overdue = 1)
+    'volatility': 0.20,   # coefficient of variation over the last 10 runs
+    'confidence': 0.15,   # weaker confidence labels are likelier to be off
+}
+
+
+def reprice_priority(row: list, row_number: int, existing_by_id: dict,
+                     history: '_PriceHistory') -> dict:
+    """Priority score for one candidate, with its per-factor breakdown.
+    Never-priced cards score 1 on staleness and confidence; cards without
+    enough history to measure volatility score 0.5 on it."""
+    def get(col): return (row[col].strip() if col < len(row) and row[col] else '')
+
+    card_id  = make_card_id(get(C['YEAR']), get(C['BRAND']), get(C['PLAYER']), get(C['CARD_NUMBER']))
+    existing = existing_by_id.get(card_id, {})
+    price_s  = str(existing.get('avg_price') or '') or get(C['AVG_PRICE'])
+    conf     = existing.get('confidence', '') or get(C['CONFIDENCE'])
+    price    = parse_price(price_s) or parse_price(get(C['TCDB_PRICE'])) or 0.0
+    age      = _age_days(existing.get('last_updated', '') or get(C['LAST_UPDATED']))
+    unpriced = not price_s or price_s == '0'
+
+    hist_prices = [h.get('price') for h in history.before_run(card_id)[-10:]
+                   if isinstance(h.get('price'), (int, float))]
+    med = _median(hist_prices)
+    factors = {
+        'value':      min(1.0, math.log1p(price) / math.log1p(PRIORITY_VALUE_CAP)),
+        'staleness':  (1.0 if age is None or unpriced
+                       else min(2.0, age / _refresh_threshold_days(card_id, price_s, conf, history)) / 2),
+        'volatility': (min(1.0, _stddev(hist_prices) / med) if len(hist_prices) >= 3 and med
+                       else 0.5),
+        'confidence': 1.0 if unpriced else 1.0 - _conf_weight(conf),
+    }
+    score = sum(_PRIORITY_WEIGHTS[k] * v for k, v in factors.items())
+    return {'row': row_number, 'card_id': card_id, 'score': round(score, 4),
+            **{k: round(v, 3) for k, v in factors.items()}}
+
+
+def schedule_by_priority(candidates: list, existing_by_id: dict,
+                         history: '_PriceHistory') -> tuple[list, list[dict]]:
+    """Candidates sorted by descending priority (sheet order breaks ties),
+    plus their score breakdowns in the same order."""
+    scored = sorted(
+        ((reprice_priority(row, row_num, existing_by_id, history), (row_num, row))
+         for row_num, row in candidates),
+        key=lambda sc: -sc[0]['score'],
+    )
+    return [c for _, c in scored], [s for s, _ in scored]
+
+
+def summarize_priority(scores: list[dict], selected: int) -> dict:
+    """run_metadata.json view of a schedule: the weights, where the cut fell,
+    mean factors of the selected vs. deferred cards, and the top of the queue."""
+    def means(group: list[dict]) -> dict:
+        if not group:
+            return {}
+        return {k: round(sum(s[k] for s in group) / len(group), 3) for k in ('score', *_PRIORITY_WEIGHTS)}
+
+    chosen, deferred = scores[:selected], scores[selected:]
+    return {
+        'order':         REPRICE_ORDER,
+        'weights':       _PRIORITY_WEIGHTS,
+        'candidates':    len(scores),
+        'selected':      len(chosen),
+        'cutoff_score':  chosen[-1]['score'] if chosen else None,
+        'mean_selected': means(chosen),
+        'mean_deferred': means(deferred),
+        'top':           chosen[:25],
+    }
+
+
+def _card_from_row(row: list) -> dict:
+    """Pull the catalog fields for one sheet row into a card dict."""
     def get(col): return (row[col] if col < len(row) else '').strip() if col < len(row) else ''
 
-    card = {
+    return {
         'year':        get(C['YEAR']),
         'brand':       get(C['BRAND']),
         'player':      get(C['PLAYER']),
@@ -1524,22 +3297,44 @@ def process_card(row: list, row_number: int) -> Optional[dict]:
         'tcdb_price':  get(C['TCDB_PRICE']),   # F — reference only, we don't write back
     }
 
-    label = f"Row {row_number}: {card['year']} {card['brand']} {card['player']}"
-    log.info('Pricing %s', label)
 
-    # ── Step 1: eBay listings (strict filter) ────────────────────────────────────
+def _ebay_query(card: dict) -> str:
+    """The eBay search string for a card (card number deliberately omitted —
+    filter_items matches it against titles instead)."""
     # Normalise player name in the query (strip commas/dots) so eBay search works
     # correctly for names like "Sandy Alomar, Jr." or "Cal Ripken, Jr."
     query_player = re.sub(r'[,.]', '', card['player']).strip()
-    query = f"{card['year']} {card['brand']} {query_player}"
-
-    ebay_items = ebay_search(query)   # raises EbayQuotaExhausted if daily limit hit
-
-    ebay_filtered = filter_items(
-        ebay_items, card['year'], card['brand'], card['player'],
-        card['card_number'], card['team']
-    )
-    result     = weighted_average(ebay_filtered)
+    return f"{card['year']} {card['brand']} {query_player}"
+
+
+class _KeepExisting(Exception):
+    """Rescore mode can't reproduce this card's price offline — keep its
+    current result. reason: 'not_cached' | 'needs_claude'."""
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class _ClaudePending(NamedTuple):
+    """A card priced up to the Claude step, waiting on price_claude_batch()."""
+    row_number: int
+    card:       dict
+    key:        str    # claude_cache_key()
+    state:      dict   # algorithmic result, handed to _finish_card()
+
+
+def _market_steps(card: dict, ebay_items: list, offline: bool):
+    """Steps 1–1c of process_card() as a generator. Each comp list that needs
+    weighted_average() is yielded and its stats sent back; returns
+    (result, fallback, ebay_count). process_card() answers one card inline;
+    _rescore_chunk() steps a whole chunk in lockstep and answers each round
+    with one weighted_average_batch() call."""
+    with span('filter'):
+        ebay_filtered = filter_items(
+            ebay_items, card['year'], card['brand'], card['player'],
+            card['card_number'], card['team']
+        )
+    result     = yield ebay_filtered
     ebay_count = len(ebay_filtered)
     fallback   = None   # tracks which fallback tier was used
 
@@ -1547,9 +3342,10 @@ def process_card(row: list, row_number: int) -> Optional[dict]:
     # Fires when strict comps are too thin. Gives a market signal even for
     # cards that are rarely listed under an exact card-number search.
     if result['count'] < LOW_DATA_THRESH:
-        relaxed_ebay = filter_items_relaxed(ebay_items, card['year'], card['player'], card['brand'])
+        with span('filter'):
+            relaxed_ebay = filter_items_relaxed(ebay_items, card['year'], card['player'], card['brand'])
         if len(relaxed_ebay) >= LOW_DATA_THRESH:
-            result     = weighted_average(relaxed_ebay)
+            result     = yield relaxed_ebay
             fallback   = 'relaxed'
             ebay_count = len(relaxed_ebay)
             log.info('  → Relaxed filter: %d comps', result['count'])
@@ -1559,16 +3355,64 @@ def process_card(row: list, row_number: int) -> Optional[dict]:
     if (result.get('price', 0) >= HIGH_VALUE_THRESH
             and result['count'] < CLAUDE_MIN_COMPS
             and HUNDRED_THIRTY_POINT_ENABLED):
-        htp_prices = htp_sold_comps(card)
+        htp_prices = htp_sold_comps(card, offline)
         if len(htp_prices) >= HTP_MIN_COMPS:
             # Feed 130point prices through weighted_average for IQR outlier removal.
             synthetic = [{'price': p, 'listing_type': 'Sold', 'end_date': None}
                          for p in htp_prices]
-            htp_result = weighted_average(synthetic)
+            htp_result = yield synthetic
             if htp_result.get('count', 0) >= HTP_MIN_COMPS:
                 log.info('  → 130point: %d sold comps $%.2f', htp_result['count'], htp_result['price'])
                 result = htp_result
                 fallback = '130point'
+    return result, fallback, ebay_count
+
+
+def _run_market_steps(steps) -> tuple:
+    """Drive one card's _market_steps() with the per-card weighted_average()."""
+    try:
+        comps = next(steps)
+        while True:
+            with span('weighted_average'):
+                stats = weighted_average(comps)
+            comps = steps.send(stats)
+    except StopIteration as done:
+        return done.value
+
+
+def process_card(row: list, row_number: int, offline: bool = False,
+                 defer_claude: bool = False, market: Optional[tuple] = None):
+    """Price one card.
+
+    Returns a dict with:
+      'row'  — 1-based sheet row number
+      'card' — card data dict for the results JSON
+
+    offline (rescore mode): comps come from the persisted caches only and
+    nothing touches the network; raises _KeepExisting where that can't
+    reproduce the live path.
+
+    defer_claude: a card that needs Claude returns a _ClaudePending instead;
+    the caller finishes it with _finish_card() once the batch pool is done.
+
+    market: (ebay_items, (result, fallback, ebay_count)) already worked out
+    by the caller — _rescore_chunk() batches steps 1–1c across its chunk.
+    """
+    card = _card_from_row(row)
+
+    label = f"Row {row_number}: {card['year']} {card['brand']} {card['player']}"
+    log.info('Pricing %s', label)
+
+    # ── Steps 1–1c: eBay listings, strict → relaxed → 130point ──────────────────
+    if market is not None:
+        ebay_items, (result, fallback, ebay_count) = market
+    else:
+        query = _ebay_query(card)
+        if offline:
+            ebay_items = _cached_listings(query)
+        else:
+            ebay_items = _fetch_planned(query)   # raises EbayQuotaExhausted if daily limit hit
+        result, fallback, ebay_count = _run_market_steps(_market_steps(card, ebay_items, offline))
 
     # ── Step 1c: TCDB reference price ─────────────────────────────────────────
     # If both filters still come up empty but TCDB has a value, use it as our
@@ -1603,13 +3447,28 @@ def process_card(row: list, row_number: int) -> Optional[dict]:
     if fallback == '130point' and result['count'] >= HTP_MIN_COMPS:
         use_claude = False
 
+    # ── Step 2: Claude for difficult / high-value cards ───────────────────────
+    state = {'result': result, 'fallback': fallback, 'source': source, 'use_claude': use_claude}
+    if not use_claude:
+        return _finish_card(card, row_number, state)
+    if offline:
+        raise _KeepExisting('needs_claude')
+    log.info('  → Using Claude (%s comps, $%.2f)', result['count'], result['price'])
+    key = claude_cache_key(card, ebay_items)
+    if defer_claude:
+        return _ClaudePending(row_number, card, key, state)
+    return _finish_card(card, row_number, state, price_with_claude_cached(card, key))
+
+
+def _finish_card(card: dict, row_number: int, state: dict, cr: Optional[dict] = None) -> dict:
+    """Blend in Claude's answer (if any), apply the era cap / floor and
+    confidence label, and build the result record."""
+    result, fallback, source, use_claude = (
+        state['result'], state['fallback'], state['source'], state['use_claude'])
     claude_reasoning = ''
     claude_overrode  = False   # set True when Claude supplies a real price
 
-    # ── Step 2: Claude for difficult / high-value cards ───────────────────────
     if use_claude:
-        log.info('  → Using Claude (%s comps, $%.2f)', result['count'], result['price'])
-        cr = price_with_claude(card)
         if cr and cr.get('price', 0) > 0:
             # Blend: Claude wins on confidence, algorithmic wins on data volume
             if cr['confidence'] in ('High',) or result['count'] < LOW_DATA_THRESH:
@@ -1715,131 +3574,178 @@ def _weighted_prior(tiers: dict) -> float:
     return num / den if den else 0.0
 
 
-def _apply_smoothing_and_floor(cards: list[dict], priced_this_run: list[dict]):
+POSTPROCESS_WORKERS   = int(os.environ.get('POSTPROCESS_WORKERS', '0')) or (os.cpu_count() or 1)
+POSTPROCESS_MIN_CARDS = 5000   # fresh cards per extra worker — below this, process start-up costs more than it saves
+
+
+def _prior_keys(c: dict) -> dict:
+    """{tier name: grouping key} for one card, in _PRIOR_TIER_WEIGHTS order."""
+    pl, yr, br = c.get('player') or '', c.get('year') or '', c.get('brand') or ''
+    era_b, type_t = era(yr), card_type_tag(br)
+    return {
+        'set':             f"{yr}_{br}",
+        'player_era_type': (pl, era_b, type_t),
+        'player_era':      (pl, era_b),
+        'player':          pl,
+    }
+
+
+def _prior_tables(cards: list[dict]) -> dict[str, dict]:
+    """Sum/count of avg_price per Bayesian-prior grouping tier, over every
+    priced card. Built once per run and only read afterwards."""
+    tables: dict[str, dict] = {name: {} for name in _PRIOR_TIER_WEIGHTS}
+    for c in cards:
+        p = c.get('avg_price', 0)
+        if p and p > 0:
+            for name, key in _prior_keys(c).items():
+                total, n = tables[name].get(key, (0.0, 0))
+                tables[name][key] = (total + p, n + 1)
+    return tables
+
+
+def _apply_smoothing_and_floor(cards: list[dict], priced_this_run: list[dict],
+                               history: '_PriceHistory' = None):
     """Mutate the cards list in place with Phase 6.3–6.6 adjustments.
 
     Only cards priced in this run are candidates; historical entries are
-    left alone so we don't rewrite portfolio history retroactively."""
+    left alone so we don't rewrite portfolio history retroactively.
+
+    Two phases: the prior tables are built over the whole collection, then
+    each fresh card is adjusted from those tables and its own history alone.
+    That second phase runs across POSTPROCESS_WORKERS processes once there
+    are enough fresh cards; results (and log lines) come back in card order,
+    so the output is identical to the serial path.
+    """
     fresh_ids = {r['card']['card_id'] for r in priced_this_run if r.get('card')}
     if not fresh_ids:
         return
 
-    # Load price history for median-of-3 + volatility.
+    # Price history as of the start of the run, for median-of-3 + volatility.
+    history = history or _PriceHistory.load()
+    tables  = _prior_tables(cards)
+
+    # Only the last 10 runs are ever read (6.6), so that's all that's shipped.
+    todo = [(c, history.before_run(c.get('card_id'))[-10:])
+            for c in cards if c.get('card_id') in fresh_ids and (c.get('avg_price', 0) or 0) > 0]
+    workers = min(POSTPROCESS_WORKERS, len(todo) // POSTPROCESS_MIN_CARDS)
+    if workers > 1:
+        size   = -(-len(todo) // workers)
+        chunks = [todo[i:i + size] for i in range(0, len(todo), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_postprocess_worker_init,
+                                 initargs=(tables,)) as pool:
+            done = [out for chunk in pool.map(_postprocess_chunk, chunks) for out in chunk]
+        # Merged back by position — card_id isn't unique (physical copies
+        # share it), and the cards dicts are shared with priced_this_run.
+        for (c, _), (adjusted, notes) in zip(todo, done):
+            c.clear()
+            c.update(adjusted)
+            _log_notes(notes)
+    else:
+        for c, hist in todo:
+            _log_notes(_postprocess_card(c, tables, hist))
+
+
+_pp_tables: dict = {}   # worker-process copy of _prior_tables()
+
+
+def _postprocess_worker_init(tables: dict):
+    global _pp_tables
+    _pp_tables = tables
+
+
+def _postprocess_chunk(chunk: list[tuple]) -> list[tuple]:
+    out = []
+    for c, hist in chunk:
+        notes = _postprocess_card(c, _pp_tables, hist)
+        out.append((c, notes))
+    return out
+
+
+def _log_notes(notes: list[tuple]):
+    for level, msg, *args in notes:
+        log.log(level, msg, *args)
+
+
+def _postprocess_card(c: dict, tables: dict[str, dict], hist: list) -> list[tuple]:
+    """Phase 6.3–6.6 for one freshly priced card, in place. Reads nothing
+    but its arguments, so it can run in any process. Returns the log lines
+    as (level, msg, *args) for the caller to emit in card order."""
+    notes: list[tuple] = []
+    raw_price = c.get('avg_price', 0) or 0
+    raw_count = _resolve_comp_count(c)
+
+    # 6.3 Bayesian smoothing (only for thin *market* data) — blend the raw
+    # price toward comparable cards, favoring the most specific group
+    # available. Deliberately excludes TCDB-reference and Floor-Value
+    # cards: those have ZERO real eBay comps, so their price isn't a noisy
+    # small sample to denoise — it's a book value or era-based default,
+    # and is often a genuinely-accurate low number for a common card that
+    # just happens to share a player with a more collectible set. Pulling
+    # it toward that player's other, unrelated cards would introduce a
+    # systematic upward bias on exactly the cards that should stay cheap.
+    conf_lc = (c.get('confidence') or '').lower()
+    is_non_market_fallback = 'tcdb' in conf_lc or conf_lc == 'floor value'
+    bayesian_applied = False
+    if raw_count < LOW_DATA_THRESH and raw_count > 0 and not is_non_market_fallback:
+        def _excl_self(table: dict, key) -> tuple[float, int]:
+            total, n = table.get(key, (0.0, 0))
+            n     = max(0, n - 1)
+            total = max(0.0, total - raw_price)
+            return (total / n if n else 0.0), n
+
+        tiers = {name: _excl_self(tables[name], key) for name, key in _prior_keys(c).items()}
+        prior = _weighted_prior(tiers)
+        if prior > 0:
+            w_raw = raw_count / (raw_count + SMOOTHING_K)
+            smoothed = round(w_raw * raw_price + (1 - w_raw) * prior, 2)
+            if abs(smoothed - raw_price) > 0.01:
+                notes.append((logging.INFO, '  → Bayesian smoothing: %s $%.2f → $%.2f (prior $%.2f)',
+                              c['card_id'], raw_price, smoothed, prior))
+                c['avg_price'] = smoothed
+                bayesian_applied = True
+    # Clear any stale smoothed_price left over from an older code version —
+    # avg_price is now always the smoothed value when smoothing applied,
+    # so a separate field would either duplicate it or (if not refreshed
+    # this run) dangerously disagree with it.
+    c.pop('smoothed_price', None)
+
+    # 6.4 Median-of-last-3-runs smoothing — guards against a single-run
+    # fluke for cards with enough comps that 6.3 didn't touch them.
+    # Skipped when Bayesian smoothing just fired: for thin-data cards the
+    # price history is often *itself* a run of the same noisy raw reading
+    # (no comparable-card signal was available on those earlier runs
+    # either), so comparing a freshly cross-sectionally-corrected price
+    # against that contaminated history would just revert the fix.
+    if not bayesian_applied:
+        current_price = c.get('avg_price', 0) or 0
+        recent_prices = [h.get('price') for h in hist[-2:] if isinstance(h.get('price'), (int, float))]
+        recent_prices.append(current_price)
+        if len(recent_prices) >= 2:
+            med = _median(recent_prices)
+            # Only apply if the current price is a >25% outlier vs recent runs.
+            if med and abs(current_price - med) / med > 0.25:
+                c['avg_price'] = round(med, 2)
+                notes.append((logging.INFO, '  → Median-of-runs smoothing: %s $%.2f → $%.2f',
+                              c['card_id'], current_price, med))
+
+    # 6.5 TCDB anomaly floor (column F reference).
+    tcdb_ref = c.get('tcdb_price')
     try:
-        with open(HISTORY_FILE) as f:
-            history = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        history = {}
-
-    # Precompute mean/count for each Bayesian-prior grouping tier.
-    from collections import defaultdict
-    set_sums    = defaultdict(lambda: [0.0, 0])   # (year, brand)
-    pet_sums    = defaultdict(lambda: [0.0, 0])   # (player, era, type)
-    pe_sums     = defaultdict(lambda: [0.0, 0])   # (player, era)
-    player_sums = defaultdict(lambda: [0.0, 0])   # (player,)
-    for c in cards:
-        p = c.get('avg_price', 0)
-        if p and p > 0:
-            pl   = c.get('player') or ''
-            yr   = c.get('year') or ''
-            br   = c.get('brand') or ''
-            era_b  = era(yr)
-            type_t = card_type_tag(br)
-            set_sums[f"{yr}_{br}"][0]         += p; set_sums[f"{yr}_{br}"][1]         += 1
-            pet_sums[(pl, era_b, type_t)][0]  += p; pet_sums[(pl, era_b, type_t)][1]  += 1
-            pe_sums[(pl, era_b)][0]           += p; pe_sums[(pl, era_b)][1]           += 1
-            player_sums[pl][0]                += p; player_sums[pl][1]               += 1
-
-    for c in cards:
-        if c.get('card_id') not in fresh_ids:
-            continue
-        raw_price = c.get('avg_price', 0) or 0
-        if raw_price <= 0:
-            continue
-        raw_count = _resolve_comp_count(c)
-
-        # 6.3 Bayesian smoothing (only for thin *market* data) — blend the raw
-        # price toward comparable cards, favoring the most specific group
-        # available. Deliberately excludes TCDB-reference and Floor-Value
-        # cards: those have ZERO real eBay comps, so their price isn't a noisy
-        # small sample to denoise — it's a book value or era-based default,
-        # and is often a genuinely-accurate low number for a common card that
-        # just happens to share a player with a more collectible set. Pulling
-        # it toward that player's other, unrelated cards would introduce a
-        # systematic upward bias on exactly the cards that should stay cheap.
-        conf_lc = (c.get('confidence') or '').lower()
-        is_non_market_fallback = 'tcdb' in conf_lc or conf_lc == 'floor value'
-        if raw_count < LOW_DATA_THRESH and raw_count > 0 and not is_non_market_fallback:
-            pl, yr, br = c.get('player') or '', c.get('year') or '', c.get('brand') or ''
-            era_b, type_t = era(yr), card_type_tag(br)
-
-            def _excl_self(sums: dict, key) -> tuple[float, int]:
-                total, n = sums.get(key, [0.0, 0])
-                n     = max(0, n - 1)
-                total = max(0.0, total - raw_price)
-                return (total / n if n else 0.0), n
-
-            tiers = {
-                'set':             _excl_self(set_sums, f"{yr}_{br}"),
-                'player_era_type': _excl_self(pet_sums, (pl, era_b, type_t)),
-                'player_era':      _excl_self(pe_sums,  (pl, era_b)),
-                'player':          _excl_self(player_sums, pl),
-            }
-            prior = _weighted_prior(tiers)
-            bayesian_applied = False
-            if prior > 0:
-                w_raw = raw_count / (raw_count + SMOOTHING_K)
-                smoothed = round(w_raw * raw_price + (1 - w_raw) * prior, 2)
-                if abs(smoothed - raw_price) > 0.01:
-                    log.info('  → Bayesian smoothing: %s $%.2f → $%.2f (prior $%.2f)',
-                             c['card_id'], raw_price, smoothed, prior)
-                    c['avg_price'] = smoothed
-                    bayesian_applied = True
-        else:
-            bayesian_applied = False
-        # Clear any stale smoothed_price left over from an older code version —
-        # avg_price is now always the smoothed value when smoothing applied,
-        # so a separate field would either duplicate it or (if not refreshed
-        # this run) dangerously disagree with it.
-        c.pop('smoothed_price', None)
-
-        # 6.4 Median-of-last-3-runs smoothing — guards against a single-run
-        # fluke for cards with enough comps that 6.3 didn't touch them.
-        # Skipped when Bayesian smoothing just fired: for thin-data cards the
-        # price history is often *itself* a run of the same noisy raw reading
-        # (no comparable-card signal was available on those earlier runs
-        # either), so comparing a freshly cross-sectionally-corrected price
-        # against that contaminated history would just revert the fix.
-        hist = history.get(c.get('card_id'), [])
-        if not bayesian_applied:
-            current_price = c.get('avg_price', 0) or 0
-            recent_prices = [h.get('price') for h in hist[-2:] if isinstance(h.get('price'), (int, float))]
-            recent_prices.append(current_price)
-            if len(recent_prices) >= 2:
-                med = _median(recent_prices)
-                # Only apply if the current price is a >25% outlier vs recent runs.
-                if med and abs(current_price - med) / med > 0.25:
-                    c['avg_price'] = round(med, 2)
-                    log.info('  → Median-of-runs smoothing: %s $%.2f → $%.2f',
-                             c['card_id'], current_price, med)
-
-        # 6.5 TCDB anomaly floor (column F reference).
-        tcdb_ref = c.get('tcdb_price')
-        try:
-            tcdb_ref_f = float(tcdb_ref) if tcdb_ref else 0.0
-        except (TypeError, ValueError):
-            tcdb_ref_f = 0.0
-        if tcdb_ref_f > 0 and c['avg_price'] < ANOMALY_DROP_RATIO * tcdb_ref_f:
-            floored = round(ANOMALY_FLOOR_FRAC * tcdb_ref_f, 2)
-            log.warning('  → TCDB floor: %s priced $%.2f, TCDB ref $%.2f → floor $%.2f',
-                        c['card_id'], c['avg_price'], tcdb_ref_f, floored)
-            c['avg_price'] = floored
-            conf = c.get('confidence', '')
-            if 'anomaly' not in conf.lower():
-                c['confidence'] = 'Low (anomaly floored)'
+        tcdb_ref_f = float(tcdb_ref) if tcdb_ref else 0.0
+    except (TypeError, ValueError):
+        tcdb_ref_f = 0.0
+    if tcdb_ref_f > 0 and c['avg_price'] < ANOMALY_DROP_RATIO * tcdb_ref_f:
+        floored = round(ANOMALY_FLOOR_FRAC * tcdb_ref_f, 2)
+        notes.append((logging.WARNING, '  → TCDB floor: %s priced $%.2f, TCDB ref $%.2f → floor $%.2f',
+                      c['card_id'], c['avg_price'], tcdb_ref_f, floored))
+        c['avg_price'] = floored
+        conf = c.get('confidence', '')
+        if 'anomaly' not in conf.lower():
+            c['confidence'] = 'Low (anomaly floored)'
 
-        # 6.6 Confidence recalibration from recent volatility.
-        _recalibrate_confidence(c, hist)
+    # 6.6 Confidence recalibration from recent volatility.
+    _recalibrate_confidence(c, hist)
+    return notes
 
 
 def _extract_count_from_confidence(conf: str) -> int:
@@ -1875,7 +3781,7 @@ def _recalibrate_confidence(c: dict, hist: list):
 
 
 def build_results_json(all_rows: list[list], priced_cards: list[dict],
-                       existing_by_id: dict = None) -> dict:
+                       existing_by_id: dict = None, history: '_PriceHistory' = None) -> dict:
     """Merge freshly priced cards with existing JSON data into a full snapshot.
 
     The sheet provides the card catalog (player, year, brand, etc.).
@@ -1916,7 +3822,8 @@ def build_results_json(all_rows: list[list], priced_cards: list[dict],
         cards.append(c)
 
     # ── Algorithmic smoothing + anomaly floor + confidence recalibration ─────
-    _apply_smoothing_and_floor(cards, priced_cards)
+    with span('smoothing'):
+        _apply_smoothing_and_floor(cards, priced_cards, history)
 
     priced = [c for c in cards if c.get('avg_price')]
     total  = sum(c['avg_price'] for c in priced)
@@ -1963,27 +3870,107 @@ def build_results_json(all_rows: list[list], priced_cards: list[dict],
 # Main
 # ══════════════════════════════════════════════════════════════════════════════
 
-def commit_progress(label: str = ''):
-    """Commit data files mid-run (used by full mode for incremental saves)."""
+def commit_progress(label: str = '', logs_only: bool = False):
+    """Commit + push data files. logs_only stages just the append-only
+    checkpoint logs — the mid-run checkpoints use that, since those are the
+    only files safe to stage while pricing keeps writing (appends never
+    rewrite what git already read; a torn last line is skipped on read)."""
     import subprocess
-    try:
-        subprocess.run(['git', 'config', 'user.name',  'github-actions[bot]'], check=True)
-        subprocess.run(['git', 'config', 'user.email', 'github-actions[bot]@users.noreply.github.com'], check=True)
-        add_files = [RESULTS_FILE, HISTORY_FILE]
-        for extra in (EBAY_CACHE_FILE, RUN_METADATA_FILE, SUMMARY_FILE, HTP_CACHE_FILE):
-            if os.path.exists(extra):
-                add_files.append(extra)
-        subprocess.run(['git', 'add', *add_files], check=True)
-        diff = subprocess.run(['git', 'diff', '--cached', '--quiet'])
-        if diff.returncode != 0:
-            msg = f'chore: pricing progress [{label}]' if label else 'chore: pricing progress'
-            subprocess.run(['git', 'commit', '-m', msg], check=True)
-            subprocess.run(['git', 'push'], check=True)
-            log.info('Committed progress: %s', label)
-        else:
-            log.info('No changes to commit for checkpoint: %s', label)
-    except Exception as e:
-        log.warning('Failed to commit progress: %s', e)
+    with span('commit_progress', logs_only=logs_only):
+        try:
+            subprocess.run(['git', 'config', 'user.name',  'github-actions[bot]'], check=True)
+            subprocess.run(['git', 'config', 'user.email', 'github-actions[bot]@users.noreply.github.com'], check=True)
+            add_files = [] if logs_only else [RESULTS_FILE, HISTORY_FILE]
+            # The eBay and page caches stay out of git — the workflow carries
+            # them between runs with actions/cache.
+            for extra in (RUN_METADATA_FILE, SUMMARY_FILE, HTP_CACHE_FILE,
+                          CLAUDE_CACHE_FILE, EBAY_NEGATIVE_FILE, EBAY_DEPTH_FILE):
+                if os.path.exists(extra) and not logs_only:
+                    add_files.append(extra)
+            # Checkpoint logs come and go — stage their removal after compaction too,
+            # or a stale delta would sit in the repo and be resumed by every run.
+            for log_file in (HISTORY_LOG_FILE, RESULTS_DELTA_FILE):
+                if os.path.exists(log_file):
+                    add_files.append(log_file)
+                else:
+                    subprocess.run(['git', 'rm', '-q', '--cached', '--ignore-unmatch', log_file], check=True)
+            if add_files:
+                subprocess.run(['git', 'add', *add_files], check=True)
+            diff = subprocess.run(['git', 'diff', '--cached', '--quiet'])
+            if diff.returncode != 0:
+                msg = f'chore: pricing progress [{label}]' if label else 'chore: pricing progress'
+                subprocess.run(['git', 'commit', '-m', msg], check=True)
+                subprocess.run(['git', 'push'], check=True)
+                log.info('Committed progress: %s', label)
+            else:
+                log.info('No changes to commit for checkpoint: %s', label)
+        except Exception as e:
+            log.warning('Failed to commit progress: %s', e)
+
+
+class _GitCheckpointer:
+    """Runs commit_progress() on a background thread so pricing never waits
+    on git or the push.
+
+    Requests coalesce: only the latest pending one is kept, and commits are
+    at least GIT_CHECKPOINT_INTERVAL_S apart, so a burst of chunk
+    checkpoints becomes one commit of the newest state. stop() drops
+    anything queued and waits out an in-flight commit — shutdown paths call
+    it before rewriting the data files, then commit synchronously.
+    """
+
+    def __init__(self, min_interval_s: float):
+        self.min_interval_s = min_interval_s
+        self._cond     = threading.Condition()
+        self._pending: Optional[str] = None   # label of the latest request
+        self._busy     = False
+        self._last_ts  = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.requests  = 0
+        self.commits   = 0
+
+    def request(self, label: str):
+        with self._cond:
+            self._pending = label
+            self.requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='git-checkpoint', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is None:
+                        self._cond.wait()
+                        continue
+                    delay = self._last_ts + self.min_interval_s - time.time()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                label, self._pending, self._busy = self._pending, None, True
+            try:
+                commit_progress(label, logs_only=True)
+            finally:
+                with self._cond:
+                    self._busy    = False
+                    self._last_ts = time.time()
+                    self.commits += 1
+                    self._cond.notify_all()
+
+    def stop(self):
+        """Drop queued checkpoints and wait for an in-flight one to finish."""
+        with self._cond:
+            self._pending = None
+            while self._busy:
+                self._cond.wait()
+        if self.requests:
+            log.info('Git checkpoints: %d requested → %d committed', self.requests, self.commits)
+
+
+GIT_CHECKPOINT_INTERVAL_S = int(os.environ.get('GIT_CHECKPOINT_INTERVAL_S', '300'))
+_git_checkpointer = _GitCheckpointer(GIT_CHECKPOINT_INTERVAL_S)
 
 
 class _CardTimeout(Exception):
@@ -1992,12 +3979,13 @@ class _CardTimeout(Exception):
 def _card_timeout_handler(signum, frame):
     raise _CardTimeout()
 
-def process_card_timed(row: list, row_number: int) -> Optional[dict]:
+def process_card_timed(row: list, row_number: int, defer_claude: bool = False):
     """process_card() wrapped in a SIGALRM wall-clock timeout (Linux/macOS only)."""
     old = signal.signal(signal.SIGALRM, _card_timeout_handler)
     signal.alarm(CARD_TIMEOUT_SEC)
     try:
-        return process_card(row, row_number)
+        with card_span(row_number):
+            return process_card(row, row_number, defer_claude=defer_claude)
     except _CardTimeout:
         log.warning('Row %d timed out after %ds — skipping', row_number, CARD_TIMEOUT_SEC)
         return None
@@ -2014,27 +4002,255 @@ def process_batch(batch: list, service) -> list:
     Raises EbayQuotaExhausted if the daily quota runs out.
     """
     results, api_calls = [], 0
-
-    for row_num, row in batch:
+    pending: list[_ClaudePending] = []
+    defer   = CLAUDE_CONCURRENCY > 1
+
+    # Overlap the eBay round trips up front; the loop below then reads each
+    # group's shared result set from the query plan.
+    queries = [_ebay_query(_card_from_row(row)) for _, row in batch]
+    keys    = [_query_key(q) for q in queries]
+    with span('ebay_prefetch'):
+        prefetch_ebay(queries)
+    last_use = {k: i for i, k in enumerate(keys)}
+
+    for i, (row_num, row) in enumerate(batch):
         try:
-            r = process_card_timed(row, row_num)
-            if r:
+            r = process_card_timed(row, row_num, defer_claude=defer)
+            if isinstance(r, _ClaudePending):
+                pending.append(r)
+            elif r:
                 results.append(r)
+                _journal_card(r)
                 api_calls += 1
         except EbayQuotaExhausted:
+            # Cards already past eBay still get their Claude step and journal.
+            results.extend(_finish_pending(pending))
             raise
         except Exception as e:
             log.error('Failed row %d: %s', row_num, e)
             _run_errors.append({'row': row_num, 'error': str(e)[:200]})
+        finally:
+            if last_use[keys[i]] == i:
+                _planned_items.pop(keys[i], None)   # group done — release its items
         if api_calls > 0 and api_calls % 100 == 0:
             log.info('Rate limit pause…')
             time.sleep(0.5)
 
+    results.extend(_finish_pending(pending))
+    return results
+
+
+def _finish_pending(pending: list[_ClaudePending]) -> list:
+    """Run the deferred Claude calls as one pooled batch and journal the finished cards."""
+    if not pending:
+        return []
+    _claude_stats['deferred'] += len(pending)
+    answers = price_claude_batch(pending)
+    results = []
+    for p in pending:
+        try:
+            r = _finish_card(p.card, p.row_number, p.state, answers.get(p.key))
+        except Exception as e:
+            log.error('Failed row %d: %s', p.row_number, e)
+            _run_errors.append({'row': p.row_number, 'error': str(e)[:200]})
+            continue
+        results.append(r)
+        _journal_card(r)
     return results
 
 
+def plan_queries(candidates: list) -> dict[str, list]:
+    """Group (row_num, row) candidates by normalised eBay query, in order of
+    first appearance. Each group costs at most one eBay call per run."""
+    groups: dict[str, list] = {}
+    for row_num, row in candidates:
+        key = _query_key(_ebay_query(_card_from_row(row)))
+        groups.setdefault(key, []).append((row_num, row))
+    return groups
+
+
+def summarize_plan(plan: dict[str, list]) -> dict:
+    """How many eBay calls a plan will make — groups whose query isn't already
+    fresh in the persistent cache. Claude's own search_ebay tool calls come on
+    top of this and aren't predictable up front."""
+    cached = 0
+    for members in plan.values():
+        query = _ebay_query(_card_from_row(members[0][1]))
+        if _persist_cache_get(f'{query}|', min_depth=_planned_min_depth(f'{query}|')) is not None:
+            cached += 1
+    largest = sorted(plan.items(), key=lambda kv: len(kv[1]), reverse=True)[:5]
+    return {
+        'cards':          sum(len(m) for m in plan.values()),
+        'unique_queries': len(plan),
+        'cached':         cached,
+        'ebay_calls':     len(plan) - cached,
+        'largest_groups': [{'query': k, 'cards': len(m)} for k, m in largest if len(m) > 1],
+    }
+
+
+def _plan_chunks(plan: dict[str, list], size: int) -> list[list]:
+    """Split a plan into chunks of roughly `size` cards without splitting a
+    query group across chunks (so its results are never fetched twice)."""
+    chunks, cur = [], []
+    for members in plan.values():
+        cur.extend(members)
+        if len(cur) >= size:
+            chunks.append(cur)
+            cur = []
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+
+_query_plan_stats: dict = {}   # summarize_plan() of this run, for run_metadata.json
+_priority_stats:   dict = {}   # summarize_priority() of this run, for run_metadata.json
+_freshness_stats:  dict = {}   # freshness_report() of this run, for run_metadata.json
+
+
+def _load_existing_results() -> dict:
+    """{card_id: card} from the current pricing_results.json."""
+    existing_by_id: dict = {}
+    if os.path.exists(RESULTS_FILE):
+        try:
+            with open(RESULTS_FILE) as f:
+                _data = json.load(f)
+            for c in _data.get('cards', []):
+                if c.get('card_id'):
+                    existing_by_id[c['card_id']] = c
+            log.info('Loaded %d existing pricing results from JSON', len(existing_by_id))
+        except Exception as e:
+            log.warning('Could not load existing results JSON: %s', e)
+    return existing_by_id
+
+
+# ── Rescore mode ──────────────────────────────────────────────────────────────
+# A cache-warm full run is almost all local compute, so re-tuning the pricing
+# logic (weighted_average, BEST_OFFER_DISCOUNT, smoothing, confidence tiers)
+# doesn't need eBay at all. RUN_MODE=rescore reads the catalog from the CSV
+# export and every card's comps from the persisted eBay / 130point caches (at
+# any age), re-prices the whole collection across worker processes and
+# rebuilds pricing_results.json. No Sheets, eBay or Claude calls.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_rescore_stats: dict = {}   # run_rescore() summary, for run_metadata.json
+
+
+def _rescore_worker_init(columns: dict):
+    global C, _ebay_persist_store, _ebay_negative_store, _ebay_depth_store
+    C = columns
+    # each process opens its own sqlite connections
+    _ebay_persist_store = _ebay_negative_store = _ebay_depth_store = None
+
+
+def _rescore_chunk(chunk: list) -> tuple[list, dict]:
+    """Re-price one chunk of (row_num, row) offline. Returns (results,
+    {reason: cards kept at their current price})."""
+    results, kept = [], {}
+
+    def keep(reason: str):
+        kept[reason] = kept.get(reason, 0) + 1
+
+    # Steps 1–1c for the whole chunk in lockstep: each round gathers every
+    # card's next comp list and prices them in one weighted_average_batch().
+    active, markets = [], {}
+    for row_num, row in chunk:
+        try:
+            card  = _card_from_row(row)
+            items = _cached_listings(_ebay_query(card))
+            steps = _market_steps(card, items, offline=True)
+            active.append((row_num, items, steps, next(steps)))
+        except _KeepExisting as e:
+            keep(e.reason)
+        except Exception as e:
+            log.error('Failed row %d: %s', row_num, e)
+            keep('error')
+    while active:
+        with span('weighted_average', cards=len(active)):
+            stats = weighted_average_batch([comps for _, _, _, comps in active])
+        waiting = []
+        for (row_num, items, steps, _), st in zip(active, stats):
+            try:
+                waiting.append((row_num, items, steps, steps.send(st)))
+            except StopIteration as done:
+                markets[row_num] = (items, done.value)
+            except Exception as e:
+                log.error('Failed row %d: %s', row_num, e)
+                keep('error')
+        active = waiting
+
+    for row_num, row in chunk:
+        if row_num not in markets:
+            continue
+        try:
+            r = process_card(row, row_num, offline=True, market=markets[row_num])
+            if r:
+                results.append(r)
+        except _KeepExisting as e:
+            keep(e.reason)
+        except Exception as e:
+            log.error('Failed row %d: %s', row_num, e)
+            keep('error')
+    _planned_items.clear()   # chunks never split a query group
+    return results, kept
+
+
+def run_rescore():
+    """RUN_MODE=rescore. Cards whose query was never cached, or that the live
+    path would hand to Claude, keep their current result. Rescoring isn't a
+    new market observation, so price history isn't appended, last_updated
+    isn't bumped and the caches are left as they are."""
+    global C, _input_audit, _rescore_stats
+
+    rows = read_catalog_csv()
+    if len(rows) < 2:
+        log.error('Catalog CSV appears empty')
+        sys.exit(1)
+    C = detect_columns(rows[0])
+    _input_audit   = audit_input_rows(rows)
+    existing_by_id = _load_existing_results()
+    history        = _PriceHistory.load()
+
+    candidates = []
+    for i, row in enumerate(rows[1:]):
+        card = _card_from_row(row)
+        if card['player'] and card['year'] and card['brand']:
+            candidates.append((i + 2, row))
+    chunks  = _plan_chunks(plan_queries(candidates), RESCORE_CHUNK)
+    workers = max(1, min(RESCORE_WORKERS, len(chunks)))
+    log.info('Rescoring %d cards from cache (%d chunks, %d workers)', len(candidates), len(chunks), workers)
+
+    t0 = time.time()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_rescore_worker_init,
+                                 initargs=(C,)) as pool:
+            outcomes = list(pool.map(_rescore_chunk, chunks))
+    else:
+        outcomes = [_rescore_chunk(chunk) for chunk in chunks]
+
+    results, kept = [], {}
+    for chunk_results, chunk_kept in outcomes:
+        results.extend(chunk_results)
+        for reason, n in chunk_kept.items():
+            kept[reason] = kept.get(reason, 0) + n
+    for r in results:
+        r['card']['last_updated'] = existing_by_id.get(r['card']['card_id'], {}).get('last_updated', '')
+    _rescore_stats = {
+        'cards':    len(candidates),
+        'rescored': len(results),
+        'kept':     kept,
+        'workers':  workers,
+        'seconds':  round(time.time() - t0, 1),
+    }
+    log.info('Rescored %d / %d cards in %.1fs (kept current price: %s)',
+             len(results), len(candidates), _rescore_stats['seconds'], kept or 'none')
+
+    output = build_results_json(rows, results, existing_by_id, history)
+    _save_outputs(output, results, history, offline=True)
+    log.info('Done. Total value: $%.2f across %d cards', output['total_value'], output['cards_priced'])
+
+
 def main():
-    global C, _run_start_ts, _input_audit
+    global C, _run_start_ts, _input_audit, _query_plan_stats, _priority_stats, _freshness_stats
 
     _run_start_ts = time.time()
 
@@ -2045,6 +4261,11 @@ def main():
         log.info('Target player: "%s"', TARGET_PLAYER or '(none)')
     if RUN_MODE == 'tcdb':
         log.info('Targeting TCDB-fallback cards only (confidence contains "tcdb ref")')
+    if RUN_MODE == 'rescore':
+        run_rescore()
+        return
+    if not DRY_RUN:
+        start_token_refresher()   # OAuth overlaps the sheet read instead of the first eBay call
 
     service = get_sheets_service()
     rows    = read_sheet(service)
@@ -2060,39 +4281,75 @@ def main():
     _input_audit = audit_input_rows(rows)
 
     # ── Load existing pricing results (JSON is the source of truth) ───────────
-    existing_by_id: dict = {}
-    if os.path.exists(RESULTS_FILE):
-        try:
-            with open(RESULTS_FILE) as f:
-                _data = json.load(f)
-            for c in _data.get('cards', []):
-                if c.get('card_id'):
-                    existing_by_id[c['card_id']] = c
-            log.info('Loaded %d existing pricing results from JSON', len(existing_by_id))
-        except Exception as e:
-            log.warning('Could not load existing results JSON: %s', e)
+    existing_by_id = _load_existing_results()
 
-    # ── Find candidates ────────────────────────────────────────────────────────
-    candidates = [
-        (i + 2, row)
-        for i, row in enumerate(rows[1:])
-        if needs_pricing(row, i + 2, existing_by_id)
-    ]
-    log.info('%d / %d cards need pricing', len(candidates), len(rows) - 1)
+    # ── Price history — loaded once, shared by every stage below ───────────────
+    history = _PriceHistory.load()
 
-    if not candidates:
-        log.info('Nothing to price — exiting.')
-        # Still rebuild the results JSON so the page stays fresh (rows already in memory)
+    # ── Resume from checkpoint logs left by a run that never finished ───────────
+    resumed      = _load_results_delta(rows)
+    resumed_rows = {r['row'] for r in resumed}
+    if resumed:
+        log.info('Resuming %d cards journaled by an unfinished run', len(resumed))
+
+    # ── Find candidates ────────────────────────────────────────────────────────
+    with span('select_candidates'):
+        candidates = [
+            (i + 2, row)
+            for i, row in enumerate(rows[1:])
+            if i + 2 not in resumed_rows and needs_pricing(row, i + 2, existing_by_id, history)
+        ]
+        log.info('%d / %d cards need pricing', len(candidates), len(rows) - 1)
+        _freshness_stats = freshness_report(rows, existing_by_id, history)
+        log.info('Freshness (%s): ~%d eBay calls/month adaptive vs %d static (%d fitted cards)',
+                 FRESHNESS_MODE, _freshness_stats['calls_per_month']['adaptive'],
+                 _freshness_stats['calls_per_month']['static'], _freshness_stats['cards_fitted'])
+
+        if not candidates:
+            log.info('Nothing to price — exiting.')
+            # Still rebuild the results JSON so the page stays fresh (rows already in memory)
+
+        # ── Priority order — most-likely-moved cards first ─────────────────────
+        if REPRICE_ORDER == 'priority' and candidates:
+            candidates, scores = schedule_by_priority(candidates, existing_by_id, history)
+        else:
+            scores = []
+        if RUN_MODE not in ('full', 'player', 'tcdb'):
+            candidates = candidates[:BATCH_SIZE]
+        if scores and candidates:
+            _priority_stats = summarize_priority(scores, len(candidates))
+            log.info('Priority schedule: %d of %d candidates, cutoff score %.3f (top %.3f)',
+                     len(candidates), len(scores), _priority_stats['cutoff_score'], scores[0]['score'])
+
+        # ── Query plan — one eBay call per unique query ────────────────────────
+        # Regroup candidates so cards sharing a query are priced back to back and
+        # their shared result set can be released as soon as the group is done.
+        # Groups keep the order of their first member, so priority order holds.
+        plan = plan_queries(candidates)
+        candidates = [m for members in plan.values() for m in members]
+        set_query_hints(plan, existing_by_id)
+    _query_plan_stats = summarize_plan(plan)
+    log.info('Query plan: %d cards → %d unique eBay queries (%d cached, %d eBay calls)',
+             _query_plan_stats['cards'], _query_plan_stats['unique_queries'],
+             _query_plan_stats['cached'], _query_plan_stats['ebay_calls'])
+    if DRY_RUN:
+        for g in _query_plan_stats['largest_groups']:
+            log.info('  %3d cards share "%s"', g['cards'], g['query'])
+        log.info('DRY_RUN set — nothing priced, nothing written.')
+        return
 
     # ── Run modes ─────────────────────────────────────────────────────────────
-    all_results: list = []
+    all_results: list = list(resumed)
 
     def _save_and_exit(reason: str, label: str = 'partial'):
-        """Graceful shutdown — saves progress and exits cleanly."""
+        """Graceful shutdown — saves progress and exits cleanly. Rebuilt from
+        the results journal, which also holds the interrupted chunk's cards."""
         log.warning('=== %s ===', reason)
-        log.info('Saving progress for %d cards priced so far…', len(all_results))
-        output = build_results_json(rows, all_results, existing_by_id)
-        _save_outputs(output, all_results)
+        _git_checkpointer.stop()   # nothing may stage files while they're rewritten below
+        priced = _load_results_delta(rows)
+        log.info('Saving progress for %d cards priced so far…', len(priced))
+        output = build_results_json(rows, priced, existing_by_id, history)
+        _save_outputs(output, priced, history)
         commit_progress(label)
         log.info('Progress saved.')
         sys.exit(0)
@@ -2108,32 +4365,34 @@ def main():
     signal.signal(signal.SIGTERM, _sigterm_handler)
 
     if RUN_MODE == 'full':
-        total = len(candidates)
-        for chunk_start in range(0, total, FULL_RUN_CHUNK):
-            chunk  = candidates[chunk_start:chunk_start + FULL_RUN_CHUNK]
+        total, chunk_start = len(candidates), 0
+        for chunk in _plan_chunks(plan, FULL_RUN_CHUNK):
             log.info('--- Chunk %d–%d of %d ---',
                      chunk_start + 1, chunk_start + len(chunk), total)
+            chunk_start += len(chunk)
             try:
                 chunk_results = process_batch(chunk, service)
             except EbayQuotaExhausted as e:
                 _save_and_exit_quota(str(e))
             all_results.extend(chunk_results)
-            output = build_results_json(rows, all_results, existing_by_id)   # rows is held in memory — no re-read
-            _save_outputs(output, all_results)
+            with span('write.checkpoint'):
+                _checkpoint_outputs(chunk_results, history)   # O(chunk) — snapshot is rebuilt once at the end
+            _git_checkpointer.request(f'{chunk_start}/{total} cards')   # background, coalesced
     else:
-        batch = candidates if RUN_MODE in ('player', 'tcdb') else candidates[:BATCH_SIZE]
         try:
-            all_results = process_batch(batch, service)
+            all_results.extend(process_batch(candidates, service))
         except EbayQuotaExhausted as e:
             _save_and_exit_quota(str(e))
 
     log.info('Processed %d cards total', len(all_results))
+    # The workflow commits the final state; just let an in-flight push land.
+    _git_checkpointer.stop()
 
-    # Final save (full mode already saved incrementally, this is a no-op if
-    # nothing changed; batch/player mode saves here for the first time)
+    # Final save — builds the full snapshot and compacts the checkpoint logs
+    # (full mode only appended deltas per chunk; other modes save here first).
     os.makedirs('data', exist_ok=True)
-    output = build_results_json(rows, all_results, existing_by_id)
-    _save_outputs(output, all_results)
+    output = build_results_json(rows, all_results, existing_by_id, history)
+    _save_outputs(output, all_results, history)
     log.info('Done. Total value: $%.2f across %d cards', output['total_value'], output['cards_priced'])
 
 
@@ -2156,11 +4415,28 @@ def _write_run_metadata(output: dict, results: list):
                 'ebay_misses':  _ebay_cache_misses,
                 'ebay_hits':    _ebay_cache_hits,
                 'claude':       _claude_call_count,
-                'sheets':       1,   # single read + optional batch write
+                'sheets':       0 if RUN_MODE == 'rescore' else 1,   # single read + optional batch write
             },
+            'ebay_cache_tiers': {
+                'memory':   _ebay_cache.snapshot(),
+                'disk':     _ebay_disk_stats,
+                'negative': _ebay_negative_stats,
+                'network':  {'requests': _ebay_cache_misses},
+            },
+            'ebay_paging':       _ebay_paging_stats,
             'cache_hit_rate':    round(_ebay_cache_hits / (_ebay_cache_hits + _ebay_cache_misses), 3)
                                   if (_ebay_cache_hits + _ebay_cache_misses) else 0.0,
+            'claude':            {**_claude_stats, 'pool_seconds': round(_claude_stats['pool_seconds'], 1),
+                                  'concurrency': CLAUDE_CONCURRENCY, 'cache_ttl_days': CLAUDE_CACHE_TTL // 86400},
+            'fetch_page':        _page_stats,
+            'http':              http_stats(),
+            'ebay_token':        _token_stats,
+            'query_plan':        _query_plan_stats,
+            'rescore':           _rescore_stats or None,
+            'priority':          _priority_stats or None,
+            'freshness':         _freshness_stats or None,
             'input_audit':       _input_audit,
+            **stage_stats(),
             'errors':            _run_errors[:50],   # cap to keep file small
             'duration_seconds':  duration,
         }
@@ -2215,7 +4491,7 @@ def _stddev(values: list[float]) -> float:
     return math.sqrt(var)
 
 
-def _write_summary_sidecar(output: dict):
+def _write_summary_sidecar(output: dict, history: '_PriceHistory' = None):
     """Emit data/pricing_summary.json — small precomputed aggregate the frontend
     loads first for fast initial paint, before hydrating the full cards list."""
     try:
@@ -2223,17 +4499,13 @@ def _write_summary_sidecar(output: dict):
         priced = [c for c in cards if c.get('avg_price', 0) > 0]
         prices = [c['avg_price'] for c in priced]
 
-        # Load history for volatility + market-mover calcs.
-        try:
-            with open(HISTORY_FILE) as f:
-                history = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            history = {}
+        # History (including this run's entries) for volatility + market-mover calcs.
+        history = history or _PriceHistory.load()
 
         # Per-card % change over the most recent pair of snapshots.
         pct_change: dict = {}
         for c in priced:
-            h = history.get(c.get('card_id'), [])
+            h = history.series(c.get('card_id'))
             if len(h) >= 2 and h[-2].get('price'):
                 pct_change[c['card_id']] = (h[-1]['price'] - h[-2]['price']) / h[-2]['price'] * 100.0
 
@@ -2300,48 +4572,270 @@ def _write_summary_sidecar(output: dict):
         log.warning('Failed to write summary sidecar: %s', e)
 
 
-def _save_outputs(output: dict, results: list):
-    """Write pricing_results.json and price_history.json."""
-    os.makedirs('data', exist_ok=True)
+# ── Incremental output stores ────────────────────────────────────────────────
+# Full-mode checkpoints used to re-read and rewrite all of price_history.json
+# and pricing_results.json every FULL_RUN_CHUNK cards. Now every priced card
+# is appended to the results journal (RESULTS_DELTA_FILE) as soon as it
+# finishes, and chunk checkpoints only append history entries to the history
+# log; the full files are rewritten (compacted) once, by _save_outputs() at
+# the end of the run or on a graceful exit. A run killed between the two
+# leaves the logs behind — the next run resumes from the journal without
+# repricing those cards, and folds the history log in when it saves.
+# ─────────────────────────────────────────────────────────────────────────────
 
-    # ── Price history ──────────────────────────────────────────────────────────
+def _read_jsonl(path: str) -> list[dict]:
+    """Read a JSONL log, skipping a torn trailing line from a killed writer."""
+    records = []
     try:
-        with open(HISTORY_FILE) as f:
-            price_history = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        price_history = {}
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _append_jsonl(path: str, records: list[dict], sync: bool = True):
+    """sync=False skips the fsync — enough to survive the process being
+    killed (the page cache outlives it), not a machine crash."""
+    if not records:
+        return
+    with open(path, 'a') as f:
+        f.write(''.join(json.dumps(r, separators=(',', ':'), default=str) + '\n' for r in records))
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _journal_card(result: dict):
+    """Append one finished card to the results journal. Called per card, so
+    no fsync — a fsync per card would add seconds to a full run."""
+    os.makedirs('data', exist_ok=True)
+    _append_jsonl(RESULTS_DELTA_FILE, [result], sync=False)
+
+
+def _write_json_atomic(path: str, obj, **dump_kw):
+    """Write to a temp file and rename over `path`, so readers (and git) never
+    see a half-written snapshot."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(obj, f, **dump_kw)
+    os.replace(tmp, path)
+
+
+def _history_append(history: dict, key: str, entry: dict):
+    """Add one snapshot to a series — same-day entries replace, capped at HISTORY_MAX."""
+    hist = history.get(key, [])
+    if hist and hist[-1]['date'] == entry['date']:
+        hist[-1] = entry
+    else:
+        hist.append(entry)
+    history[key] = hist[-HISTORY_MAX:]
+
+
+def _split_json_object(text: str) -> dict[str, tuple]:
+    """Parse a top-level JSON object into {key: (value, raw_text)}, keeping each
+    value's original encoding so unchanged entries can be written back as-is."""
+    dec, ws = json.JSONDecoder(), ' \t\n\r'
+    out: dict[str, tuple] = {}
+    i = text.index('{') + 1
+    while True:
+        while text[i] in ws: i += 1
+        if text[i] == '}':
+            return out
+        key, i = dec.raw_decode(text, i)
+        while text[i] in ws: i += 1
+        i += 1   # ':'
+        while text[i] in ws: i += 1
+        start = i
+        val, i = dec.raw_decode(text, i)
+        out[key] = (val, text[start:i])
+        while text[i] in ws: i += 1
+        if text[i] == ',':
+            i += 1
+
+
+class _PriceHistory:
+    """Run-scoped price history — loaded once in main(), shared by smoothing,
+    the summary sidecar and the writers.
+
+    Entries recorded this run are staged next to the loaded series, so
+    smoothing keeps seeing history as it stood when the run started (the
+    median-of-runs and volatility checks compare against *earlier* runs),
+    while the sidecar sees the updated series. Only series touched this run
+    are re-encoded: checkpoints append just the dirty ones to the history
+    log, and save() reuses the loaded JSON text of every untouched series.
+
+    Entries left in the history log by an unfinished run are staged the same
+    way rather than folded into the loaded series — when this run resumes
+    that one, its smoothing then sees the same history an uninterrupted run
+    would have.
+    """
 
+    def __init__(self, series: dict[str, list], encoded: dict[str, str] = None,
+                 replayed: dict[str, list] = None):
+        self._series   = series
+        self._encoded  = encoded or {}            # {key: raw JSON of the series as loaded/last written}
+        self._replayed = replayed or {}           # {key: [entries]} from an unfinished run's log
+        self._pending: dict[str, dict] = {}       # {key: entry} recorded this run, not yet saved
+        self._dirty:   set[str]        = set()    # pending keys not yet appended to the log
+
+    @classmethod
+    def load(cls) -> '_PriceHistory':
+        """price_history.json plus anything appended to the log since it was last compacted."""
+        series, encoded, replayed = {}, {}, {}
+        try:
+            with open(HISTORY_FILE) as f:
+                for k, (v, raw) in _split_json_object(f.read()).items():
+                    series[k], encoded[k] = v, raw
+        except (FileNotFoundError, ValueError, IndexError):
+            series, encoded = {}, {}
+        for rec in _read_jsonl(HISTORY_LOG_FILE):
+            key = rec.pop('id', None)
+            if key:
+                replayed.setdefault(key, []).append(rec)
+        return cls(series, encoded, replayed)
+
+    def before_run(self, key: str) -> list:
+        """The series as it stood when this run started."""
+        return self._series.get(key, [])
+
+    def _staged(self, key: str) -> list:
+        entries = list(self._replayed.get(key, ()))
+        if key in self._pending:
+            entries.append(self._pending[key])
+        return entries
+
+    def series(self, key: str) -> list:
+        """The series including this run's entry, if any."""
+        staged = self._staged(key)
+        if not staged:
+            return self._series.get(key, [])
+        merged = {key: list(self._series.get(key, []))}
+        for entry in staged:
+            _history_append(merged, key, entry)
+        return merged[key]
+
+    def record(self, key: str, entry: dict):
+        self._pending[key] = entry
+        self._dirty.add(key)
+
+    def checkpoint(self):
+        """Append entries recorded since the last checkpoint to the history log."""
+        _append_jsonl(HISTORY_LOG_FILE, [dict(self._pending[k], id=k) for k in self._dirty])
+        self._dirty.clear()
+
+    def save(self):
+        """Fold this run's entries in and rewrite price_history.json, re-encoding
+        only the series that changed; the history log is then redundant."""
+        for key in {**self._replayed, **self._pending}:
+            for entry in self._staged(key):
+                _history_append(self._series, key, entry)
+            self._encoded.pop(key, None)
+        self._replayed.clear()
+        self._pending.clear()
+        self._dirty.clear()
+        for key, hist in self._series.items():
+            if key not in self._encoded:
+                self._encoded[key] = json.dumps(hist, separators=(',', ':'))
+        tmp = f'{HISTORY_FILE}.tmp'
+        with open(tmp, 'w') as f:
+            f.write('{' + ','.join(f'{json.dumps(k)}:{self._encoded[k]}' for k in self._series) + '}')
+        os.replace(tmp, HISTORY_FILE)
+        if os.path.exists(HISTORY_LOG_FILE):
+            os.remove(HISTORY_LOG_FILE)
+
+
+def _checkpoint_outputs(results: list, history: _PriceHistory):
+    """Full-mode checkpoint — cost scales with the cards priced this chunk,
+    not with the collection. The cards themselves are already in the results
+    journal; this appends their history entries to the history log, fsyncs
+    the journal and flushes the eBay cache. The snapshot waits for _save_outputs()."""
+    os.makedirs('data', exist_ok=True)
     today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
     for r in results:
-        cid   = r['card']['card_id']
-        entry = {'price': r['card']['avg_price'], 'date': today}
-        hist  = price_history.get(cid, [])
-        if hist and hist[-1]['date'] == today:
-            hist[-1] = entry
-        else:
-            hist.append(entry)
-        price_history[cid] = hist[-HISTORY_MAX:]
+        history.record(r['card']['card_id'], {'price': r['card']['avg_price'], 'date': today})
+    history.checkpoint()
+    if os.path.exists(RESULTS_DELTA_FILE):
+        with open(RESULTS_DELTA_FILE, 'a') as f:
+            os.fsync(f.fileno())
+    _save_ebay_persist_cache()
+    _save_claude_cache()
+    _save_page_cache()
+    log.info('Checkpoint: %d cards journaled in %s', len(results), RESULTS_DELTA_FILE)
 
-    port_entry = {'date': today, 'total_value': output['total_value'], 'cards_priced': output['cards_priced']}
-    port_hist  = price_history.get('_portfolio', [])
-    if port_hist and port_hist[-1]['date'] == today:
-        port_hist[-1] = port_entry
-    else:
-        port_hist.append(port_entry)
-    price_history['_portfolio'] = port_hist[-HISTORY_MAX:]
 
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(price_history, f, separators=(',', ':'))
+RESUME_MAX_AGE_H = 24   # older checkpointed results are re-priced instead of resumed
 
-    output['_portfolio'] = price_history['_portfolio']
-    with open(RESULTS_FILE, 'w') as f:
-        json.dump(output, f, separators=(',', ':'), default=str)
+
+def _load_results_delta(all_rows: list[list]) -> list[dict]:
+    """Results journaled by this run so far, or by an earlier run that never
+    reached its final save. Only recent records whose row still holds the
+    same card are kept — rows shift if the sheet is edited between runs —
+    and the last record per row wins. (Their history entries are replayed
+    from the history log either way.)"""
+    resumed: dict[int, dict] = {}
+    cutoff  = datetime.now(timezone.utc) - timedelta(hours=RESUME_MAX_AGE_H)
+    for rec in _read_jsonl(RESULTS_DELTA_FILE):
+        card, row_num = rec.get('card') or {}, rec.get('row')
+        if not isinstance(row_num, int) or not 2 <= row_num <= len(all_rows):
+            continue
+        try:
+            if datetime.fromisoformat(card.get('last_updated', '')) < cutoff:
+                continue
+        except (TypeError, ValueError):
+            continue
+        c = _card_from_row(all_rows[row_num - 1])
+        if make_card_id(c['year'], c['brand'], c['player'], c['card_number']) == card.get('card_id'):
+            resumed[row_num] = rec
+    return list(resumed.values())
+
+
+def _save_outputs(output: dict, results: list, history: _PriceHistory = None,
+                  offline: bool = False):
+    """Write pricing_results.json and price_history.json, compacting the
+    checkpoint logs into them. offline (rescore mode) writes the snapshot,
+    metadata and sidecar only — history, checkpoint logs and caches are
+    left untouched."""
+    os.makedirs('data', exist_ok=True)
+    history = history or _PriceHistory.load()
+
+    # ── Price history ──────────────────────────────────────────────────────────
+    if not offline:
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        for r in results:
+            history.record(r['card']['card_id'], {'price': r['card']['avg_price'], 'date': today})
+
+        port_entry = {'date': today, 'total_value': output['total_value'], 'cards_priced': output['cards_priced']}
+        history.record('_portfolio', port_entry)
+        with span('write.history'):
+            history.save()
+
+    output['_portfolio'] = history.series('_portfolio')
+    with span('write.results_json'):
+        _write_json_atomic(RESULTS_FILE, output, separators=(',', ':'), default=str)
     log.info('Saved %s (%.0f KB)', RESULTS_FILE, os.path.getsize(RESULTS_FILE) / 1024)
 
-    # Persist eBay cache + run metadata + summary sidecar.
-    _save_ebay_persist_cache()
+    if not offline:
+        # The snapshot now includes everything the results delta held.
+        if os.path.exists(RESULTS_DELTA_FILE):
+            os.remove(RESULTS_DELTA_FILE)
+        with span('write.ebay_cache'):
+            _save_ebay_persist_cache()
+        with span('write.claude_cache'):
+            _save_claude_cache()
+        with span('write.page_cache'):
+            _save_page_cache()
+
+    # Summary sidecar, then run metadata (so its stage table includes every
+    # writer but itself) and the trace.
+    with span('write.summary_sidecar'):
+        _write_summary_sidecar(output, history)
     _write_run_metadata(output, results)
-    _write_summary_sidecar(output)
+    write_trace()
 
 
 if __name__ == '__main__':